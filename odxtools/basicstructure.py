@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: MIT
+from collections.abc import Iterable
 from dataclasses import dataclass, field
-from typing import Any
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 from xml.etree import ElementTree
 
 from typing_extensions import override
@@ -22,6 +24,9 @@ from .parameters.parameter import Parameter
 from .snrefcontext import SnRefContext
 from .utils import dataclass_fields_asdict
 
+if TYPE_CHECKING:
+    from .columnardecodeplan import ColumnarDecodePlan, ColumnarValues
+
 
 @dataclass(kw_only=True)
 class BasicStructure(ComplexDop):
@@ -71,6 +76,9 @@ class BasicStructure(ComplexDop):
             param._resolve_odxlinks(odxlinks)
 
     def _resolve_snrefs(self, context: SnRefContext) -> None:
+        # the columnar decode plan depends on the resolved parameters
+        self.__dict__.pop("_columnar_decode_plan", None)
+
         context.parameters = self.parameters
 
         super()._resolve_snrefs(context)
@@ -87,6 +95,26 @@ class BasicStructure(ComplexDop):
 
         return composite_codec_get_static_bit_length(self)
 
+    @cached_property
+    def _columnar_decode_plan(self) -> "ColumnarDecodePlan | None":
+        from .columnardecodeplan import compile_columnar_decode_plan
+
+        return compile_columnar_decode_plan(self.parameters)
+
+    def decode_columnar(self, messages: Iterable[bytes | bytearray]) -> "ColumnarValues":
+        """Decode a batch of instances of the structure into one
+        column per parameter
+
+        Each message is expected to start with an instance of the
+        structure. Refer to `Response.decode_columnar()` for details.
+        """
+        from .columnardecodeplan import decode_columnar
+
+        def decode_one(message: bytes | bytearray) -> ParameterValue:
+            return self.decode_from_pdu(DecodeState(coded_message=message))
+
+        return decode_columnar(messages, self._columnar_decode_plan, decode_one)
+
     def print_free_parameters_info(self) -> None:
         """Return a human readable description of the structure's
         free parameters.
@@ -106,13 +134,27 @@ class BasicStructure(ComplexDop):
             actual_len = encode_state.cursor_byte_position - orig_pos
 
             if actual_len < self.byte_size:
-                # Padding bytes are needed. We add an empty object at
-                # the position directly after the structure and let
-                # EncodeState add the padding as needed.
+                # Padding bytes needed. these count as "used". Since
+                # parameters may be located out of order, some bytes
+                # behind the cursor may already be occupied, so only
+                # the unused bits are claimed. (Note that the buffer
+                # of the PDU may already extend beyond the structure
+                # if it has been preallocated.)
+                pad_pos = encode_state.cursor_byte_position
+                pad_end_pos = orig_pos + self.byte_size
+                if encode_state.check_overlaps:
+                    used_mask = encode_state.used_mask[pad_pos:pad_end_pos]
+                    pad_mask = bytes(~x & 0xff for x in used_mask)
+                    pad_mask += b"\xff" * (pad_end_pos - pad_pos - len(pad_mask))
+                    encode_state.emplace_bytes(bytes(pad_end_pos - pad_pos), obj_used_mask=pad_mask)
+                else:
+                    # the mask of used bits is not maintained, so only
+                    # the bytes beyond the end of the PDU are padded
+                    pad_pos = max(pad_pos, len(encode_state.coded_message))
+                    if pad_pos < pad_end_pos:
+                        encode_state.cursor_byte_position = pad_pos
+                        encode_state.emplace_bytes(bytes(pad_end_pos - pad_pos))
                 encode_state.cursor_byte_position = encode_state.origin_byte_position + self.byte_size
-                # Padding bytes needed. these count as "used".
-                encode_state.coded_message += b"\x00" * (self.byte_size - actual_len)
-                encode_state.used_mask += b"\xff" * (self.byte_size - actual_len)
 
     @override
     def decode_from_pdu(self, decode_state: DecodeState) -> ParameterValue:
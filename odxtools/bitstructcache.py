@@ -0,0 +1,28 @@
+# SPDX-License-Identifier: MIT
+from functools import lru_cache
+from typing import Any
+
+try:
+    import bitstruct.c as bitstruct
+except ImportError:
+    import bitstruct
+
+#: The maximum number of compiled formats which are kept
+BITSTRUCT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=BITSTRUCT_CACHE_SIZE)
+def get_compiled_format(format_letter: str, bit_length: int, padding: int = 0) -> Any:
+    """Return the compiled bitstruct format for an atomic value
+
+    The format consists of `padding` bits which are ignored followed
+    by a single value of type `format_letter` that is `bit_length`
+    bits long. Since there are only few distinct combinations of
+    these in any given database, the compiled formats are shared by
+    all en- and decoding operations.
+
+    Note that the byte order of values cannot be expressed by
+    bitstruct formats, so this must be dealt with by the caller.
+    """
+    left_pad = f"p{padding}" if padding > 0 else ""
+    return bitstruct.compile(f"{left_pad}{format_letter}{bit_length}")
@@ -33,3 +33,20 @@ def add_pdx_argument(parser: argparse.ArgumentParser, is_optional: bool = False)
 def load_file(args: argparse.Namespace) -> Database:
     pdx_file_name = args.pdx_file if isinstance(args.pdx_file, str) else args.pdx_file[0]
     return _load_file(pdx_file_name)
+
+
+def parse_ecu_spec(spec: str) -> tuple[int, int, str]:
+    """Parse an ECU specification of the form 'RX_ID:TX_ID:DIAG_LAYER'
+
+    This is intended to be used as the `type` of command line
+    arguments. The result is the receive ID, the send ID and the
+    name of the diagnostic layer of the ECU.
+    """
+    try:
+        rx_id, tx_id, diag_layer = spec.split(":", 2)
+        if not diag_layer:
+            raise ValueError("No diagnostic layer specified")
+        return int(rx_id, 0), int(tx_id, 0), diag_layer
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid ECU specification '{spec}' (expected RX_ID:TX_ID:DIAG_LAYER)") from None
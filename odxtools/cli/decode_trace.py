@@ -0,0 +1,347 @@
+# SPDX-License-Identifier: MIT
+import argparse
+import csv
+import json
+import mmap
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+
+import can
+
+from .. import exceptions
+from ..database import Database
+from ..diaglayers.diaglayer import DiagLayer
+from ..diaglayers.ecuvariant import EcuVariant
+from ..exceptions import odxrequire
+from ..isotp_state_machine import iter_socketcan_frames
+from ..message import Message
+from ..multiecudecoder import DecodedTelegram, MonitoredEcu, MultiEcuDecoder
+from . import _parser_utils
+from ._parser_utils import SubparsersList
+
+# name of the tool
+_odxtools_tool_name_ = "decode-trace"
+
+#: A CAN frame of a trace: timestamp, channel, CAN ID and data
+TraceFrame = tuple[float | None, str | None, int, bytes]
+
+#: The columns of the output records
+RECORD_COLUMNS = [
+    "timestamp", "channel", "ecu", "can_id", "direction", "payload", "decodings", "error"
+]
+
+
+@dataclass
+class TraceShard:
+    """The CAN frames exchanged with a single ECU on a single channel
+
+    Shards can be decoded independently of each other because
+    telegrams are reassembled separately for each channel and ECU and
+    responses only need to be correlated with the requests of the
+    same shard.
+    """
+    channel: str | None
+    ecu: MonitoredEcu
+    frames: list[TraceFrame] = field(default_factory=list)
+
+
+def get_default_ecus(database: Database, protocol: str | None = None) -> list[MonitoredEcu]:
+    """Return the ECUs which are defined by the ECU variants of a
+    database
+
+    Only ECU variants which specify their CAN IDs are considered. If
+    several of them use the same CAN IDs, they are usually variants of
+    the same ECU. In this case, their common base variant is used for
+    decoding.
+    """
+    variants_by_can_ids: dict[tuple[int, int], list[EcuVariant]] = {}
+    for ecu in database.ecus:
+        rx_id = ecu.get_can_receive_id(protocol=protocol)
+        tx_id = ecu.get_can_send_id(protocol=protocol)
+        if rx_id is not None and tx_id is not None:
+            variants_by_can_ids.setdefault((rx_id, tx_id), []).append(ecu)
+
+    result = []
+    for (rx_id, tx_id), variants in variants_by_can_ids.items():
+        diag_layers: list[DiagLayer] = list(variants)
+        base_variant = variants[0].base_variant
+        if len(variants) > 1 and base_variant is not None and all(
+                x.base_variant is base_variant for x in variants):
+            diag_layers = [base_variant]
+
+        # if the ECU variants do not share a base variant, all of them
+        # are returned and the CAN IDs cannot be assigned unambiguously
+        for diag_layer in diag_layers:
+            result.append(MonitoredEcu(diag_layer=diag_layer, rx_id=rx_id, tx_id=tx_id))
+
+    return result
+
+
+def read_trace_frames(file_name: str, trace_format: str = "python-can") -> Iterator[TraceFrame]:
+    """Read the CAN frames of a recorded trace
+
+    `trace_format` is either 'python-can' for all formats supported
+    by python-can (BLF, ASC, MF4, ...) or 'socketcan' or
+    'socketcan-fd' for raw SocketCAN frames. The latter do not
+    specify timestamps or channels.
+    """
+    if trace_format == "python-can":
+        with can.LogReader(file_name) as reader:
+            for msg in reader:
+                if msg.is_error_frame or msg.is_remote_frame:
+                    continue
+                channel = None if msg.channel is None else str(msg.channel)
+                yield msg.timestamp, channel, msg.arbitration_id, bytes(msg.data)
+    else:
+        with open(file_name, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ) as trace_data:
+            for can_id, data in iter_socketcan_frames(
+                    trace_data, fd=trace_format == "socketcan-fd"):
+                yield None, None, can_id, data
+
+
+def split_trace(frames: Iterable[TraceFrame], decoder: MultiEcuDecoder) -> list[TraceShard]:
+    """Split the CAN frames of a trace by channel and ECU
+
+    Frames which are not exchanged with any of the ECUs monitored by
+    the decoder are dropped.
+    """
+    shards: dict[tuple[str | None, MonitoredEcu], TraceShard] = {}
+    for frame in frames:
+        _, channel, can_id, _ = frame
+        ecu = decoder.get_ecu(can_id)
+        if ecu is None:
+            continue
+
+        shard = shards.get((channel, ecu))
+        if shard is None:
+            shard = shards[(channel, ecu)] = TraceShard(channel=channel, ecu=ecu)
+        shard.frames.append(frame)
+
+    return list(shards.values())
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    elif isinstance(value, dict):
+        return {k: _to_json_value(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_to_json_value(x) for x in value]
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(short_name := getattr(value, "short_name", None), str):
+        # e.g., diagnostic trouble codes
+        return short_name
+
+    return str(value)
+
+
+def _get_decodings(messages: list[Message]) -> list[dict[str, Any]]:
+    return [{
+        "service": x.service.short_name,
+        "coding_object": x.coding_object.short_name,
+        "params": _to_json_value(x.param_dict),
+    } for x in messages]
+
+
+def _make_record(timestamp: float | None, telegram: DecodedTelegram) -> dict[str, Any]:
+    if telegram.is_request:
+        direction = "request"
+    elif telegram.is_response_pending:
+        # the final response to the request is still to come
+        direction = "response_pending"
+    else:
+        direction = "response"
+
+    return {
+        "timestamp": timestamp,
+        "channel": telegram.channel,
+        "ecu": telegram.ecu.diag_layer.short_name,
+        "can_id": telegram.can_id,
+        "direction": direction,
+        "payload": telegram.payload.hex(),
+        "decodings": _get_decodings(telegram.messages),
+        "error": None if telegram.error is None else str(telegram.error),
+    }
+
+
+def decode_shard(shard: TraceShard) -> list[dict[str, Any]]:
+    """Decode the telegrams of a shard
+
+    The result is a list of records, one per telegram. The timestamp
+    of a telegram is the one of the frame which completes it.
+    """
+    decoder = MultiEcuDecoder([shard.ecu])
+    records: list[dict[str, Any]] = []
+    for timestamp, channel, can_id, data in shard.frames:
+        telegram = decoder.decode_frame(channel, can_id, data)
+        if telegram is not None:
+            records.append(_make_record(timestamp, telegram))
+
+    return records
+
+
+# the ECUs whose shards are decoded by the worker processes of
+# `decode_shards()`
+_worker_ecus: list[MonitoredEcu] | None = None
+
+
+def _init_decode_worker(ecus: list[MonitoredEcu], strict_mode: bool) -> None:
+    global _worker_ecus
+
+    exceptions.strict_mode = strict_mode
+    _worker_ecus = ecus
+
+
+def _decode_shard_in_worker(item: tuple[int, str | None, list[TraceFrame]]) -> list[dict[str, Any]]:
+    ecu_idx, channel, frames = item
+    ecu = odxrequire(_worker_ecus)[ecu_idx]
+    return decode_shard(TraceShard(channel=channel, ecu=ecu, frames=frames))
+
+
+def decode_shards(shards: list[TraceShard],
+                  max_workers: int | None = None) -> Iterator[list[dict[str, Any]]]:
+    """Decode the telegrams of a list of shards
+
+    If `max_workers` is not 1, the shards are decoded by a pool of
+    worker processes. The records of the shards are yielded in the
+    order of the shards.
+    """
+    if max_workers == 1 or len(shards) <= 1:
+        for shard in shards:
+            yield decode_shard(shard)
+        return
+
+    # only the ECUs which are actually required are sent to the
+    # workers. (once, the shards refer to them by index.)
+    ecu_indices: dict[MonitoredEcu, int] = {}
+    for shard in shards:
+        ecu_indices.setdefault(shard.ecu, len(ecu_indices))
+    with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_decode_worker,
+            initargs=(list(ecu_indices), exceptions.strict_mode)) as executor:
+        yield from executor.map(_decode_shard_in_worker,
+                                [(ecu_indices[x.ecu], x.channel, x.frames) for x in shards])
+
+
+def write_records(records: Iterable[dict[str, Any]], out: TextIO, output_format: str) -> None:
+    """Write decoded records as JSON lines ('jsonl') or as CSV ('csv')"""
+    if output_format == "jsonl":
+        for record in records:
+            out.write(json.dumps(record))
+            out.write("\n")
+    else:
+        writer = csv.DictWriter(out, fieldnames=RECORD_COLUMNS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({**record, "decodings": json.dumps(record["decodings"])})
+
+
+def add_subparser(subparsers: SubparsersList) -> None:
+    parser = subparsers.add_parser(
+        "decode-trace",
+        description="\n".join([
+            "Decode the diagnostic communication contained by a recorded CAN trace",
+            "",
+            "Examples:",
+            "  For decoding the communication with all ECUs that specify their CAN IDs:",
+            "    odxtools decode-trace ./path/to/database.pdx -i trace.blf -o decoded.jsonl",
+            "  For decoding the communication with a given ECU:",
+            "    odxtools decode-trace ./path/to/database.pdx -i trace.blf -e 0x7e0:0x7e8:my_ecu",
+        ]),
+        help="Decode the diagnostic communication contained by a recorded CAN trace.",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    _parser_utils.add_pdx_argument(parser)
+
+    parser.add_argument(
+        "-i",
+        "--trace",
+        required=True,
+        help="The recorded CAN trace",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=["python-can", "socketcan", "socketcan-fd"],
+        default="python-can",
+        help="Format of the trace: any format supported by python-can (BLF, ASC, MF4, ...;\n"
+        "determined by the file extension) or raw SocketCAN (FD) frames",
+    )
+    parser.add_argument(
+        "-e",
+        "--ecu",
+        action="append",
+        type=_parser_utils.parse_ecu_spec,
+        metavar="RX_ID:TX_ID:DIAG_LAYER",
+        default=None,
+        help="CAN IDs used by an ECU and the diagnostic layer used for decoding. May be\n"
+        "specified multiple times. By default, all ECU variants which specify their\n"
+        "CAN IDs are considered. (ECU variants which share their CAN IDs are decoded\n"
+        "using their common base variant.)",
+    )
+    parser.add_argument(
+        "-p",
+        "--protocol",
+        default=None,
+        help="Name of the protocol used to determine the CAN IDs of the ECU variants",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="Output file (default: standard output)",
+    )
+    parser.add_argument(
+        "-f",
+        "--output-format",
+        choices=["jsonl", "csv"],
+        default="jsonl",
+        help="Format of the output file",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of processors)",
+    )
+
+
+def run(args: argparse.Namespace) -> None:
+    odx_database = _parser_utils.load_file(args)
+
+    if args.ecu:
+        ecus = []
+        for rx_id, tx_id, diag_layer_name in args.ecu:
+            diag_layer = odx_database.diag_layers.get(diag_layer_name)
+            if diag_layer is None:
+                print(f"Diagnostic layer '{diag_layer_name}' does not exist", file=sys.stderr)
+                sys.exit(1)
+            ecus.append(MonitoredEcu(diag_layer=diag_layer, rx_id=rx_id, tx_id=tx_id))
+    else:
+        ecus = get_default_ecus(odx_database, protocol=args.protocol)
+
+    if not ecus:
+        print("No ECUs to be decoded have been specified", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        decoder = MultiEcuDecoder(ecus)
+    except ValueError as e:
+        # this happens if multiple ECUs use the same CAN IDs
+        print(f"{e}. Please specify the ECUs to be decoded using --ecu.", file=sys.stderr)
+        sys.exit(1)
+
+    shards = split_trace(read_trace_frames(args.trace, args.trace_format), decoder)
+    records = (x for shard_records in decode_shards(shards, args.jobs) for x in shard_records)
+
+    if args.output == "-":
+        write_records(records, sys.stdout, args.output_format)
+    else:
+        with open(args.output, "w", newline="") as out:
+            write_records(records, out, args.output_format)
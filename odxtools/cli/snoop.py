@@ -3,7 +3,9 @@
 # SPDX-License-Identifier: MIT
 import argparse
 import asyncio
+import mmap
 import sys
+from collections.abc import Iterable
 from typing import Any
 
 import can
@@ -13,6 +15,8 @@ import odxtools.uds as uds
 from odxtools.diaglayers.protocol import Protocol
 from odxtools.exceptions import DecodeError
 from odxtools.isotp_state_machine import IsoTpStateMachine
+from odxtools.message import Message
+from odxtools.multiecudecoder import DecodedTelegram, MonitoredEcu, MultiEcuDecoder
 from odxtools.response import Response, ResponseType
 
 from . import _parser_utils
@@ -39,45 +43,14 @@ def handle_telegram(telegram_id: int, payload: bytes) -> None:
             print(f" ... (response pending)")
             return
 
-        decoded_message = None
+        decoded_messages = None
         if last_request is not None:
             try:
-                decoded_message = odx_diag_layer.decode_response(payload, last_request)
+                decoded_messages = odx_diag_layer.decode_response(payload, last_request)
             except DecodeError:
                 pass
 
-        if decoded_message is not None:
-            for i, resp in enumerate(decoded_message):
-                params = resp.coding_object.parameters
-                dec_str = ""
-                if len(decoded_message) > 1:
-                    dec_str = f" (decoding {i+1})"
-
-                rt_str = "unknown"
-                if isinstance(resp.coding_object, Response):
-                    if resp.coding_object.response_type == ResponseType.POSITIVE:
-                        rt_str = "positive"
-                    elif resp.coding_object.response_type in (ResponseType.NEGATIVE,
-                                                              ResponseType.GLOBAL_NEGATIVE):
-                        rt_str = "negative"
-
-                settable_params = []
-                for param_name, param_val in resp.param_dict.items():
-                    param = [x for x in params if x.short_name == param_name][0]
-                    if not param.is_settable:
-                        continue
-                    settable_params.append((param_name, param_val))
-
-                if settable_params:
-                    print(f" {rt_str} response{dec_str} {resp.coding_object.short_name}:")
-                    for param_name, param_val in settable_params:
-                        print(f"      {param_name} = {repr(param_val)}")
-                else:
-                    print(f" {rt_str} response{dec_str} {resp.coding_object.short_name}")
-        else:
-            print(f" unrecognized response of {len(payload)} bytes length: "
-                  f"0x{payload.hex()}")
-
+        print_response(payload, decoded_messages)
         return
 
     decoded_message = None
@@ -88,6 +61,44 @@ def handle_telegram(telegram_id: int, payload: bytes) -> None:
         except DecodeError:
             last_request = None
 
+    print_request(payload, decoded_message)
+
+
+def print_response(payload: bytes, decoded_messages: list[Message] | None) -> None:
+    if decoded_messages:
+        for i, resp in enumerate(decoded_messages):
+            params = resp.coding_object.parameters
+            dec_str = ""
+            if len(decoded_messages) > 1:
+                dec_str = f" (decoding {i+1})"
+
+            rt_str = "unknown"
+            if isinstance(resp.coding_object, Response):
+                if resp.coding_object.response_type == ResponseType.POSITIVE:
+                    rt_str = "positive"
+                elif resp.coding_object.response_type in (ResponseType.NEGATIVE,
+                                                          ResponseType.GLOBAL_NEGATIVE):
+                    rt_str = "negative"
+
+            settable_params = []
+            for param_name, param_val in resp.param_dict.items():
+                param = [x for x in params if x.short_name == param_name][0]
+                if not param.is_settable:
+                    continue
+                settable_params.append((param_name, param_val))
+
+            if settable_params:
+                print(f" {rt_str} response{dec_str} {resp.coding_object.short_name}:")
+                for param_name, param_val in settable_params:
+                    print(f"      {param_name} = {repr(param_val)}")
+            else:
+                print(f" {rt_str} response{dec_str} {resp.coding_object.short_name}")
+    else:
+        print(f" unrecognized response of {len(payload)} bytes length: "
+              f"0x{payload.hex()}")
+
+
+def print_request(payload: bytes, decoded_message: Message | None) -> None:
     if decoded_message is not None:
         print(f"request {decoded_message.coding_object.short_name}:")
         params = decoded_message.coding_object.parameters
@@ -103,6 +114,19 @@ def handle_telegram(telegram_id: int, payload: bytes) -> None:
               f"({payload!r}, {len(payload)} bytes)")
 
 
+def handle_decoded_telegram(telegram: DecodedTelegram) -> None:
+    channel_str = "" if telegram.channel is None else f"[{telegram.channel}] "
+    print(f"{channel_str}{telegram.ecu.diag_layer.short_name}:", end="")
+
+    if telegram.is_response_pending:
+        print(f" ... (response pending)")
+    elif telegram.is_request:
+        print(" ", end="")
+        print_request(telegram.payload, telegram.messages[0] if telegram.messages else None)
+    else:
+        print_response(telegram.payload, telegram.messages)
+
+
 def init_verbose_state_machine(BaseClass: type[IsoTpStateMachine], *args: Any,
                                **kwargs: Any) -> IsoTpStateMachine:
 
@@ -152,7 +176,19 @@ async def passive_main(args: argparse.Namespace) -> None:
     isotp_decoder = init_verbose_state_machine(
         BaseClass=ism.IsoTpStateMachine, can_rx_ids=[ecu_rx_id, ecu_tx_id])
 
-    if args.channel:
+    if args.trace:
+        # decode a recorded trace
+        if args.trace_format == "python-can":
+            with can.LogReader(args.trace) as reader:
+                for telegram_id, payload in isotp_decoder.read_trace_telegrams(reader):
+                    handle_telegram(telegram_id, payload)
+        else:
+            with open(args.trace, "rb") as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ) as trace_data:
+                for telegram_id, payload in isotp_decoder.read_socketcan_telegrams(
+                        trace_data, fd=args.trace_format == "socketcan-fd"):
+                    handle_telegram(telegram_id, payload)
+    elif args.channel:
         # decode a "real" bus
         can_bus = can.Bus(channel=args.channel, bustype="socketcan")
 
@@ -165,6 +201,37 @@ async def passive_main(args: argparse.Namespace) -> None:
             handle_telegram(telegram_id, payload)
 
 
+async def multi_ecu_main(args: argparse.Namespace, ecus: list[MonitoredEcu]) -> None:
+    decoder = MultiEcuDecoder(ecus)
+
+    if args.trace:
+        # decode a recorded trace
+        frames: Iterable[tuple[str | None, int, bytes | bytearray]]
+        if args.trace_format == "python-can":
+            with can.LogReader(args.trace) as reader:
+                frames = ((None if msg.channel is None else str(msg.channel), msg.arbitration_id,
+                           msg.data)
+                          for msg in reader
+                          if not msg.is_error_frame and not msg.is_remote_frame)
+                for telegram in decoder.decode_frames(frames):
+                    handle_decoded_telegram(telegram)
+        else:
+            with open(args.trace, "rb") as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ) as trace_data:
+                frames = ((None, can_id, data) for can_id, data in ism.iter_socketcan_frames(
+                    trace_data, fd=args.trace_format == "socketcan-fd"))
+                for telegram in decoder.decode_frames(frames):
+                    handle_decoded_telegram(telegram)
+    else:
+        # decode "real" buses
+        channels = args.channel.split(",")
+        can_buses = [can.Bus(channel=x, bustype="socketcan") for x in channels]
+
+        print(f"Decoding messages on channel(s) {', '.join(channels)}")
+        async for telegram in decoder.read_telegrams(can_buses):
+            handle_decoded_telegram(telegram)
+
+
 def add_cli_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--active",
@@ -182,6 +249,18 @@ def add_cli_arguments(parser: argparse.ArgumentParser) -> None:
         default=None,
         help="CAN interface name to be used (required in active mode)",
     )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="Recorded CAN trace to be decoded instead of a live bus (passive mode only)",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=["python-can", "socketcan", "socketcan-fd"],
+        default="python-can",
+        help="Format of the trace: any format supported by python-can (BLF, ASC, MF4, ...;\n"
+        "determined by the file extension) or raw SocketCAN (FD) frames",
+    )
     parser.add_argument(
         "--rx",
         "-r",
@@ -196,6 +275,16 @@ def add_cli_arguments(parser: argparse.ArgumentParser) -> None:
         required=False,
         help="CAN ID in which the ECU sends replys to diagnostic messages  (required in active mode)",
     )
+    parser.add_argument(
+        "--ecu",
+        "-e",
+        action="append",
+        type=_parser_utils.parse_ecu_spec,
+        metavar="RX_ID:TX_ID:VARIANT",
+        default=None,
+        help="Decode the communication with multiple ECUs at once (passive mode only). May be\n"
+        "specified multiple times. The CAN channel may be a comma separated list of interfaces.",
+    )
     parser.add_argument(
         "--variant",
         "-v",
@@ -227,6 +316,25 @@ def run(args: argparse.Namespace) -> None:
     global odx_diag_layer
     odx_database = _parser_utils.load_file(args)
 
+    if args.ecu:
+        if args.active:
+            print("Multiple ECUs can only be snooped in passive mode")
+            sys.exit(1)
+        elif not args.trace and not args.channel:
+            print("Snooping multiple ECUs requires a CAN channel or a recorded trace")
+            sys.exit(1)
+
+        ecus = []
+        for rx_id, tx_id, variant in args.ecu:
+            diag_layer = odx_database.diag_layers.get(variant)
+            if diag_layer is None:
+                print(f"Variant '{variant}' does not exist")
+                sys.exit(1)
+            ecus.append(MonitoredEcu(diag_layer=diag_layer, rx_id=rx_id, tx_id=tx_id))
+
+        asyncio.run(multi_ecu_main(args, ecus))
+        return
+
     if (odx_database is not None or args.variant is not None) and (odx_database is None or
                                                                    args.variant is None):
         print("The database and variant must always either be "
@@ -288,6 +396,10 @@ def run(args: argparse.Namespace) -> None:
         print(f"Could not determine a CAN receive ID.")
         sys.exit(1)
 
+    if args.active and args.trace:
+        print("Recorded traces can only be decoded in passive mode")
+        sys.exit(1)
+
     if args.active:
         asyncio.run(active_main(args))
     else:
@@ -0,0 +1,291 @@
+# SPDX-License-Identifier: MIT
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Union
+
+from .decodeplan import DecodePlanField, _get_plan_field
+from .exceptions import DecodeError, odxraise
+from .odxtypes import DataType, ParameterValue
+from .parameters.parameter import Parameter
+from .parameters.valueparameter import ValueParameter
+from .structure import Structure
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+#: The result of decoding a batch of messages column-wise: The values
+#: of each leaf parameter, keyed by the short name path of the
+#: parameter. If NumPy is available, the values are NumPy arrays, else
+#: lists.
+ColumnarValues = dict[str, Union["NDArray[Any]", list[ParameterValue]]]
+
+#: The separator between the short names of the path of the leaf
+#: parameters of nested structures
+PATH_SEPARATOR = "."
+
+
+@dataclass(frozen=True)
+class ColumnarDecodePlanColumn:
+    """A leaf parameter which is decoded by a columnar decode plan"""
+
+    #: The short name path of the parameter
+    path: str
+
+    #: The properties of the parameter's internal value
+    field: DecodePlanField
+
+    #: The offset of the parameter's most significant bit from the
+    #: beginning of the message (counted like bitstruct does it,
+    #: i.e., starting at the most significant bit of the first byte)
+    bit_offset: int
+
+
+class ColumnarDecodePlan:
+    """Precompiled recipe to decode a batch of messages of fixed
+    layout column by column
+
+    Columnar decode plans are the batch variant of decode plans: The
+    messages are copied into a two-dimensional byte matrix and the
+    internal values of each leaf parameter are extracted for all
+    messages at once using vectorized NumPy operations. Parameters
+    of nested structures are flattened, i.e., their column is named
+    by the path of short names leading to them.
+
+    Use `compile_columnar_decode_plan()` to create columnar decode
+    plans.
+    """
+
+    def __init__(self, columns: list[ColumnarDecodePlanColumn], byte_length: int) -> None:
+        self._columns = columns
+        self._byte_length = byte_length
+
+    @property
+    def columns(self) -> list[ColumnarDecodePlanColumn]:
+        return self._columns
+
+    @property
+    def byte_length(self) -> int:
+        """The minimum length of the messages which can be decoded
+        using the plan"""
+        return self._byte_length
+
+    def decode(self, messages: Sequence[bytes | bytearray]) -> dict[str, "NDArray[Any]"] | None:
+        """Decode a batch of messages using the plan
+
+        If any of the messages is too short or if NumPy is not
+        available, `None` is returned. If a constant parameter
+        exhibits an unexpected value or if a value cannot be converted
+        to its physical representation, a `DecodeError` is raised.
+        """
+        if np is None or any(len(message) < self._byte_length for message in messages):
+            return None
+
+        n = self._byte_length
+        matrix = np.frombuffer(
+            b"".join(bytes(message[:n]) for message in messages),
+            dtype=np.uint8).reshape(len(messages), n)
+
+        result: dict[str, NDArray[Any]] = {}
+        for column in self._columns:
+            field = column.field
+            raw_values = self._extract_column(column, matrix)
+
+            if field.compu_method is None:
+                mismatches = np.flatnonzero(raw_values != field.coded_value)
+                if len(mismatches) > 0:
+                    odxraise(
+                        f"Message {mismatches[0]} exhibits an unexpected value for "
+                        f"constant parameter '{column.path}'", DecodeError)
+                result[column.path] = raw_values
+            else:
+                result[column.path] = field.compu_method._convert_internal_to_physical_array(
+                    raw_values)
+
+        return result
+
+    def _extract_column(self, column: ColumnarDecodePlanColumn,
+                        matrix: "NDArray[Any]") -> "NDArray[Any]":
+        field = column.field
+        first_byte = column.bit_offset // 8
+        leading_bits = column.bit_offset % 8
+        num_bytes = (leading_bits + field.bit_length + 7) // 8
+        span = matrix[:, first_byte:first_byte + num_bytes]
+
+        if field.base_data_type == DataType.A_BYTEFIELD:
+            # blobs are byte-aligned (cf. `_is_extractable()`)
+            blobs = np.empty(len(matrix), dtype=object)
+            for i, row in enumerate(span):
+                blobs[i] = row.tobytes()
+            return blobs
+
+        # assemble the bytes of the value into a single integer
+        byte_indices = range(num_bytes - 1, -1, -1) if field.is_little_endian else range(num_bytes)
+        raw = np.zeros(len(matrix), dtype=np.uint64)
+        for byte_idx in byte_indices:
+            raw = (raw << np.uint64(8)) | span[:, byte_idx]
+
+        trailing_bits = 8 * num_bytes - leading_bits - field.bit_length
+        if trailing_bits > 0:
+            raw >>= np.uint64(trailing_bits)
+        if field.bit_length < 64:
+            raw &= np.uint64((1 << field.bit_length) - 1)
+
+        if field.base_data_type == DataType.A_FLOAT32:
+            result: NDArray[Any] = raw.astype(np.uint32).view(np.float32).astype(np.float64)
+            return result
+        elif field.base_data_type == DataType.A_FLOAT64:
+            return raw.view(np.float64)
+
+        values = raw.astype(np.int64)
+        if field.base_data_type == DataType.A_INT32:
+            # two-complement
+            sign_bit = 1 << (field.bit_length - 1)
+            values = np.where(values >= sign_bit, values - 2 * sign_bit, values)
+        return values
+
+
+def _is_extractable(field: DecodePlanField, bit_offset: int) -> bool:
+    """Returns True iff the values of a field can be extracted by
+    columnar decode plans"""
+    if field.base_data_type == DataType.A_BYTEFIELD:
+        # blobs must be byte-aligned
+        return bit_offset % 8 == 0 and field.bit_length % 8 == 0
+
+    # the value must fit into a 64 bit integer
+    return (bit_offset % 8 + field.bit_length + 7) // 8 <= 8
+
+
+def _compile_columns(parameters: Iterable[Parameter], origin: int, path_prefix: str,
+                     columns: list[ColumnarDecodePlanColumn]) -> tuple[int, int] | None:
+    """Compute the columns of a list of parameters that starts at a
+    given byte position
+
+    This mirrors the position computations of
+    `composite_codec_decode_from_pdu()`. The result is the byte
+    position of the cursor after the last parameter and the position
+    of the end of the parameter which extends furthest, or `None` if
+    the parameters cannot be decoded column-wise.
+    """
+    cursor = origin
+    end_position = origin
+    for param in parameters:
+        if param.byte_position is not None:
+            cursor = origin + param.byte_position
+        bit_position = param.bit_position or 0
+
+        if type(param) is ValueParameter and type(param.dop) is Structure:
+            if bit_position != 0:
+                return None
+
+            structure = param.dop
+            sub_result = _compile_columns(structure.parameters, cursor,
+                                          f"{path_prefix}{param.short_name}{PATH_SEPARATOR}",
+                                          columns)
+            if sub_result is None:
+                return None
+
+            sub_cursor, sub_end_position = sub_result
+            end_position = max(end_position, sub_end_position)
+            if structure.byte_size is not None:
+                if sub_cursor - cursor > structure.byte_size:
+                    return None
+                sub_cursor = cursor + structure.byte_size
+            cursor = sub_cursor
+            continue
+
+        field = _get_plan_field(param)
+        if field is None:
+            return None
+
+        padding = (8 - (field.bit_length + bit_position) % 8) % 8
+        bit_offset = cursor * 8 + padding
+        if not _is_extractable(field, bit_offset):
+            return None
+
+        columns.append(
+            ColumnarDecodePlanColumn(
+                path=f"{path_prefix}{param.short_name}", field=field, bit_offset=bit_offset))
+
+        cursor += (field.bit_length + bit_position + 7) // 8
+        end_position = max(end_position, cursor)
+
+    return cursor, end_position
+
+
+def compile_columnar_decode_plan(parameters: list[Parameter]) -> ColumnarDecodePlan | None:
+    """Compile a columnar decode plan for the parameters of a
+    composite codec object
+
+    In addition to the parameters supported by regular decode plans,
+    VALUE parameters of nested structures with a fixed layout are
+    supported. If the parameters do not exhibit a fixed layout, `None`
+    is returned.
+    """
+    if len(parameters) == 0:
+        return None
+
+    columns: list[ColumnarDecodePlanColumn] = []
+    result = _compile_columns(parameters, 0, "", columns)
+    if result is None:
+        return None
+
+    _, byte_length = result
+    return ColumnarDecodePlan(columns, byte_length)
+
+
+def _flatten_values(value: ParameterValue, path_prefix: str) -> Iterable[tuple[str, Any]]:
+    if not isinstance(value, dict):
+        yield path_prefix, value
+        return
+
+    for name, sub_value in value.items():
+        path = f"{path_prefix}{PATH_SEPARATOR}{name}" if path_prefix else name
+        yield from _flatten_values(sub_value, path)
+
+
+def _make_column(values: list[Any]) -> "NDArray[Any]":
+    if all(isinstance(x, (int, float)) for x in values):
+        return np.asarray(values)
+
+    # everything else is stored as objects to avoid that e.g. blobs
+    # get truncated or that lists are turned into extra dimensions
+    result = np.empty(len(values), dtype=object)
+    for i, x in enumerate(values):
+        result[i] = x
+    return result
+
+
+def decode_columnar(messages: Iterable[bytes | bytearray], plan: ColumnarDecodePlan | None,
+                    decode_fn: Callable[[bytes | bytearray], ParameterValue]) -> ColumnarValues:
+    """Decode a batch of messages into one column per leaf parameter
+
+    If a columnar decode plan is available and applicable to all
+    messages, the messages are decoded using vectorized operations.
+    Otherwise, each message is decoded individually using `decode_fn`
+    and the results are flattened into columns. Values of leaf
+    parameters missing from a message (e.g. because a different
+    multiplexer case applies) are set to `None`.
+    """
+    messages = messages if isinstance(messages, Sequence) else list(messages)
+
+    if plan is not None and (plan_values := plan.decode(messages)) is not None:
+        return dict(plan_values)
+
+    columns: dict[str, list[Any]] = {}
+    for i, message in enumerate(messages):
+        for path, value in _flatten_values(decode_fn(message), ""):
+            columns.setdefault(path, [None] * i).append(value)
+
+        for column in columns.values():
+            if len(column) < i + 1:
+                column.append(None)
+
+    if np is None:
+        return dict(columns)
+
+    return {path: _make_column(values) for path, values in columns.items()}
@@ -0,0 +1,204 @@
+# SPDX-License-Identifier: MIT
+from collections.abc import Callable, Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Union
+
+from ..exceptions import odxraise
+from ..odxtypes import AtomicOdxType, DataType
+from .intervaltype import IntervalType
+from .limit import Limit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+#: True if NumPy is available, i.e., if compu methods are able to
+#: convert whole arrays of values at once
+HAVE_NUMPY = np is not None
+
+#: The result of converting a sequence of values at once: a NumPy
+#: array if NumPy is available, else a list
+ArrayConversionResult = Union["NDArray[Any]", list[AtomicOdxType]]
+
+
+def require_numpy() -> None:
+    """Raise an error if NumPy is not available"""
+    if np is None:
+        raise ImportError("Converting arrays of values requires NumPy. "
+                          "Use `pip install odxtools[numpy]` to install it.")
+
+
+def make_array(values: Iterable[Any]) -> "NDArray[Any]":
+    """Convert the argument of the array conversion methods of compu
+    methods to a NumPy array
+
+    NumPy arrays are not copied.
+    """
+    require_numpy()
+
+    if not isinstance(values, (np.ndarray, Sequence)):
+        values = list(values)
+
+    return np.asarray(values)
+
+
+def is_numeric_array(values: "NDArray[Any]") -> bool:
+    """Returns True iff an array can be processed by the vectorized
+    arithmetic of the numeric compu methods"""
+    return values.dtype.kind in "biuf"
+
+
+def dtype_complies(values: "NDArray[Any]", data_type: DataType) -> bool:
+    """Vectorized version of the type checks of the compu method
+    segments: Integer types only accept integers, float types accept
+    any number"""
+    if data_type in (DataType.A_INT32, DataType.A_UINT32):
+        return values.dtype.kind in "biu"
+    elif data_type in (DataType.A_FLOAT32, DataType.A_FLOAT64):
+        return values.dtype.kind in "biuf"
+
+    return False
+
+
+def lower_limit_mask(limit: Limit | None, values: "NDArray[Any]") -> "NDArray[Any]":
+    """Vectorized version of `Limit.complies_to_lower()`"""
+    if limit is None or limit.value is None or limit.interval_type == IntervalType.INFINITE:
+        return np.ones(values.shape, dtype=bool)
+    elif not isinstance(limit.value, (int, float)):
+        odxraise(f"Non-numeric limit {limit.value!r} cannot be applied to arrays")
+        return np.zeros(values.shape, dtype=bool)
+    elif limit.interval_type == IntervalType.OPEN:
+        return values > limit.value
+
+    # CLOSED or unspecified interval type
+    return values >= limit.value
+
+
+def upper_limit_mask(limit: Limit | None, values: "NDArray[Any]") -> "NDArray[Any]":
+    """Vectorized version of `Limit.complies_to_upper()`"""
+    if limit is None or limit.value is None or limit.interval_type == IntervalType.INFINITE:
+        return np.ones(values.shape, dtype=bool)
+    elif not isinstance(limit.value, (int, float)):
+        odxraise(f"Non-numeric limit {limit.value!r} cannot be applied to arrays")
+        return np.zeros(values.shape, dtype=bool)
+    elif limit.interval_type == IntervalType.OPEN:
+        return values < limit.value
+
+    # CLOSED or unspecified interval type
+    return values <= limit.value
+
+
+def interval_mask(values: "NDArray[Any]", data_type: DataType, lower_limit: Limit | None,
+                  upper_limit: Limit | None) -> "NDArray[Any]":
+    """Returns which values of an array are of a given data type and
+    lie within the interval given by two limits
+
+    This is the vectorized version of the `applies()` methods of the
+    segments of linear and rational compu methods.
+    """
+    if not dtype_complies(values, data_type):
+        return np.zeros(values.shape, dtype=bool)
+
+    result: NDArray[Any] = lower_limit_mask(lower_limit, values) & upper_limit_mask(
+        upper_limit, values)
+    return result
+
+
+def select_first_segment(masks: list["NDArray[Any]"],
+                         shape: tuple[int, ...]) -> tuple["NDArray[Any]", "NDArray[Any]"]:
+    """Determine the first applicable segment for each value
+
+    `masks` specifies for each segment which values it applies
+    to. The result is the index of the first applicable segment for
+    each value and a boolean array which specifies whether any
+    segment applies.
+    """
+    if not masks:
+        return np.zeros(shape, dtype=np.intp), np.zeros(shape, dtype=bool)
+
+    stacked = np.stack(masks)
+    is_valid: NDArray[Any] = np.asarray(stacked.any(axis=0))
+    return np.argmax(stacked, axis=0), is_valid
+
+
+def convert_piecewise(
+    values: "NDArray[Any]", masks: list["NDArray[Any]"],
+    convert_fns: list[Callable[["NDArray[Any]"], "NDArray[Any]"]]
+) -> tuple["NDArray[Any]", "NDArray[Any]"]:
+    """Convert an array using a piecewise defined function
+
+    `masks` specifies which values each segment of the function
+    applies to and `convert_fns` the vectorized conversion function of
+    each segment. Like for the scalar conversion, the first applicable
+    segment is used. Each conversion function is only called for the
+    values it is responsible for. The result is the converted array
+    and a boolean array which specifies which values could be
+    converted.
+    """
+    segment_idx, is_valid = select_first_segment(masks, values.shape)
+    result = np.zeros(values.shape, dtype=np.float64)
+    for i, convert_fn in enumerate(convert_fns):
+        selected = is_valid & (segment_idx == i)
+        if selected.any():
+            result[selected] = convert_fn(values[selected])
+
+    return result, is_valid
+
+
+def convert_elementwise(convert: Callable[[AtomicOdxType], AtomicOdxType],
+                        values: "NDArray[Any]") -> "NDArray[Any]":
+    """Convert an array by applying a scalar conversion function to
+    each of its elements
+
+    This is the fallback for compu methods which do not provide a
+    vectorized implementation.
+    """
+    result = np.asarray([convert(x) for x in values.ravel().tolist()])
+    if result.size == values.size:
+        result = result.reshape(values.shape)
+
+    return result
+
+
+def convert_unique(convert: Callable[[AtomicOdxType], AtomicOdxType],
+                   values: "NDArray[Any]") -> "NDArray[Any]":
+    """Convert an array by applying a scalar conversion function to
+    each distinct value of the array
+
+    This is efficient for value tables, where the number of distinct
+    values is usually small. Arrays whose values cannot be ordered are
+    converted element by element.
+    """
+    try:
+        unique_values, inverse = np.unique(values.ravel(), return_inverse=True)
+    except TypeError:
+        return convert_elementwise(convert, values)
+
+    converted = np.asarray([convert(x) for x in unique_values.tolist()])
+    return converted[inverse].reshape(values.shape)
+
+
+def cast_numeric_array(values: "NDArray[Any]",
+                       data_type: DataType,
+                       *,
+                       round_values: bool = False) -> "NDArray[Any]":
+    """Convert an array of numbers to the representation of an ODX
+    data type
+
+    If the values are converted to an integer type, they are rounded
+    (like `round()` does) if `round_values` is true, else they are
+    truncated (like `DataType.make_from()` does).
+    """
+    if data_type in (DataType.A_INT32, DataType.A_UINT32):
+        if values.dtype.kind in "biu":
+            return values.astype(np.int64)
+        integral: NDArray[Any] = np.rint(values) if round_values else np.trunc(values)
+        return integral.astype(np.int64)
+    elif data_type in (DataType.A_FLOAT32, DataType.A_FLOAT64):
+        return values.astype(np.float64)
+
+    odxraise(f"Arrays of type {data_type.value} are not supported")
+    return values
@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: MIT
+from collections.abc import Iterable
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from xml.etree import ElementTree
 
 from ..exceptions import odxraise
@@ -8,10 +9,14 @@ from ..odxdoccontext import OdxDocContext
 from ..odxlink import OdxLinkDatabase, OdxLinkId
 from ..odxtypes import AtomicOdxType, DataType
 from ..snrefcontext import SnRefContext
+from .arrayconversion import HAVE_NUMPY, ArrayConversionResult, convert_elementwise, make_array
 from .compucategory import CompuCategory
 from .compuinternaltophys import CompuInternalToPhys
 from .compuphystointernal import CompuPhysToInternal
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 
 @dataclass(kw_only=True)
 class CompuMethod:
@@ -99,6 +104,42 @@ class CompuMethod:
     def convert_internal_to_physical(self, internal_value: AtomicOdxType) -> AtomicOdxType:
         raise NotImplementedError()
 
+    def convert_physical_to_internal_array(self, physical_values: Iterable[AtomicOdxType]
+                                          ) -> ArrayConversionResult:
+        """Convert a whole sequence of physical values at once
+
+        If NumPy is available, the result is a NumPy array and the
+        numeric compu methods use vectorized arithmetic. Otherwise,
+        the values are converted one by one and a list is returned.
+        """
+        if not HAVE_NUMPY:
+            return [self.convert_physical_to_internal(x) for x in physical_values]
+
+        return self._convert_physical_to_internal_array(make_array(physical_values))
+
+    def convert_internal_to_physical_array(self, internal_values: Iterable[AtomicOdxType]
+                                          ) -> ArrayConversionResult:
+        """Convert a whole sequence of internal values at once
+
+        If NumPy is available, the result is a NumPy array and the
+        numeric compu methods use vectorized arithmetic. Otherwise,
+        the values are converted one by one and a list is returned.
+        """
+        if not HAVE_NUMPY:
+            return [self.convert_internal_to_physical(x) for x in internal_values]
+
+        return self._convert_internal_to_physical_array(make_array(internal_values))
+
+    def _convert_physical_to_internal_array(self,
+                                            physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        # compu methods which support vectorized conversions override this
+        return convert_elementwise(self.convert_physical_to_internal, physical_values)
+
+    def _convert_internal_to_physical_array(self,
+                                            internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        # compu methods which support vectorized conversions override this
+        return convert_elementwise(self.convert_internal_to_physical, internal_values)
+
     def is_valid_physical_value(self, physical_value: AtomicOdxType) -> bool:
         raise NotImplementedError()
 
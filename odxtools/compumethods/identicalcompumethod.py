@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 from xml.etree import ElementTree
 
 from ..exceptions import odxassert
@@ -8,6 +9,9 @@ from ..odxtypes import AtomicOdxType, DataType
 from ..utils import dataclass_fields_asdict
 from .compumethod import CompuMethod
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 
 @dataclass(kw_only=True)
 class IdenticalCompuMethod(CompuMethod):
@@ -42,6 +46,14 @@ class IdenticalCompuMethod(CompuMethod):
     def convert_internal_to_physical(self, internal_value: AtomicOdxType) -> AtomicOdxType:
         return internal_value
 
+    def _convert_physical_to_internal_array(self,
+                                            physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        return physical_values.copy()
+
+    def _convert_internal_to_physical_array(self,
+                                            internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        return internal_values.copy()
+
     def is_valid_physical_value(self, physical_value: AtomicOdxType) -> bool:
         return self.physical_type.isinstance(physical_value)
 
@@ -1,11 +1,21 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from ..exceptions import odxraise, odxrequire
 from ..odxtypes import AtomicOdxType, DataType
+from .arrayconversion import interval_mask
 from .compuscale import CompuScale
 from .limit import Limit
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 
 @dataclass(kw_only=True)
 class LinearSegment:
@@ -108,6 +118,25 @@ class LinearSegment:
 
         return result
 
+    def convert_internal_to_physical_array(self, internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        """Vectorized version of `convert_internal_to_physical()`
+
+        In contrast to the scalar version, the result is not rounded
+        for integer physical types.
+        """
+        return (self.offset + self.factor * internal_values) / self.denominator
+
+    def convert_physical_to_internal_array(self, physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        """Vectorized version of `convert_physical_to_internal()`
+
+        In contrast to the scalar version, the result is not rounded
+        for integer internal types.
+        """
+        if abs(self.factor) < 1e-10:
+            return np.full(physical_values.shape, self.inverse_value)
+
+        return (physical_values * self.denominator - self.offset) / self.factor
+
     def __compute_physical_limits(self) -> None:
         """Computes the physical limits and stores them in the properties
         self._physical_lower_limit and self._physical_upper_limit.
@@ -187,3 +216,13 @@ class LinearSegment:
             return False
 
         return True
+
+    def physical_applies_array(self, physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        """Vectorized version of `physical_applies()`"""
+        return interval_mask(physical_values, self.physical_type, self._physical_lower_limit,
+                             self._physical_upper_limit)
+
+    def internal_applies_array(self, internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        """Vectorized version of `internal_applies()`"""
+        return interval_mask(internal_values, self.internal_type, self.internal_lower_limit,
+                             self.internal_upper_limit)
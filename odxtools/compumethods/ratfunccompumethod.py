@@ -1,16 +1,20 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass
-from typing import cast
+from typing import TYPE_CHECKING, Any, cast
 from xml.etree import ElementTree
 
 from ..exceptions import DecodeError, EncodeError, odxassert, odxraise
 from ..odxdoccontext import OdxDocContext
 from ..odxtypes import AtomicOdxType, DataType
 from ..utils import dataclass_fields_asdict
+from .arrayconversion import cast_numeric_array, is_numeric_array
 from .compucategory import CompuCategory
 from .compumethod import CompuMethod
 from .ratfuncsegment import RatFuncSegment
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 
 @dataclass(kw_only=True)
 class RatFuncCompuMethod(CompuMethod):
@@ -99,6 +103,35 @@ class RatFuncCompuMethod(CompuMethod):
 
         return self._phys_to_int_segment.convert(physical_value)
 
+    def _convert_internal_to_physical_array(self,
+                                            internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        if not is_numeric_array(internal_values):
+            return super()._convert_internal_to_physical_array(internal_values)
+
+        if not self._int_to_phys_segment.applies_array(internal_values).all():
+            odxraise("Cannot decode all internal values", DecodeError)
+            return super()._convert_internal_to_physical_array(internal_values)
+
+        return cast_numeric_array(
+            self._int_to_phys_segment.convert_array(internal_values),
+            self.physical_type,
+            round_values=True)
+
+    def _convert_physical_to_internal_array(self,
+                                            physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        if not is_numeric_array(physical_values):
+            return super()._convert_physical_to_internal_array(physical_values)
+
+        if self._phys_to_int_segment is None or not self._phys_to_int_segment.applies_array(
+                physical_values).all():
+            odxraise("Cannot encode all physical values", EncodeError)
+            return super()._convert_physical_to_internal_array(physical_values)
+
+        return cast_numeric_array(
+            self._phys_to_int_segment.convert_array(physical_values),
+            self.internal_type,
+            round_values=True)
+
     def is_valid_physical_value(self, physical_value: AtomicOdxType) -> bool:
         return self._phys_to_int_segment is not None and self._phys_to_int_segment.applies(
             physical_value)
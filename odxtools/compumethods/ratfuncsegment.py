@@ -1,11 +1,16 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 from ..exceptions import odxraise, odxrequire
 from ..odxtypes import AtomicOdxType, DataType
+from .arrayconversion import interval_mask
 from .compuscale import CompuScale
 from .limit import Limit
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 
 @dataclass(kw_only=True)
 class RatFuncSegment:
@@ -64,6 +69,27 @@ class RatFuncSegment:
 
         return result
 
+    def convert_array(self, values: "NDArray[Any]") -> "NDArray[Any]":
+        """Vectorized version of `convert()`
+
+        In contrast to the scalar version, the result is not rounded
+        for integer value types.
+        """
+        x = values.astype(float)
+
+        numerator = x * 0.0
+        for numerator_coeff in reversed(self.numerator_coeffs):
+            numerator *= x
+            numerator += float(numerator_coeff)
+
+        denominator = x * 0.0
+        for denominator_coeff in reversed(self.denominator_coeffs):
+            denominator *= x
+            denominator += float(denominator_coeff)
+
+        result: NDArray[Any] = numerator / denominator
+        return result
+
     def applies(self, value: AtomicOdxType) -> bool:
         """Returns True iff the segment is applicable to a given internal value"""
         # Do type checks
@@ -84,3 +110,7 @@ class RatFuncSegment:
             return False
 
         return True
+
+    def applies_array(self, values: "NDArray[Any]") -> "NDArray[Any]":
+        """Vectorized version of `applies()`"""
+        return interval_mask(values, self.value_type, self.lower_limit, self.upper_limit)
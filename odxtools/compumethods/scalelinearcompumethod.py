@@ -1,17 +1,21 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass
-from typing import cast
+from typing import TYPE_CHECKING, Any, cast
 from xml.etree import ElementTree
 
 from ..exceptions import DecodeError, EncodeError, odxassert, odxraise
 from ..odxdoccontext import OdxDocContext
 from ..odxtypes import AtomicOdxType, DataType
 from ..utils import dataclass_fields_asdict
+from .arrayconversion import cast_numeric_array, convert_piecewise, is_numeric_array
 from .compucategory import CompuCategory
 from .compumethod import CompuMethod
 from .intervaltype import IntervalType
 from .linearsegment import LinearSegment
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 
 @dataclass(kw_only=True)
 class ScaleLinearCompuMethod(CompuMethod):
@@ -139,6 +143,39 @@ class ScaleLinearCompuMethod(CompuMethod):
         seg = applicable_segments[0]
         return seg.convert_internal_to_physical(internal_value)
 
+    def _convert_physical_to_internal_array(self,
+                                            physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        if not is_numeric_array(physical_values):
+            return super()._convert_physical_to_internal_array(physical_values)
+
+        if not self._is_invertible:
+            odxraise(
+                "Trying to encode values using a non-invertible SCALE-LINEAR transfer function",
+                EncodeError)
+
+        result, is_valid = convert_piecewise(physical_values, [
+            seg.physical_applies_array(physical_values) for seg in self._segments
+        ], [seg.convert_physical_to_internal_array for seg in self._segments])
+        if not is_valid.all():
+            odxraise("No applicable segment found for some physical values", EncodeError)
+            return super()._convert_physical_to_internal_array(physical_values)
+
+        return cast_numeric_array(result, self.internal_type, round_values=True)
+
+    def _convert_internal_to_physical_array(self,
+                                            internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        if not is_numeric_array(internal_values):
+            return super()._convert_internal_to_physical_array(internal_values)
+
+        result, is_valid = convert_piecewise(internal_values, [
+            seg.internal_applies_array(internal_values) for seg in self._segments
+        ], [seg.convert_internal_to_physical_array for seg in self._segments])
+        if not is_valid.all():
+            odxraise("No applicable segment found for some internal values", DecodeError)
+            return super()._convert_internal_to_physical_array(internal_values)
+
+        return cast_numeric_array(result, self.physical_type, round_values=True)
+
     def is_valid_physical_value(self, physical_value: AtomicOdxType) -> bool:
         return any(True for seg in self._segments if seg.physical_applies(physical_value))
 
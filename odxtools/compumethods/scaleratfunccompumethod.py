@@ -1,16 +1,20 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass
-from typing import cast
+from typing import TYPE_CHECKING, Any, cast
 from xml.etree import ElementTree
 
 from ..exceptions import DecodeError, EncodeError, odxassert, odxraise
 from ..odxdoccontext import OdxDocContext
 from ..odxtypes import AtomicOdxType, DataType
 from ..utils import dataclass_fields_asdict
+from .arrayconversion import cast_numeric_array, convert_piecewise, is_numeric_array
 from .compucategory import CompuCategory
 from .compumethod import CompuMethod
 from .ratfuncsegment import RatFuncSegment
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 
 @dataclass(kw_only=True)
 class ScaleRatFuncCompuMethod(CompuMethod):
@@ -104,6 +108,34 @@ class ScaleRatFuncCompuMethod(CompuMethod):
                  EncodeError)
         return cast(AtomicOdxType, None)
 
+    def _convert_internal_to_physical_array(self,
+                                            internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        if not is_numeric_array(internal_values):
+            return super()._convert_internal_to_physical_array(internal_values)
+
+        result, is_valid = convert_piecewise(internal_values, [
+            seg.applies_array(internal_values) for seg in self._int_to_phys_segments
+        ], [seg.convert_array for seg in self._int_to_phys_segments])
+        if not is_valid.all():
+            odxraise("Not all internal values can be decoded using this compumethod", DecodeError)
+            return super()._convert_internal_to_physical_array(internal_values)
+
+        return cast_numeric_array(result, self.physical_type, round_values=True)
+
+    def _convert_physical_to_internal_array(self,
+                                            physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        if not is_numeric_array(physical_values) or self._phys_to_int_segments is None:
+            return super()._convert_physical_to_internal_array(physical_values)
+
+        result, is_valid = convert_piecewise(physical_values, [
+            seg.applies_array(physical_values) for seg in self._phys_to_int_segments
+        ], [seg.convert_array for seg in self._phys_to_int_segments])
+        if not is_valid.all():
+            odxraise("Not all physical values can be encoded using this compumethod", EncodeError)
+            return super()._convert_physical_to_internal_array(physical_values)
+
+        return cast_numeric_array(result, self.internal_type, round_values=True)
+
     def is_valid_internal_value(self, internal_value: AtomicOdxType) -> bool:
         return any(seg.applies(internal_value) for seg in self._int_to_phys_segments)
 
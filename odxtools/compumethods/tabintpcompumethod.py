@@ -1,16 +1,34 @@
 # SPDX-License-Identifier: MIT
+from bisect import bisect_left
 from dataclasses import dataclass
+from functools import cached_property
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any
 from xml.etree import ElementTree
 
 from ..exceptions import DecodeError, EncodeError, odxassert, odxraise, odxrequire
 from ..odxdoccontext import OdxDocContext
 from ..odxtypes import AtomicOdxType, DataType
 from ..utils import dataclass_fields_asdict
+from .arrayconversion import cast_numeric_array, is_numeric_array
 from .compucategory import CompuCategory
 from .compumethod import CompuMethod
 from .intervaltype import IntervalType
 from .limit import Limit
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+#: The sample points of a piecewise linear function as NumPy arrays:
+#: the sample points of the domain, the sample points of the range
+#: and whether the domain sample points are sorted
+_SampleArrays = tuple["NDArray[Any]", "NDArray[Any]", bool]
+
 
 @dataclass(kw_only=True)
 class TabIntpCompuMethod(CompuMethod):
@@ -89,21 +107,33 @@ class TabIntpCompuMethod(CompuMethod):
             self._internal_points.append(internal_point)
             self._physical_points.append(physical_point)
 
+        # the range of valid values is required for every conversion,
+        # so it is only determined once
+        self._physical_min = min(self._physical_points)
+        self._physical_max = max(self._physical_points)
+        self._internal_min = min(self._internal_points)
+        self._internal_max = max(self._internal_points)
+
+        # if the sample points are sorted, the interval which contains
+        # a given value can be determined using binary search
+        self._physical_points_sorted = all(a <= b for a, b in pairwise(self._physical_points))
+        self._internal_points_sorted = all(a <= b for a, b in pairwise(self._internal_points))
+
         self._physical_lower_limit = Limit(
-            value_raw=str(min(self._physical_points)),
+            value_raw=str(self._physical_min),
             value_type=self.physical_type,
             interval_type=IntervalType.CLOSED)
         self._physical_upper_limit = Limit(
-            value_raw=str(max(self._physical_points)),
+            value_raw=str(self._physical_max),
             value_type=self.physical_type,
             interval_type=IntervalType.CLOSED)
 
         self._internal_lower_limit = Limit(
-            value_raw=str(min(self._internal_points)),
+            value_raw=str(self._internal_min),
             value_type=self.internal_type,
             interval_type=IntervalType.CLOSED)
         self._internal_upper_limit = Limit(
-            value_raw=str(max(self._internal_points)),
+            value_raw=str(self._internal_max),
             value_type=self.internal_type,
             interval_type=IntervalType.CLOSED)
 
@@ -130,14 +160,81 @@ class TabIntpCompuMethod(CompuMethod):
             " [A_INT32, A_UINT32, A_FLOAT32, A_FLOAT64]")
 
     def __piecewise_linear_interpolate(self, x: int | float, range_samples: list[int | float],
-                                       domain_samples: list[int | float]) -> float | None:
-        for i in range(0, len(range_samples) - 1):
-            if (x0 := range_samples[i]) <= x and x <= (x1 := range_samples[i + 1]):
-                y0 = domain_samples[i]
-                y1 = domain_samples[i + 1]
-                return y0 + (x - x0) * (y1 - y0) / (x1 - x0)
+                                       domain_samples: list[int | float],
+                                       range_samples_sorted: bool) -> float | None:
+        if range_samples_sorted:
+            # the first interval [x0, x1] which contains x is the one
+            # where x1 is the first sample point that is not smaller
+            # than x
+            i = bisect_left(range_samples, x)
+            if i == 0:
+                if len(range_samples) < 2 or x != range_samples[0]:
+                    return None
+                i = 1
+            elif i == len(range_samples):
+                return None
+            i -= 1
+        else:
+            for i in range(0, len(range_samples) - 1):
+                if range_samples[i] <= x and x <= range_samples[i + 1]:
+                    break
+            else:
+                return None
+
+        x0 = range_samples[i]
+        x1 = range_samples[i + 1]
+        y0 = domain_samples[i]
+        y1 = domain_samples[i + 1]
+        if x0 == x1:
+            return y0
+        return y0 + (x - x0) * (y1 - y0) / (x1 - x0)
+
+    @cached_property
+    def _internal_sample_arrays(self) -> _SampleArrays:
+        return (np.asarray(self._internal_points, dtype=np.float64),
+                np.asarray(self._physical_points, dtype=np.float64), self._internal_points_sorted)
+
+    @cached_property
+    def _physical_sample_arrays(self) -> _SampleArrays:
+        return (np.asarray(self._physical_points, dtype=np.float64),
+                np.asarray(self._internal_points, dtype=np.float64), self._physical_points_sorted)
 
-        return None
+    @staticmethod
+    def __piecewise_linear_interpolate_array(x: "NDArray[Any]", sample_arrays: _SampleArrays
+                                            ) -> tuple["NDArray[Any]", "NDArray[Any]"]:
+        """Vectorized version of `__piecewise_linear_interpolate()`
+
+        Returns the interpolated values and a boolean array which
+        specifies which of the values are valid.
+        """
+        range_samples, domain_samples, range_samples_sorted = sample_arrays
+        num_intervals = len(range_samples) - 1
+        x = x.astype(np.float64)
+
+        if range_samples_sorted:
+            idx = np.searchsorted(range_samples, x, side="left") - 1
+            idx = np.clip(idx, 0, max(num_intervals - 1, 0))
+            is_valid = (x >= range_samples[0]) & (x <= range_samples[-1])
+        else:
+            # select the first interval that contains each value
+            x_col = x[..., np.newaxis]
+            in_interval = (range_samples[:-1] <= x_col) & (x_col <= range_samples[1:])
+            idx = np.argmax(in_interval, axis=-1)
+            is_valid = in_interval.any(axis=-1)
+
+        if num_intervals < 1:
+            return np.full(x.shape, domain_samples[0]), is_valid & (x == range_samples[0])
+
+        x0 = range_samples[idx]
+        x1 = range_samples[idx + 1]
+        y0 = domain_samples[idx]
+        y1 = domain_samples[idx + 1]
+        dx = x1 - x0
+        is_degenerate = dx == 0
+        result = np.where(is_degenerate, y0,
+                          y0 + (x - x0) * (y1 - y0) / np.where(is_degenerate, 1.0, dx))
+
+        return result, is_valid
 
     def convert_physical_to_internal(self, physical_value: AtomicOdxType) -> AtomicOdxType:
         if not isinstance(physical_value, (int, float)):
@@ -149,12 +246,13 @@ class TabIntpCompuMethod(CompuMethod):
             isinstance(physical_value, (int, float)),
             "Only integers and floats can be piecewise linearly interpolated", EncodeError)
         result = self.__piecewise_linear_interpolate(physical_value, self._physical_points,
-                                                     self._internal_points)
+                                                     self._internal_points,
+                                                     self._physical_points_sorted)
 
         if result is None:
             odxraise(
                 f"Internal value {physical_value!r} must be inside the range"
-                f" [{min(self.physical_points)}, {max(self.physical_points)}]", EncodeError)
+                f" [{self._physical_min}, {self._physical_max}]", EncodeError)
 
         res = self.internal_type.make_from(result)
 
@@ -172,28 +270,60 @@ class TabIntpCompuMethod(CompuMethod):
             "Only integers and floats can be piecewise linearly interpolated", DecodeError)
 
         result = self.__piecewise_linear_interpolate(internal_value, self._internal_points,
-                                                     self._physical_points)
+                                                     self._physical_points,
+                                                     self._internal_points_sorted)
 
         if result is None:
             odxraise(
                 f"Internal value {internal_value!r} must be inside the range"
-                f" [{min(self.internal_points)}, {max(self.internal_points)}]", DecodeError)
+                f" [{self._internal_min}, {self._internal_max}]", DecodeError)
             return None
 
         res = self.physical_type.make_from(result)
 
         return res
 
+    def _convert_physical_to_internal_array(self,
+                                            physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        # values outside of the valid range cause an EncodeError. (In
+        # non-strict mode, the values which are returned for them are
+        # unspecified.)
+        if not is_numeric_array(physical_values):
+            return super()._convert_physical_to_internal_array(physical_values)
+
+        result, is_valid = self.__piecewise_linear_interpolate_array(physical_values,
+                                                                     self._physical_sample_arrays)
+
+        if not is_valid.all():
+            odxraise(
+                f"Physical values must be inside the range"
+                f" [{self._physical_min}, {self._physical_max}]", EncodeError)
+
+        return cast_numeric_array(result, self.internal_type)
+
+    def _convert_internal_to_physical_array(self,
+                                            internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        if not is_numeric_array(internal_values):
+            return super()._convert_internal_to_physical_array(internal_values)
+
+        result, is_valid = self.__piecewise_linear_interpolate_array(internal_values,
+                                                                     self._internal_sample_arrays)
+
+        if not is_valid.all():
+            odxraise(
+                f"Internal values must be inside the range"
+                f" [{self._internal_min}, {self._internal_max}]", DecodeError)
+
+        return cast_numeric_array(result, self.physical_type)
+
     def is_valid_physical_value(self, physical_value: AtomicOdxType) -> bool:
         if not isinstance(physical_value, (int, float)):
             return False
 
-        return min(self.physical_points) <= physical_value and physical_value <= max(
-            self.physical_points)
+        return self._physical_min <= physical_value and physical_value <= self._physical_max
 
     def is_valid_internal_value(self, internal_value: AtomicOdxType) -> bool:
         if not isinstance(internal_value, (int, float)):
             return False
 
-        return min(self.internal_points) <= internal_value and internal_value <= max(
-            self.internal_points)
+        return self._internal_min <= internal_value and internal_value <= self._internal_max
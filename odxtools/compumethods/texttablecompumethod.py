@@ -1,15 +1,21 @@
 # SPDX-License-Identifier: MIT
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import cast
+from typing import TYPE_CHECKING, Any, cast
 from xml.etree import ElementTree
 
 from ..exceptions import DecodeError, EncodeError, odxassert, odxraise, odxrequire
 from ..odxdoccontext import OdxDocContext
 from ..odxtypes import AtomicOdxType, DataType
 from ..utils import dataclass_fields_asdict
+from .arrayconversion import convert_unique
 from .compucategory import CompuCategory
 from .compumethod import CompuMethod
 from .compuscale import CompuScale
+from .intervaltype import IntervalType
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
 
 @dataclass(kw_only=True)
@@ -63,13 +69,115 @@ class TexttableCompuMethod(CompuMethod):
         if cpti is not None and (cdv := cpti.compu_default_value) is not None:
             self._compu_internal_default_value = self.internal_type.from_string(odxrequire(cdv.v))
 
+        self._build_scale_indices(scales)
+
+    def _build_scale_indices(self, scales: list[CompuScale]) -> None:
+        """Compute the lookup tables which are used to find the scales
+        applicable to a given internal or physical value
+
+        Scales that specify only a single limit are looked up using a
+        hash map, and scales for numeric intervals are located using
+        bisection if they do not overlap. All remaining scales are
+        checked individually.
+        """
+        self._scales = scales
+
+        # internal value -> indices of the scales that apply only to it
+        self._point_scale_index: dict[Any, list[int]] = {}
+
+        # the lower limits and the indices of the interval scales,
+        # ordered by their lower limit
+        self._range_lower_values: list[int | float] = []
+        self._range_scale_indices: list[int] = []
+
+        # indices of the scales which cannot be indexed
+        self._unindexed_scales: list[int] = []
+
+        range_scales: list[tuple[int | float, int]] = []
+        for scale_idx, scale in enumerate(scales):
+            if scale.lower_limit is not None and scale.upper_limit is not None:
+                lower_value = scale.lower_limit.value
+                upper_value = scale.upper_limit.value
+                if isinstance(lower_value, (int, float)) and \
+                   isinstance(upper_value, (int, float)) and \
+                   scale.lower_limit.interval_type != IntervalType.INFINITE and \
+                   scale.upper_limit.interval_type != IntervalType.INFINITE:
+                    range_scales.append((lower_value, scale_idx))
+                else:
+                    self._unindexed_scales.append(scale_idx)
+                continue
+
+            limit = scale.lower_limit or scale.upper_limit
+            if limit is None or limit.value is None:
+                self._unindexed_scales.append(scale_idx)
+                continue
+
+            self._point_scale_index.setdefault(limit.value, []).append(scale_idx)
+
+        # bisection can only be used if the intervals do not overlap
+        range_scales.sort()
+        for (lower_value, scale_idx), (next_lower_value, next_scale_idx) in zip(
+                range_scales, range_scales[1:], strict=False):
+            upper_limit = odxrequire(scales[scale_idx].upper_limit)
+            next_lower_limit = odxrequire(scales[next_scale_idx].lower_limit)
+            upper_value = cast(int | float, upper_limit.value)
+            if next_lower_value == lower_value or upper_value > next_lower_value or (
+                    upper_value == next_lower_value and
+                    upper_limit.interval_type != IntervalType.OPEN and
+                    next_lower_limit.interval_type != IntervalType.OPEN):
+                self._unindexed_scales += [x for _, x in range_scales]
+                self._unindexed_scales.sort()
+                break
+        else:
+            self._range_lower_values = [x for x, _ in range_scales]
+            self._range_scale_indices = [x for _, x in range_scales]
+
+        # physical value -> scales featuring it as their COMPU-CONST
+        self._compu_const_index: dict[Any, list[CompuScale]] = {}
+        for scale in scales:
+            if scale.compu_const is not None:
+                self._compu_const_index.setdefault(scale.compu_const.value, []).append(scale)
+
+    def _get_applicable_scales(self, internal_value: AtomicOdxType) -> list[CompuScale]:
+        scales = self._scales
+        try:
+            scale_indices = list(self._point_scale_index.get(internal_value, []))
+        except TypeError:
+            # unhashable internal value
+            return [x for x in scales if x.applies(internal_value)]
+
+        if isinstance(internal_value, (int, float)):
+            # since the interval scales do not overlap, only the
+            # interval that starts last before the value and its
+            # predecessor (if the two intervals touch) may apply
+            pos = bisect_right(self._range_lower_values, internal_value)
+            for i in range(max(pos - 2, 0), pos):
+                scale_idx = self._range_scale_indices[i]
+                if scales[scale_idx].applies(internal_value):
+                    scale_indices.append(scale_idx)
+        else:
+            scale_indices += [
+                i for i in self._range_scale_indices if scales[i].applies(internal_value)
+            ]
+
+        scale_indices += [i for i in self._unindexed_scales if scales[i].applies(internal_value)]
+
+        if len(scale_indices) > 1:
+            scale_indices.sort()
+        return [scales[i] for i in scale_indices]
+
+    def _get_scales_for_physical_value(self, physical_value: AtomicOdxType) -> list[CompuScale]:
+        try:
+            return self._compu_const_index.get(physical_value, [])
+        except TypeError:
+            # unhashable physical value
+            return [
+                x for x in self._scales
+                if x.compu_const is not None and x.compu_const.value == physical_value
+            ]
+
     def convert_physical_to_internal(self, physical_value: AtomicOdxType) -> AtomicOdxType:
-        scales = []
-        if (citp := self.compu_internal_to_phys) is not None:
-            scales = citp.compu_scales
-        matching_scales = [
-            x for x in scales if x.compu_const is not None and x.compu_const.value == physical_value
-        ]
+        matching_scales = self._get_scales_for_physical_value(physical_value)
 
         if len(matching_scales) == 0:
             if self._compu_internal_default_value is None:
@@ -92,10 +200,7 @@ class TexttableCompuMethod(CompuMethod):
         odxraise(f"Texttable compu method could not encode '{physical_value!r}'.", EncodeError)
 
     def convert_internal_to_physical(self, internal_value: AtomicOdxType) -> AtomicOdxType:
-        scales = []
-        if (citp := self.compu_internal_to_phys) is not None:
-            scales = citp.compu_scales
-        matching_scales: list[CompuScale] = [x for x in scales if x.applies(internal_value)]
+        matching_scales = self._get_applicable_scales(internal_value)
 
         if len(matching_scales) == 0:
             if self._compu_physical_default_value is None:
@@ -118,24 +223,23 @@ class TexttableCompuMethod(CompuMethod):
 
         odxraise(f"Texttable compu method could not decode '{internal_value!r}'.", EncodeError)
 
+    def _convert_physical_to_internal_array(self,
+                                            physical_values: "NDArray[Any]") -> "NDArray[Any]":
+        # text tables usually map few distinct values
+        return convert_unique(self.convert_physical_to_internal, physical_values)
+
+    def _convert_internal_to_physical_array(self,
+                                            internal_values: "NDArray[Any]") -> "NDArray[Any]":
+        return convert_unique(self.convert_internal_to_physical, internal_values)
+
     def is_valid_physical_value(self, physical_value: AtomicOdxType) -> bool:
         if self._compu_physical_default_value is not None:
             return True
 
-        scales = []
-        if (cpti := self.compu_internal_to_phys) is not None:
-            scales = cpti.compu_scales
-
-        return any(scale.compu_const.value == physical_value
-                   for scale in scales
-                   if scale.compu_const is not None)
+        return len(self._get_scales_for_physical_value(physical_value)) > 0
 
     def is_valid_internal_value(self, internal_value: AtomicOdxType) -> bool:
         if self._compu_internal_default_value is not None:
             return True
 
-        scales = []
-        if (citp := self.compu_internal_to_phys) is not None:
-            scales = citp.compu_scales
-
-        return any(scale.applies(internal_value) for scale in scales)
+        return len(self._get_applicable_scales(internal_value)) > 0
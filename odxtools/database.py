@@ -1,14 +1,17 @@
 # SPDX-License-Identifier: MIT
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from itertools import chain
 from os import PathLike
 from pathlib import Path
-from typing import IO, Any, Union
+from typing import IO, Any, Union, cast
 from xml.etree import ElementTree
 from zipfile import ZipFile
 
 from packaging.version import Version
 
+from . import exceptions
 from .comparamspec import ComparamSpec
 from .comparamsubset import ComparamSubset
 from .diaglayercontainer import DiagLayerContainer
@@ -17,6 +20,7 @@ from .diaglayers.diaglayer import DiagLayer
 from .diaglayers.ecushareddata import EcuSharedData
 from .diaglayers.ecuvariant import EcuVariant
 from .diaglayers.functionalgroup import FunctionalGroup
+from .diaglayers.hierarchyelement import HierarchyElement
 from .diaglayers.protocol import Protocol
 from .ecuconfig import EcuConfig
 from .exceptions import odxraise, odxrequire
@@ -24,9 +28,11 @@ from .flash import Flash
 from .functiondictionary import FunctionDictionary
 from .multipleecujobspec import MultipleEcuJobSpec
 from .nameditemlist import NamedItemList
+from .odxcategory import OdxCategory
 from .odxdoccontext import OdxDocContext
 from .odxlink import DocType, OdxDocFragment, OdxLinkDatabase, OdxLinkId
 from .snrefcontext import SnRefContext
+from .utils import dataclass_fields_asdict
 from .vehicleinfospec import VehicleInfoSpec
 
 
@@ -50,15 +56,35 @@ class Database:
         self._multiple_ecu_job_specs = NamedItemList[MultipleEcuJobSpec]()
         self._function_dictionaries = NamedItemList[FunctionDictionary]()
         self._short_name = "odx_database"
-
-    def add_pdx_file(self, pdx_file: Union[str, "PathLike[Any]", IO[bytes], ZipFile]) -> None:
+        self._lazy_finalization = False
+
+    def add_pdx_file(self,
+                     pdx_file: Union[str, "PathLike[Any]", IO[bytes], ZipFile],
+                     *,
+                     parallel: bool = False,
+                     max_workers: int | None = None,
+                     incremental: bool = False) -> None:
         """Add PDX file to database.
         Either pass the path to the file, an IO with the file content or a ZipFile object.
+
+        If `parallel` is true, the ODX files contained by the PDX file
+        are parsed concurrently by a pool of at most `max_workers`
+        processes. The resulting database is the same as for
+        sequential parsing.
+
+        If `incremental` is true, the ODX files are read using
+        `iterparse()`, cf. `add_odx_file()`. Incremental parsing is
+        not available for parallel parsing.
         """
+        if parallel and incremental:
+            raise ValueError("PDX files cannot be parsed incrementally and in parallel")
+
         if isinstance(pdx_file, ZipFile):
             pdx_zip = pdx_file
         else:
             pdx_zip = ZipFile(pdx_file)
+
+        odx_members: list[str] = []
         for zip_member in pdx_zip.namelist():
             # The name of ODX files can end with .odx, .odx-d,
             # .odx-c, .odx-cs, .odx-e, .odx-f, .odx-fd, .odx-m,
@@ -66,6 +92,14 @@ class Database:
             # sure that the file's suffix starts with .odx
             p = Path(zip_member)
             if p.suffix.lower().startswith(".odx"):
+                if parallel:
+                    odx_members.append(zip_member)
+                    continue
+
+                if incremental:
+                    self._add_category(*_read_odx_category_incrementally(pdx_zip.open(zip_member)))
+                    continue
+
                 root = ElementTree.parse(pdx_zip.open(zip_member)).getroot()
                 self.add_xml_tree(root)
             elif p.name.lower() == "index.xml":
@@ -75,7 +109,38 @@ class Database:
             else:
                 self.add_auxiliary_file(zip_member, pdx_zip.open(zip_member))
 
-    def add_odx_file(self, odx_file_name: Union[str, "PathLike[Any]"]) -> None:
+        if not odx_members:
+            return
+
+        # parse the ODX files in worker processes. the category
+        # objects are added in the order of the archive members to
+        # keep the resulting database deterministic.
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                _parse_odx_document,
+                (pdx_zip.read(zip_member) for zip_member in odx_members),
+                (exceptions.strict_mode for _ in odx_members),
+            )
+            for model_version, category in results:
+                self._add_category(model_version, category)
+
+    def add_odx_file(self,
+                     odx_file_name: Union[str, "PathLike[Any]"],
+                     *,
+                     incremental: bool = False) -> None:
+        """Add an ODX file to the database
+
+        If `incremental` is true, the file is read using
+        `iterparse()` and the XML elements of each diagnostic layer
+        are discarded as soon as the layer has been internalized. The
+        peak memory required for reading the file is thus bounded by
+        the size of the largest diagnostic layer instead of the size
+        of the whole document.
+        """
+        if incremental:
+            self._add_category(*_read_odx_category_incrementally(odx_file_name))
+            return
+
         self.add_xml_tree(ElementTree.parse(odx_file_name).getroot())
 
     def add_auxiliary_file(self,
@@ -87,64 +152,46 @@ class Database:
         self.auxiliary_files[str(aux_file_name)] = aux_file_obj
 
     def add_xml_tree(self, root: ElementTree.Element) -> None:
+        model_version, category = _read_odx_category(root)
+        self._add_category(model_version, category)
+
+    def _add_category(self, model_version: Version, category: OdxCategory | None) -> None:
         # ODX spec version
-        model_version = Version(root.attrib.get("MODEL-VERSION", "2.0"))
         if self.model_version is not None and self.model_version != model_version:
             odxraise(f"Different ODX versions used for the same database (ODX {model_version} "
                      f"and ODX {self.model_version}")
 
         self.model_version = model_version
 
-        child_elements = list(root)
-        if len(child_elements) != 1:
-            odxraise("Each ODX document must contain exactly one category.")
-
-        category_et = child_elements[0]
-        category_sn = odxrequire(category_et.findtext("SHORT-NAME"))
-        category_tag = category_et.tag
-
-        if category_tag == "DIAG-LAYER-CONTAINER":
-            context = OdxDocContext(model_version,
-                                    (OdxDocFragment(category_sn, DocType.CONTAINER),))
-            self._diag_layer_containers.append(DiagLayerContainer.from_et(category_et, context))
-        elif category_tag == "COMPARAM-SUBSET":
-            context = OdxDocContext(model_version,
-                                    (OdxDocFragment(category_sn, DocType.COMPARAM_SUBSET),))
-            self._comparam_subsets.append(ComparamSubset.from_et(category_et, context))
-        elif category_tag == "COMPARAM-SPEC":
-            # In ODX 2.0 there was only COMPARAM-SPEC. In ODX 2.2 the
-            # content of COMPARAM-SPEC was moved to COMPARAM-SUBSET
-            # and COMPARAM-SPEC became a container for PROT-STACKS and
-            # a PROT-STACK references a list of COMPARAM-SUBSET
-            context = OdxDocContext(model_version,
-                                    (OdxDocFragment(category_sn, DocType.COMPARAM_SPEC),))
-            if model_version < Version("2.2"):
-                self._comparam_subsets.append(ComparamSubset.from_et(category_et, context))
-            else:
-                self._comparam_specs.append(ComparamSpec.from_et(category_et, context))
-        elif category_tag == "ECU-CONFIG":
-            context = OdxDocContext(model_version,
-                                    (OdxDocFragment(category_sn, DocType.ECU_CONFIG),))
-            self._ecu_configs.append(EcuConfig.from_et(category_et, context))
-        elif category_tag == "VEHICLE-INFO-SPEC":
-            context = OdxDocContext(model_version,
-                                    (OdxDocFragment(category_sn, DocType.VEHICLE_INFO_SPEC),))
-            self._vehicle_info_specs.append(VehicleInfoSpec.from_et(category_et, context))
-        elif category_tag == "FLASH":
-            context = OdxDocContext(model_version, (OdxDocFragment(category_sn, DocType.FLASH),))
-            self._flashs.append(Flash.from_et(category_et, context))
-        elif category_tag == "MULTIPLE-ECU-JOB-SPEC":
-            context = OdxDocContext(model_version,
-                                    (OdxDocFragment(category_sn, DocType.MULTIPLE_ECU_JOB_SPEC),))
-            self._multiple_ecu_job_specs.append(MultipleEcuJobSpec.from_et(category_et, context))
-        elif category_tag == "FUNCTION-DICTIONARY":
-            context = OdxDocContext(model_version, (OdxDocFragment(
-                category_sn, DocType.FUNCTION_DICTIONARY_SPEC),))
-            self._function_dictionaries.append(FunctionDictionary.from_et(category_et, context))
-        else:
-            odxraise(f"Encountered unknown ODX category '{category_tag}' (non-conforming dataset?)")
+        if isinstance(category, DiagLayerContainer):
+            self._diag_layer_containers.append(category)
+        elif isinstance(category, ComparamSubset):
+            self._comparam_subsets.append(category)
+        elif isinstance(category, ComparamSpec):
+            self._comparam_specs.append(category)
+        elif isinstance(category, EcuConfig):
+            self._ecu_configs.append(category)
+        elif isinstance(category, VehicleInfoSpec):
+            self._vehicle_info_specs.append(category)
+        elif isinstance(category, Flash):
+            self._flashs.append(category)
+        elif isinstance(category, MultipleEcuJobSpec):
+            self._multiple_ecu_job_specs.append(category)
+        elif isinstance(category, FunctionDictionary):
+            self._function_dictionaries.append(category)
+
+    def refresh(self, *, lazy: bool = False) -> None:
+        """Resolve all references and compute the objects which are
+        subject to value inheritance
+
+        If `lazy` is true, value inheritance and short name
+        resolution for diagnostic layers which use value inheritance
+        is deferred until the layer's objects are accessed for the
+        first time. Databases which describe many ECUs are thus
+        quicker to load if only a few of them are used.
+        """
+        self._lazy_finalization = lazy
 
-    def refresh(self) -> None:
         # Create wrapper objects
         self._diag_layers = NamedItemList(
             chain(*[dlc.diag_layers for dlc in self.diag_layer_containers]))
@@ -160,6 +207,13 @@ class Database:
         self._ecu_variants = NamedItemList(
             chain(*[dlc.ecu_variants for dlc in self.diag_layer_containers]))
 
+        # the inherited objects of the diagnostic layers are memoized
+        # during finalization. get rid of the results of any previous
+        # refresh.
+        for dl in self._diag_layers:
+            if isinstance(dl, HierarchyElement):
+                dl._reset_value_inheritance_memo()
+
         # Build odxlinks
         self._odxlinks = OdxLinkDatabase()
         self._odxlinks.update(self._build_odxlinks())
@@ -229,6 +283,45 @@ class Database:
         for function_dictionary in self.function_dictionaries:
             function_dictionary._resolve_snrefs(context)
 
+        # the memoized results of value inheritance are only needed
+        # while the layers are finalized. (if finalization is lazy,
+        # they are kept because they are required to finalize the
+        # remaining layers.)
+        if not lazy:
+            for dl in self._diag_layers:
+                if isinstance(dl, HierarchyElement):
+                    dl._reset_value_inheritance_memo()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Support for Python's pickle protocol.
+
+        Auxiliary files are usually file objects which refer to
+        members of the PDX archive and cannot be pickled. Their
+        contents are thus stored verbatim. The database itself is not
+        modified, but note that the contents of auxiliary files which
+        are not seekable can only be read once.
+        """
+        state = self.__dict__.copy()
+
+        aux_contents: OrderedDict[str, bytes] = OrderedDict()
+        for aux_file_name, aux_file_obj in self.auxiliary_files.items():
+            if aux_file_obj.seekable():
+                pos = aux_file_obj.tell()
+                aux_file_obj.seek(0)
+                aux_contents[aux_file_name] = aux_file_obj.read()
+                aux_file_obj.seek(pos)
+            else:
+                aux_contents[aux_file_name] = aux_file_obj.read()
+        state["auxiliary_files"] = aux_contents
+
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        aux_contents = state.pop("auxiliary_files")
+        self.__dict__.update(state)
+        self.auxiliary_files = OrderedDict(
+            (aux_file_name, BytesIO(data)) for aux_file_name, data in aux_contents.items())
+
     def _build_odxlinks(self) -> dict[OdxLinkId, Any]:
         result: dict[OdxLinkId, Any] = {}
 
@@ -263,6 +356,12 @@ class Database:
         """A map from odx_id to object"""
         return self._odxlinks
 
+    @property
+    def lazy_finalization(self) -> bool:
+        """Specifies whether finalization of diagnostic layers is
+        deferred until they are used"""
+        return self._lazy_finalization
+
     @property
     def short_name(self) -> str:
         return self._short_name
@@ -361,3 +460,148 @@ class Database:
             f"multiple_ecu_job_specs={repr(self.multiple_ecu_job_specs)}, " \
             f"function_dictionaries={repr(self.function_dictionaries)}, " \
             f"flashs={repr(self.flashs)})"
+
+
+def _read_odx_category(root: ElementTree.Element) -> tuple[Version, OdxCategory | None]:
+    """Internalize the ODX category object of an ODX document
+
+    Returns the ODX version used by the document and the category
+    object.
+    """
+    model_version = Version(root.attrib.get("MODEL-VERSION", "2.0"))
+
+    child_elements = list(root)
+    if len(child_elements) != 1:
+        odxraise("Each ODX document must contain exactly one category.")
+
+    category_et = child_elements[0]
+    category_sn = odxrequire(category_et.findtext("SHORT-NAME"))
+    category_tag = category_et.tag
+
+    if category_tag == "DIAG-LAYER-CONTAINER":
+        context = OdxDocContext(model_version, (OdxDocFragment(category_sn, DocType.CONTAINER),))
+        return model_version, DiagLayerContainer.from_et(category_et, context)
+    elif category_tag == "COMPARAM-SUBSET":
+        context = OdxDocContext(model_version,
+                                (OdxDocFragment(category_sn, DocType.COMPARAM_SUBSET),))
+        return model_version, ComparamSubset.from_et(category_et, context)
+    elif category_tag == "COMPARAM-SPEC":
+        # In ODX 2.0 there was only COMPARAM-SPEC. In ODX 2.2 the
+        # content of COMPARAM-SPEC was moved to COMPARAM-SUBSET
+        # and COMPARAM-SPEC became a container for PROT-STACKS and
+        # a PROT-STACK references a list of COMPARAM-SUBSET
+        context = OdxDocContext(model_version,
+                                (OdxDocFragment(category_sn, DocType.COMPARAM_SPEC),))
+        if model_version < Version("2.2"):
+            return model_version, ComparamSubset.from_et(category_et, context)
+        else:
+            return model_version, ComparamSpec.from_et(category_et, context)
+    elif category_tag == "ECU-CONFIG":
+        context = OdxDocContext(model_version, (OdxDocFragment(category_sn, DocType.ECU_CONFIG),))
+        return model_version, EcuConfig.from_et(category_et, context)
+    elif category_tag == "VEHICLE-INFO-SPEC":
+        context = OdxDocContext(model_version,
+                                (OdxDocFragment(category_sn, DocType.VEHICLE_INFO_SPEC),))
+        return model_version, VehicleInfoSpec.from_et(category_et, context)
+    elif category_tag == "FLASH":
+        context = OdxDocContext(model_version, (OdxDocFragment(category_sn, DocType.FLASH),))
+        return model_version, Flash.from_et(category_et, context)
+    elif category_tag == "MULTIPLE-ECU-JOB-SPEC":
+        context = OdxDocContext(model_version,
+                                (OdxDocFragment(category_sn, DocType.MULTIPLE_ECU_JOB_SPEC),))
+        return model_version, MultipleEcuJobSpec.from_et(category_et, context)
+    elif category_tag == "FUNCTION-DICTIONARY":
+        context = OdxDocContext(model_version,
+                                (OdxDocFragment(category_sn, DocType.FUNCTION_DICTIONARY_SPEC),))
+        return model_version, FunctionDictionary.from_et(category_et, context)
+
+    odxraise(f"Encountered unknown ODX category '{category_tag}' (non-conforming dataset?)")
+    return model_version, None
+
+
+#: The diagnostic layers which are contained by DIAG-LAYER-CONTAINER
+#: objects: XML tag of the layer -> (tag of the enclosing list,
+#: python type of the layer)
+_DIAG_LAYER_TYPES: dict[str, tuple[str, type[DiagLayer]]] = {
+    "PROTOCOL": ("PROTOCOLS", Protocol),
+    "FUNCTIONAL-GROUP": ("FUNCTIONAL-GROUPS", FunctionalGroup),
+    "ECU-SHARED-DATA": ("ECU-SHARED-DATAS", EcuSharedData),
+    "BASE-VARIANT": ("BASE-VARIANTS", BaseVariant),
+    "ECU-VARIANT": ("ECU-VARIANTS", EcuVariant),
+}
+
+
+def _read_odx_category_incrementally(source: Union[str, "PathLike[Any]", IO[bytes]]
+                                    ) -> tuple[Version, OdxCategory | None]:
+    """Internalize the ODX category object of an ODX document using
+    `iterparse()`
+
+    The diagnostic layers of diagnostic layer containers are
+    internalized as soon as their XML element is complete. Afterwards,
+    the element is removed from the document tree. Categories other
+    than diagnostic layer containers are internalized as a whole.
+    """
+    model_version = Version("2.0")
+    element_stack: list[ElementTree.Element] = []
+    diag_layers: dict[str, list[DiagLayer]] = {tag: [] for tag in _DIAG_LAYER_TYPES}
+    category: OdxCategory | None = None
+    num_categories = 0
+
+    for event, elem in ElementTree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if not element_stack:
+                model_version = Version(elem.attrib.get("MODEL-VERSION", "2.0"))
+            element_stack.append(elem)
+            continue
+
+        element_stack.pop()
+        depth = len(element_stack)
+
+        if depth == 3 and element_stack[1].tag == "DIAG-LAYER-CONTAINER" and \
+                (layer_type := _DIAG_LAYER_TYPES.get(elem.tag)) is not None and \
+                element_stack[2].tag == layer_type[0]:
+            # a diagnostic layer is complete: internalize it and get
+            # rid of its XML representation
+            dlc_sn = odxrequire(element_stack[1].findtext("SHORT-NAME"))
+            layer_sn = odxrequire(elem.findtext("SHORT-NAME"))
+            context = OdxDocContext(model_version, (OdxDocFragment(
+                dlc_sn, DocType.CONTAINER), OdxDocFragment(layer_sn, DocType.LAYER)))
+            diag_layers[elem.tag].append(layer_type[1].from_et(elem, context))
+            element_stack[2].remove(elem)
+        elif depth == 1:
+            num_categories += 1
+
+            if elem.tag == "DIAG-LAYER-CONTAINER":
+                dlc_sn = odxrequire(elem.findtext("SHORT-NAME"))
+                context = OdxDocContext(model_version, (OdxDocFragment(dlc_sn, DocType.CONTAINER),))
+                kwargs = dataclass_fields_asdict(OdxCategory.from_et(elem, context))
+                category = DiagLayerContainer(
+                    protocols=NamedItemList(cast(list[Protocol], diag_layers["PROTOCOL"])),
+                    functional_groups=NamedItemList(
+                        cast(list[FunctionalGroup], diag_layers["FUNCTIONAL-GROUP"])),
+                    ecu_shared_datas=NamedItemList(
+                        cast(list[EcuSharedData], diag_layers["ECU-SHARED-DATA"])),
+                    base_variants=NamedItemList(
+                        cast(list[BaseVariant], diag_layers["BASE-VARIANT"])),
+                    ecu_variants=NamedItemList(cast(list[EcuVariant], diag_layers["ECU-VARIANT"])),
+                    **kwargs)
+            else:
+                _, category = _read_odx_category(element_stack[0])
+
+            element_stack[0].remove(elem)
+
+    if num_categories != 1:
+        odxraise("Each ODX document must contain exactly one category.")
+
+    return model_version, category
+
+
+def _parse_odx_document(odx_data: bytes, strict_mode: bool) -> tuple[Version, OdxCategory | None]:
+    """Parse a serialized ODX document and internalize its category
+
+    This is the unit of work that is handed to the worker processes
+    by `Database.add_pdx_file(parallel=True)`.
+    """
+    exceptions.strict_mode = strict_mode
+
+    return _read_odx_category(ElementTree.fromstring(odx_data))
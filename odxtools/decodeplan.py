@@ -0,0 +1,250 @@
+# SPDX-License-Identifier: MIT
+from dataclasses import dataclass
+from typing import Any
+
+from .compumethods.compumethod import CompuMethod
+from .dataobjectproperty import DataObjectProperty
+from .encoding import Encoding
+from .odxtypes import AtomicOdxType, DataType, ParameterValueDict
+from .parameters.codedconstparameter import CodedConstParameter
+from .parameters.parameter import Parameter
+from .parameters.valueparameter import ValueParameter
+from .standardlengthtype import StandardLengthType
+
+try:
+    import bitstruct.c as bitstruct
+except ImportError:
+    import bitstruct
+
+
+@dataclass(frozen=True)
+class DecodePlanField:
+    """A parameter which is decoded by a decode plan"""
+
+    #: The short name of the parameter
+    short_name: str
+
+    #: The data type of the internal value of the parameter
+    base_data_type: DataType
+
+    #: The number of bits used by the parameter
+    bit_length: int
+
+    #: True if the bytes of the internal value must be swapped
+    #: after extraction (i.e., for byte-aligned little endian integers)
+    is_little_endian: bool
+
+    #: For CODED-CONST parameters, the value which the coded value
+    #: must exhibit
+    coded_value: AtomicOdxType | None = None
+
+    #: For VALUE parameters, the compu method that converts the
+    #: internal value into its physical representation
+    compu_method: CompuMethod | None = None
+
+
+class DecodePlan:
+    """Precompiled recipe to decode a composite codec object of fixed
+    layout
+
+    Decode plans can only be compiled for codec objects where each
+    parameter is located at a position that is known statically and
+    where the parameters are either CODED-CONST parameters or VALUE
+    parameters using simple data object properties. For such objects,
+    all internal values are extracted using a single precompiled
+    bitstruct format, and the physical values are then computed using
+    the compu methods of the parameters.
+
+    Use `compile_decode_plan()` to create decode plans.
+    """
+
+    def __init__(self, fields: list[DecodePlanField], fmt: str, order: list[int],
+                 byte_length: int) -> None:
+        self._fields = fields
+        self._format = fmt
+        self._order = order
+        self._byte_length = byte_length
+        self._compiled = bitstruct.compile(fmt)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # compiled bitstruct objects cannot be pickled
+        state = self.__dict__.copy()
+        del state["_compiled"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._compiled = bitstruct.compile(self._format)
+
+    @property
+    def byte_length(self) -> int:
+        """The minimum length of the messages which can be decoded
+        using the plan"""
+        return self._byte_length
+
+    def decode(self, message: bytes | bytearray) -> ParameterValueDict | None:
+        """Decode a message using the plan
+
+        If the plan cannot be applied to the message, `None` is
+        returned. This is the case if the message is too short, if
+        it exhibits an unexpected value for a constant parameter, or
+        if the value of a parameter cannot be converted to its
+        physical representation. Such messages need to be decoded
+        using the generic decoding machinery, which takes care of
+        reporting problems.
+        """
+        if len(message) < self._byte_length:
+            return None
+
+        raw_values = self._compiled.unpack_from(message)
+
+        result: ParameterValueDict = {}
+        for field, raw_value in zip(
+                self._fields, (raw_values[i] for i in self._order), strict=True):
+            if field.is_little_endian:
+                raw_value = int.from_bytes(raw_value, "little")
+
+            if field.base_data_type == DataType.A_INT32:
+                # two-complement
+                if raw_value >= 1 << (field.bit_length - 1):
+                    raw_value -= 1 << field.bit_length
+            elif field.base_data_type in (DataType.A_FLOAT32, DataType.A_FLOAT64):
+                raw_value = float(raw_value)
+
+            if field.compu_method is None:
+                if raw_value != field.coded_value:
+                    return None
+                result[field.short_name] = raw_value
+            elif field.compu_method.is_valid_internal_value(raw_value):
+                result[field.short_name] = field.compu_method.convert_internal_to_physical(
+                    raw_value)
+            else:
+                return None
+
+        return result
+
+
+def _get_plan_field(param: Parameter) -> DecodePlanField | None:
+    """Return the decode plan field for a parameter or `None` if the
+    parameter cannot be handled by decode plans"""
+    compu_method: CompuMethod | None = None
+    coded_value: AtomicOdxType | None = None
+    if type(param) is CodedConstParameter:
+        diag_coded_type = param.diag_coded_type
+        coded_value = param.coded_value
+    elif type(param) is ValueParameter:
+        dop = param.dop
+        if type(dop) is not DataObjectProperty:
+            return None
+        diag_coded_type = dop.diag_coded_type
+        compu_method = dop.compu_method
+    else:
+        return None
+
+    if type(diag_coded_type) is not StandardLengthType:
+        return None
+    elif diag_coded_type.bit_mask is not None or diag_coded_type.bit_length <= 0:
+        return None
+
+    base_data_type = diag_coded_type.base_data_type
+    encoding = diag_coded_type.base_type_encoding
+    bit_length = diag_coded_type.bit_length
+    if base_data_type == DataType.A_UINT32:
+        if encoding not in (None, Encoding.NONE):
+            return None
+    elif base_data_type == DataType.A_INT32:
+        if encoding not in (None, Encoding.TWOC):
+            return None
+    elif base_data_type == DataType.A_BYTEFIELD:
+        if encoding not in (None, Encoding.NONE, Encoding.BCD_P, Encoding.BCD_UP):
+            return None
+    elif base_data_type == DataType.A_FLOAT32:
+        if bit_length != 32 or encoding not in (None, Encoding.NONE):
+            return None
+    elif base_data_type == DataType.A_FLOAT64:
+        if bit_length != 64 or encoding not in (None, Encoding.NONE):
+            return None
+    else:
+        # strings are not handled by decode plans
+        return None
+
+    is_little_endian = False
+    if not diag_coded_type.is_highlow_byte_order and base_data_type != DataType.A_BYTEFIELD:
+        if base_data_type in (DataType.A_FLOAT32, DataType.A_FLOAT64):
+            return None
+
+        # little endian integers are only supported if they are
+        # byte-aligned
+        if (param.bit_position or 0) != 0 or bit_length % 8 != 0:
+            return None
+
+        is_little_endian = True
+
+    return DecodePlanField(
+        short_name=param.short_name,
+        base_data_type=base_data_type,
+        bit_length=bit_length,
+        is_little_endian=is_little_endian,
+        coded_value=coded_value,
+        compu_method=compu_method)
+
+
+def compile_decode_plan(parameters: list[Parameter]) -> DecodePlan | None:
+    """Compile a decode plan for the parameters of a composite codec
+    object
+
+    If the parameters do not exhibit a fixed layout or use features
+    that are not supported by decode plans, `None` is returned.
+    """
+    if len(parameters) == 0:
+        return None
+
+    # (bit offset, bitstruct format of the field, index of the field)
+    placements: list[tuple[int, str, int]] = []
+    fields: list[DecodePlanField] = []
+    cursor = 0
+    byte_length = 0
+    for param in parameters:
+        field = _get_plan_field(param)
+        if field is None:
+            return None
+
+        if param.byte_position is not None:
+            cursor = param.byte_position
+        bit_position = param.bit_position or 0
+
+        # this mirrors the position computations of
+        # `DecodeState.extract_atomic_value()`
+        field_byte_length = (field.bit_length + bit_position + 7) // 8
+        padding = (8 - (field.bit_length + bit_position) % 8) % 8
+        if field.is_little_endian or field.base_data_type == DataType.A_BYTEFIELD:
+            letter = "r"
+        else:
+            letter = field.base_data_type.bitstruct_format_letter
+        placements.append((cursor * 8 + padding, f"{letter}{field.bit_length}", len(fields)))
+        fields.append(field)
+
+        cursor += field_byte_length
+        byte_length = max(byte_length, cursor)
+
+    # the fields of a bitstruct format must be ordered and must not
+    # overlap
+    placements.sort()
+    fmt = ""
+    order = [0] * len(fields)
+    bit_cursor = 0
+    for format_idx, (bit_offset, field_format, field_idx) in enumerate(placements):
+        if bit_offset < bit_cursor:
+            return None
+        elif bit_offset > bit_cursor:
+            fmt += f"p{bit_offset - bit_cursor}"
+
+        fmt += field_format
+        order[field_idx] = format_idx
+        bit_cursor = bit_offset + fields[field_idx].bit_length
+
+    try:
+        return DecodePlan(fields, fmt, order, byte_length)
+    except Exception:
+        # the format is not supported by bitstruct
+        return None
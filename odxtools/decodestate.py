@@ -1,16 +1,12 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from .bitstructcache import get_compiled_format
 from .encoding import Encoding, get_string_encoding
 from .exceptions import DecodeError, odxassert, odxraise, strict_mode
 from .odxtypes import AtomicOdxType, DataType, ParameterValue
 
-try:
-    import bitstruct.c as bitstruct
-except ImportError:
-    import bitstruct
-
 if TYPE_CHECKING:
     from .parameters.parameter import Parameter
     from .tablerow import TableRow
@@ -77,28 +73,42 @@ class DecodeState:
             bit_length = 64
 
         byte_length = (bit_length + self.cursor_bit_position + 7) // 8
-        if self.cursor_byte_position + byte_length > len(self.coded_message):
+        start_pos = self.cursor_byte_position
+        end_pos = start_pos + byte_length
+        if end_pos > len(self.coded_message):
             raise DecodeError(f"Expected a longer message.")
-        extracted_bytes = self.coded_message[self.cursor_byte_position:self.cursor_byte_position +
-                                             byte_length]
 
         # Apply byteorder for numerical objects. Note that doing this
         # here might lead to garbage data being included in the result
         # if the data to be extracted is not byte aligned and crosses
         # byte boundaries, but it is what the specification says.
-        if not is_highlow_byte_order and base_data_type in [
-                DataType.A_INT32,
-                DataType.A_UINT32,
-                DataType.A_FLOAT32,
-                DataType.A_FLOAT64,
-        ]:
-            extracted_bytes = extracted_bytes[::-1]
-
-        padding = (8 - (bit_length + self.cursor_bit_position) % 8) % 8
-        raw_value, = bitstruct.unpack_from(
-            f"{base_data_type.bitstruct_format_letter}{bit_length}",
-            extracted_bytes,
-            offset=padding)
+        is_reversed = not is_highlow_byte_order and base_data_type in [
+            DataType.A_INT32,
+            DataType.A_UINT32,
+            DataType.A_FLOAT32,
+            DataType.A_FLOAT64,
+        ]
+
+        raw_value: Any
+        if self.cursor_bit_position == 0 and bit_length % 8 == 0 and \
+                base_data_type not in (DataType.A_FLOAT32, DataType.A_FLOAT64):
+            # byte-aligned integers and blobs can be extracted without
+            # copying the message
+            extracted_bytes = memoryview(self.coded_message)[start_pos:end_pos]
+            if base_data_type in (DataType.A_INT32, DataType.A_UINT32):
+                raw_value = int.from_bytes(extracted_bytes, "little" if is_reversed else "big")
+            else:
+                raw_value = bytes(extracted_bytes)
+        else:
+            padding = (8 - (bit_length + self.cursor_bit_position) % 8) % 8
+            compiled_format = get_compiled_format(base_data_type.bitstruct_format_letter,
+                                                  bit_length)
+            if is_reversed:
+                raw_value, = compiled_format.unpack_from(
+                    self.coded_message[start_pos:end_pos][::-1], padding)
+            else:
+                raw_value, = compiled_format.unpack_from(self.coded_message,
+                                                         8 * start_pos + padding)
         internal_value: AtomicOdxType
 
         # Deal with raw byte fields, ...
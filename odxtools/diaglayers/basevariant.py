@@ -118,7 +118,8 @@ class BaseVariant(HierarchyElement):
         def not_inherited_fn(parent_ref: ParentRef) -> list[str]:
             return parent_ref.not_inherited_variables
 
-        return self._compute_available_objects(get_local_objects_fn, not_inherited_fn)
+        return self._compute_available_objects(
+            get_local_objects_fn, not_inherited_fn, object_kind="diag_variables")
 
     def _compute_available_variable_groups(self,
                                            odxlinks: OdxLinkDatabase) -> Iterable[VariableGroup]:
@@ -132,4 +133,5 @@ class BaseVariant(HierarchyElement):
         def not_inherited_fn(parent_ref: ParentRef) -> list[str]:
             return []
 
-        return self._compute_available_objects(get_local_objects_fn, not_inherited_fn)
+        return self._compute_available_objects(
+            get_local_objects_fn, not_inherited_fn, object_kind="variable_groups")
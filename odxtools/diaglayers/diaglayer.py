@@ -1,12 +1,16 @@
 # SPDX-License-Identifier: MIT
-from collections.abc import Callable, Iterable
+import os
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
 from copy import copy, deepcopy
 from dataclasses import dataclass
 from functools import cached_property
-from itertools import chain
-from typing import Any, Union, cast
+from itertools import chain, islice
+from typing import Any, cast
 from xml.etree import ElementTree
 
+from .. import exceptions
 from ..additionalaudience import AdditionalAudience
 from ..admindata import AdminData
 from ..companydata import CompanyData
@@ -14,7 +18,7 @@ from ..description import Description
 from ..diagcomm import DiagComm
 from ..diagdatadictionaryspec import DiagDataDictionarySpec
 from ..diagservice import DiagService
-from ..exceptions import DecodeError, odxassert, odxraise
+from ..exceptions import DecodeError, odxrequire
 from ..functionalclass import FunctionalClass
 from ..library import Library
 from ..message import Message
@@ -25,6 +29,7 @@ from ..parentref import ParentRef
 from ..request import Request
 from ..response import Response
 from ..servicebinner import ServiceBinner
+from ..servicedispatcher import MessageRef, PrefixTree, ServiceDispatcher
 from ..singleecujob import SingleEcuJob
 from ..snrefcontext import SnRefContext
 from ..specialdatagroup import SpecialDataGroup
@@ -34,8 +39,6 @@ from ..unitgroup import UnitGroup
 from .diaglayerraw import DiagLayerRaw
 from .diaglayertype import DiagLayerType
 
-PrefixTree = dict[int, Union[list[DiagService], "PrefixTree"]]
-
 
 @dataclass(kw_only=True)
 class DiagLayer:
@@ -154,6 +157,8 @@ class DiagLayer:
         self,
         get_local_objects: Callable[["DiagLayer"], Iterable[TNamed]],
         get_not_inherited: Callable[[ParentRef], Iterable[str]],
+        *,
+        object_kind: str | None = None,
     ) -> Iterable[TNamed]:
         """Helper method to compute the set of all objects applicable
         to the DiagLayer if these objects are subject to the value
@@ -161,7 +166,8 @@ class DiagLayer:
 
         This is the simplified version for diag layers which do not
         have parents and thus do not deal with value inheritance
-        (i.e., ECU-SHARED-DATA).
+        (i.e., ECU-SHARED-DATA). Since this is cheap, the result is
+        not memoized.
 
         """
         return get_local_objects(self)
@@ -331,6 +337,8 @@ class DiagLayer:
         (b) one SID is the prefix of another SID like for service 3
             and 4 (thus the constant `-1` key).
 
+        The prefix tree is compiled into the `ServiceDispatcher`
+        which is used to decode messages.
         """
         prefix_tree: PrefixTree = {}
         for s in self.services:
@@ -376,74 +384,139 @@ class DiagLayer:
         else:
             cast(list[DiagService], sub_tree[-1]).append(service)
 
+    @cached_property
+    def _service_dispatcher(self) -> ServiceDispatcher:
+        """The compiled lookup table which is used to find the
+        services for coded messages.
+        """
+        gnrs = getattr(self, "global_negative_responses", [])
+        return ServiceDispatcher(self.services, gnrs, self._prefix_tree)
+
     def _find_services_for_uds(self, message: bytes | bytearray) -> list[DiagService]:
-        prefix_tree = self._prefix_tree
-
-        # Find matching service(s) in prefix tree
-        possible_services: list[DiagService] = []
-        for b in message:
-            if b in prefix_tree:
-                odxassert(isinstance(prefix_tree[b], dict))
-                prefix_tree = cast(PrefixTree, prefix_tree[b])
-            else:
-                break
-            if -1 in prefix_tree:
-                possible_services += cast(list[DiagService], prefix_tree[-1])
-        return possible_services
-
-    def _decode(self, message: bytes | bytearray,
-                candidate_services: Iterable[DiagService]) -> list[Message]:
-        decoded_messages: list[Message] = []
-
-        for service in candidate_services:
-            try:
-                decoded_messages.append(service.decode_message(message))
-            except DecodeError as e:
-                # check if the message can be decoded as a global
-                # negative response for the service
-                gnr_found = False
-                for gnr in self.global_negative_responses:
-                    try:
-                        decoded_gnr = gnr.decode(message)
-                        gnr_found = True
-                        if not isinstance(decoded_gnr, dict):
-                            odxraise(
-                                f"Expected the decoded value of a global "
-                                f"negative response to be a dictionary, "
-                                f"got {type(decoded_gnr)} for {self.short_name}", DecodeError)
-
-                        decoded_messages.append(
-                            Message(
-                                coded_message=bytes(message),
-                                service=service,
-                                coding_object=gnr,
-                                param_dict=decoded_gnr))
-                    except DecodeError:
-                        pass
-
-                if not gnr_found:
-                    raise e
-
-        if len(decoded_messages) == 0:
-            raise DecodeError(
-                f"None of the services {[x.short_name for x in candidate_services]} could parse {message.hex()}."
-            )
-
-        return decoded_messages
+        return self._service_dispatcher.find_services(message)
 
     def decode(self, message: bytes | bytearray) -> list[Message]:
-        candidate_services = self._find_services_for_uds(message)
-
-        return self._decode(message, candidate_services)
+        return self._service_dispatcher.decode(message)
 
     def decode_response(self, response: bytes | bytearray,
                         request: bytes | bytearray) -> list[Message]:
-        candidate_services = self._find_services_for_uds(request)
-        if candidate_services is None:
-            raise DecodeError(f"Couldn't find corresponding service for request {request.hex()}.")
+        return self._service_dispatcher.decode(response, request=request)
+
+    def decode_many(self,
+                    messages: Iterable[bytes | bytearray],
+                    *,
+                    parallel: bool = False,
+                    max_workers: int | None = None,
+                    chunksize: int = 256) -> Generator[list[Message] | DecodeError, None, None]:
+        """Decode a sequence of messages
+
+        For each message, either the list of messages returned by
+        `decode()` or the `DecodeError` which was encountered is
+        produced, i.e., messages which cannot be decoded do not stop
+        the processing of the remaining ones.
+
+        If `parallel` is true, the messages are decoded by a pool of
+        at most `max_workers` processes, which receive the messages
+        in chunks of `chunksize` items. Only a few chunks per worker
+        are submitted in advance, so `messages` may be arbitrarily
+        large. Since the diagnostic layer needs to be transferred to
+        each of these processes, this only pays off for large batches.
+        """
+        items = ((bytes(message), None) for message in messages)
+        return self._decode_many(
+            items, parallel=parallel, max_workers=max_workers, chunksize=chunksize)
+
+    def decode_response_many(self,
+                             messages: Iterable[tuple[bytes | bytearray, bytes | bytearray]],
+                             *,
+                             parallel: bool = False,
+                             max_workers: int | None = None,
+                             chunksize: int = 256
+                            ) -> Generator[list[Message] | DecodeError, None, None]:
+        """Decode a sequence of (response, request) pairs
+
+        This is the batch version of `decode_response()`. Its
+        results and parameters are analogous to the ones of
+        `decode_many()`.
+        """
+        items = ((bytes(response), bytes(request)) for response, request in messages)
+        return self._decode_many(
+            items, parallel=parallel, max_workers=max_workers, chunksize=chunksize)
+
+    def _decode_many(self, items: Iterable[tuple[bytes, bytes | None]], *, parallel: bool,
+                     max_workers: int | None,
+                     chunksize: int) -> Generator[list[Message] | DecodeError, None, None]:
+        dispatcher = self._service_dispatcher
+
+        if not parallel:
+            for message, request in items:
+                try:
+                    yield dispatcher.decode(message, request=request)
+                except DecodeError as e:
+                    yield e
+            return
 
-        return self._decode(response, candidate_services)
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_decode_worker,
+            initargs=(self, exceptions.strict_mode))
+        # the items are submitted to the worker processes in chunks,
+        # but only a limited number of chunks is in flight at any
+        # time. This bounds the memory required for large inputs.
+        max_pending_chunks = 2 * (max_workers or os.cpu_count() or 1)
+        pending_chunks: deque[tuple[list[tuple[bytes, bytes | None]],
+                                    Future[list[list[MessageRef] | DecodeError]]]] = deque()
+        item_iter = iter(items)
+        try:
+            while True:
+                while len(pending_chunks) < max_pending_chunks:
+                    chunk = list(islice(item_iter, chunksize))
+                    if not chunk:
+                        break
+                    pending_chunks.append((chunk, executor.submit(_decode_chunk_in_worker, chunk)))
+
+                if not pending_chunks:
+                    break
+
+                chunk, future = pending_chunks.popleft()
+                for (message, _), result in zip(chunk, future.result(), strict=True):
+                    if isinstance(result, DecodeError):
+                        yield result
+                    else:
+                        yield [dispatcher._restore_message(message, x) for x in result]
+        finally:
+            # if the caller stops consuming the results, do not wait
+            # for the chunks which have not been started yet
+            executor.shutdown(wait=True, cancel_futures=True)
 
     #####
     # </PDU decoding>
     #####
+
+
+# the diagnostic layer used by the worker processes of
+# `DiagLayer.decode_many(parallel=True)`
+_worker_diag_layer: DiagLayer | None = None
+
+
+def _init_decode_worker(diag_layer: DiagLayer, strict_mode: bool) -> None:
+    global _worker_diag_layer
+
+    exceptions.strict_mode = strict_mode
+    _worker_diag_layer = diag_layer
+
+
+def _decode_in_worker(item: tuple[bytes, bytes | None]) -> list[MessageRef] | DecodeError:
+    dispatcher = odxrequire(_worker_diag_layer)._service_dispatcher
+    message, request = item
+    try:
+        decoded_messages = dispatcher.decode(message, request=request)
+    except DecodeError as e:
+        return e
+
+    return [dispatcher._message_ref(x) for x in decoded_messages]
+
+
+def _decode_chunk_in_worker(items: list[tuple[bytes, bytes | None]]
+                           ) -> list[list[MessageRef] | DecodeError]:
+    return [_decode_in_worker(item) for item in items]
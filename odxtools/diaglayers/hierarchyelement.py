@@ -90,12 +90,84 @@ class HierarchyElement(DiagLayer):
 
         return new_he
 
+    def __getstate__(self) -> dict[str, Any]:
+        """Support for Python's pickle protocol.
+
+        The memoized results of value inheritance are not pickled
+        because they can be recomputed if required.
+        """
+        state = self.__dict__.copy()
+        state.pop("_value_inheritance_memo", None)
+
+        return state
+
     def _finalize_init(self, database: "Database", odxlinks: OdxLinkDatabase) -> None:
         """This method deals with everything inheritance related and
         -- after the final set of objects covered by the diagnostic
         layer is determined -- resolves any short name references in
         the diagnostic layer.
 
+        If the database uses lazy finalization, this is deferred until
+        any of the attributes which are subject to value inheritance
+        is accessed for the first time.
+        """
+        if database.lazy_finalization:
+            self._pending_finalization = (database, odxlinks)
+
+            # the DDDS set by __post_init__() only covers the locally
+            # defined objects. get rid of it, so that accessing it
+            # triggers the finalization.
+            self.__dict__.pop("_diag_data_dictionary_spec", None)
+            return
+
+        self._finalize_layer(database, odxlinks)
+
+    if not TYPE_CHECKING:
+        # (this is hidden from type checkers because a __getattr__()
+        # method makes them accept arbitrary attribute names.)
+
+        def __getattr__(self, name: str) -> Any:
+            # this is only called if regular attribute lookup fails. For
+            # layers with pending finalization, this happens when
+            # attributes that are computed by `_finalize_layer()` are
+            # accessed.
+            if "_pending_finalization" not in self.__dict__:
+                raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+            self._ensure_finalized()
+
+            return getattr(self, name)
+
+    def _ensure_finalized(self) -> None:
+        """Finalize the layer if this has been deferred"""
+        pending = self.__dict__.pop("_pending_finalization", None)
+        if pending is None:
+            return
+
+        database, odxlinks = pending
+
+        # (the marker is removed while the layer is finalized to
+        # avoid infinite recursion if attributes which have not been
+        # computed yet are accessed, but it is restored if
+        # finalization fails, so that it is retried on the next
+        # access instead of silently using a half-finalized layer.)
+        try:
+            # the short name references of inherited objects are
+            # resolved by the layer which defines them, so the parent
+            # layers must be finalized first.
+            for parent_ref in getattr(self.diag_layer_raw, "parent_refs", []):
+                if isinstance(parent_ref.layer, HierarchyElement):
+                    parent_ref.layer._ensure_finalized()
+
+            self._finalize_layer(database, odxlinks)
+        except BaseException:
+            self._pending_finalization = pending
+            raise
+
+    def _finalize_layer(self, database: "Database", odxlinks: OdxLinkDatabase) -> None:
+        """Compute the inherited objects and resolve all short name
+        references of the layer.
+
         TODO: In some corner cases, the short name resolution is not
         correct: E.g. Given three layers A, B, and C, where B and C
         derive from A and A defines the diagnostic communication
@@ -110,6 +182,10 @@ class HierarchyElement(DiagLayer):
         # fill in all applicable objects that use value inheritance
         #####
 
+        # the objects defined by the layer itself might have been
+        # modified since they were memoized
+        self._reset_value_inheritance_memo()
+
         self._compute_value_inheritance(odxlinks)
 
         ############
@@ -152,41 +228,58 @@ class HierarchyElement(DiagLayer):
         dops = self._compute_available_ddd_spec_items(
             lambda ddd_spec: ddd_spec.data_object_props,
             lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="data_object_props",
         )
         structures = self._compute_available_ddd_spec_items(
             lambda ddd_spec: ddd_spec.structures,
             lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="structures",
         )
         dtc_dops = self._compute_available_ddd_spec_items(
             lambda ddd_spec: ddd_spec.dtc_dops,
             lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="dtc_dops",
         )
         static_fields = self._compute_available_ddd_spec_items(
             lambda ddd_spec: ddd_spec.static_fields,
             lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="static_fields",
         )
         end_of_pdu_fields = self._compute_available_ddd_spec_items(
             lambda ddd_spec: ddd_spec.end_of_pdu_fields,
             lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="end_of_pdu_fields",
         )
         dynamic_endmarker_fields = self._compute_available_ddd_spec_items(
             lambda ddd_spec: ddd_spec.dynamic_endmarker_fields,
             lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="dynamic_endmarker_fields",
         )
         dynamic_length_fields = self._compute_available_ddd_spec_items(
             lambda ddd_spec: ddd_spec.dynamic_length_fields,
             lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="dynamic_length_fields",
         )
         env_data_descs = self._compute_available_ddd_spec_items(
             lambda ddd_spec: ddd_spec.env_data_descs,
             lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="env_data_descs",
         )
         env_datas = self._compute_available_ddd_spec_items(
-            lambda ddd_spec: ddd_spec.env_datas, lambda parent_ref: parent_ref.not_inherited_dops)
+            lambda ddd_spec: ddd_spec.env_datas,
+            lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="env_datas",
+        )
         muxs = self._compute_available_ddd_spec_items(
-            lambda ddd_spec: ddd_spec.muxs, lambda parent_ref: parent_ref.not_inherited_dops)
+            lambda ddd_spec: ddd_spec.muxs,
+            lambda parent_ref: parent_ref.not_inherited_dops,
+            object_kind="muxs",
+        )
         tables = self._compute_available_ddd_spec_items(
-            lambda ddd_spec: ddd_spec.tables, lambda parent_ref: parent_ref.not_inherited_tables)
+            lambda ddd_spec: ddd_spec.tables,
+            lambda parent_ref: parent_ref.not_inherited_tables,
+            object_kind="tables",
+        )
 
         ddds_admin_data: AdminData | None = None
         ddds_sdgs: list[SpecialDataGroup] = []
@@ -260,6 +353,10 @@ class HierarchyElement(DiagLayer):
         state_charts = self._compute_available_state_charts()
         self._state_charts = NamedItemList(state_charts)
 
+    def _reset_value_inheritance_memo(self) -> None:
+        """Discard the memoized results of `_compute_available_objects()`"""
+        self.__dict__.pop("_value_inheritance_memo", None)
+
     def _get_parent_refs_sorted_by_priority(self, reverse: bool = False) -> Iterable[ParentRef]:
         return sorted(
             getattr(self.diag_layer_raw, "parent_refs", []),
@@ -270,6 +367,8 @@ class HierarchyElement(DiagLayer):
         self,
         get_local_objects: Callable[["DiagLayer"], Iterable[TNamed]],
         get_not_inherited: Callable[[ParentRef], Iterable[str]],
+        *,
+        object_kind: str | None = None,
     ) -> Iterable[TNamed]:
         """Helper method to compute the set of all objects applicable
         to the DiagLayer if these objects are subject to the value
@@ -287,8 +386,19 @@ class HierarchyElement(DiagLayer):
         set of short names of the objects which shall not be inherited
         from the parents.
 
+        :param object_kind: Name of the kind of objects which are
+        computed. If specified, the result is memoized, so that the
+        objects available to a given layer are only computed once
+        even if the layer is the parent of many others. The memo is
+        discarded by `Database.refresh()` once all layers have been
+        finalized and it is never pickled.
+
         """
 
+        memo: dict[str, list[Any]] = self.__dict__.setdefault("_value_inheritance_memo", {})
+        if object_kind is not None and (memoized := memo.get(object_kind)) is not None:
+            return cast(list[TNamed], memoized)
+
         local_objects = get_local_objects(self)
         local_object_short_names = {x.short_name for x in local_objects}
         result_dict: dict[str, tuple[TNamed, DiagLayer]] = {}
@@ -304,8 +414,8 @@ class HierarchyElement(DiagLayer):
             # compute the list of objects which we are supposed to
             # inherit from this diagnostic layer
             inherited_objects = [
-                x
-                for x in parent_dl._compute_available_objects(get_local_objects, get_not_inherited)
+                x for x in parent_dl._compute_available_objects(
+                    get_local_objects, get_not_inherited, object_kind=object_kind)
                 if x.short_name not in not_inherited_short_names
             ]
 
@@ -354,7 +464,11 @@ class HierarchyElement(DiagLayer):
         for obj in local_objects:
             result_dict[obj.short_name] = (obj, self)
 
-        return [x[0] for x in result_dict.values()]
+        result = [x[0] for x in result_dict.values()]
+        if object_kind is not None:
+            memo[object_kind] = result
+
+        return result
 
     def _compute_available_diag_comms(self, odxlinks: OdxLinkDatabase) -> Iterable[DiagComm]:
 
@@ -364,7 +478,8 @@ class HierarchyElement(DiagLayer):
         def not_inherited_fn(parent_ref: ParentRef) -> list[str]:
             return parent_ref.not_inherited_diag_comms
 
-        return self._compute_available_objects(get_local_objects_fn, not_inherited_fn)
+        return self._compute_available_objects(
+            get_local_objects_fn, not_inherited_fn, object_kind="diag_comms")
 
     def _compute_available_global_neg_responses(self, odxlinks: OdxLinkDatabase) \
             -> Iterable[Response]:
@@ -375,12 +490,15 @@ class HierarchyElement(DiagLayer):
         def not_inherited_fn(parent_ref: ParentRef) -> list[str]:
             return parent_ref.not_inherited_global_neg_responses
 
-        return self._compute_available_objects(get_local_objects_fn, not_inherited_fn)
+        return self._compute_available_objects(
+            get_local_objects_fn, not_inherited_fn, object_kind="global_negative_responses")
 
     def _compute_available_ddd_spec_items(
         self,
         include: Callable[[DiagDataDictionarySpec], Iterable[TNamed]],
         exclude: Callable[["ParentRef"], list[str]],
+        *,
+        object_kind: str | None = None,
     ) -> NamedItemList[TNamed]:
 
         def get_local_objects_fn(dl: DiagLayer) -> Iterable[TNamed]:
@@ -388,7 +506,8 @@ class HierarchyElement(DiagLayer):
                 return []
             return include(dl.diag_layer_raw.diag_data_dictionary_spec)
 
-        found = self._compute_available_objects(get_local_objects_fn, exclude)
+        found = self._compute_available_objects(
+            get_local_objects_fn, exclude, object_kind=object_kind)
         return NamedItemList(found)
 
     def _compute_available_functional_classes(self) -> Iterable[FunctionalClass]:
@@ -399,7 +518,8 @@ class HierarchyElement(DiagLayer):
         def not_inherited_fn(parent_ref: ParentRef) -> list[str]:
             return []
 
-        return self._compute_available_objects(get_local_objects_fn, not_inherited_fn)
+        return self._compute_available_objects(
+            get_local_objects_fn, not_inherited_fn, object_kind="functional_classes")
 
     def _compute_available_additional_audiences(self) -> Iterable[AdditionalAudience]:
 
@@ -409,7 +529,8 @@ class HierarchyElement(DiagLayer):
         def not_inherited_fn(parent_ref: ParentRef) -> list[str]:
             return []
 
-        return self._compute_available_objects(get_local_objects_fn, not_inherited_fn)
+        return self._compute_available_objects(
+            get_local_objects_fn, not_inherited_fn, object_kind="additional_audiences")
 
     def _compute_available_state_charts(self) -> Iterable[StateChart]:
 
@@ -419,7 +540,8 @@ class HierarchyElement(DiagLayer):
         def not_inherited_fn(parent_ref: ParentRef) -> list[str]:
             return []
 
-        return self._compute_available_objects(get_local_objects_fn, not_inherited_fn)
+        return self._compute_available_objects(
+            get_local_objects_fn, not_inherited_fn, object_kind="state_charts")
 
     def _compute_available_unit_groups(self) -> Iterable[UnitGroup]:
 
@@ -429,7 +551,8 @@ class HierarchyElement(DiagLayer):
         def not_inherited_fn(parent_ref: ParentRef) -> list[str]:
             return []
 
-        return self._compute_available_objects(get_local_objects_fn, not_inherited_fn)
+        return self._compute_available_objects(
+            get_local_objects_fn, not_inherited_fn, object_kind="unit_groups")
 
     #####
     # </value inheritance mechanism helpers>
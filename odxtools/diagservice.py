@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: MIT
+from collections.abc import Hashable, Iterable
 from dataclasses import dataclass, field
 from typing import Any, cast
 from xml.etree import ElementTree
 
+from . import encodestate, exceptions
 from .addressing import Addressing
 from .comparaminstance import ComparamInstance
 from .diagcomm import DiagComm
@@ -15,6 +17,7 @@ from .odxtypes import ParameterValue, odxstr_to_bool
 from .parameters.parameter import Parameter
 from .posresponsesuppressible import PosResponseSuppressible
 from .request import Request
+from .requesttemplate import REQUEST_CACHE_SIZE, RequestTemplate, freeze_parameter_values
 from .response import Response
 from .snrefcontext import SnRefContext
 from .transmode import TransMode
@@ -155,6 +158,8 @@ class DiagService(DiagComm):
         self._negative_responses = NamedItemList[Response](
             [odxlinks.resolve(x, Response) for x in self.neg_response_refs])
 
+        self._encoded_requests: dict[Hashable, bytes] = {}
+
     def _resolve_snrefs(self, context: SnRefContext) -> None:
         context.diag_service = self
 
@@ -168,6 +173,9 @@ class DiagService(DiagComm):
         # reference resolution
         self._comparams = NamedItemList(self.comparam_refs)
 
+        # previously encoded requests may be outdated
+        self._encoded_requests = {}
+
         context.diag_service = None
 
     def print_free_parameters_info(self) -> None:
@@ -194,6 +202,15 @@ class DiagService(DiagComm):
             if len(raw_message) >= len(prefix) and prefix == raw_message[:len(prefix)]:
                 coding_objects.append(candidate_coding_object)
 
+        return self._decode_message_using(raw_message, coding_objects)
+
+    def _decode_message_using(self, raw_message: bytes | bytearray,
+                              coding_objects: Iterable[Request | Response]) -> Message:
+        """Decode a message using a list of pre-selected coding objects
+
+        Exactly one of the specified coding objects must be able to
+        decode the message.
+        """
         result_list: list[Message] = []
         for coding_object in coding_objects:
             try:
@@ -224,7 +241,27 @@ class DiagService(DiagComm):
     def encode_request(self, **kwargs: ParameterValue) -> bytearray:
         """Prepare an array of bytes ready to be send over the wire
         for the request of this service.
+
+        The most recently used requests are cached, i.e., encoding
+        the same parameter values again is cheap. Caching is only done
+        in strict mode, i.e., if invalid values cannot result in a
+        (bogus) encoded request.
         """
+        cache_key: Hashable | None = None
+        if exceptions.strict_mode:
+            frozen_values = freeze_parameter_values(kwargs)
+            if frozen_values is not None:
+                # whether overlapping parameters are reported depends
+                # on the trusted mode
+                cache_key = (encodestate.trusted_mode, frozen_values)
+        if cache_key is not None:
+            cached = self._encoded_requests.pop(cache_key, None)
+            if cached is not None:
+                # move the entry to the end of the cache, i.e., make
+                # it the most recently used one
+                self._encoded_requests[cache_key] = cached
+                return bytearray(cached)
+
         # make sure that all parameters which are required for
         # encoding are specified (parameters which have a default are
         # optional)
@@ -242,7 +279,28 @@ class DiagService(DiagComm):
             set(kwargs.keys()).issubset(rq_all_param_names),
             f"Unknown parameters specified for encoding: {kwargs.keys()}, "
             f"known parameters are: {rq_all_param_names}")
-        return self.request.encode(**kwargs)
+        result = self.request.encode(**kwargs)
+
+        if cache_key is not None:
+            if len(self._encoded_requests) >= REQUEST_CACHE_SIZE:
+                # evict the least recently used entry
+                del self._encoded_requests[next(iter(self._encoded_requests))]
+            self._encoded_requests[cache_key] = bytes(result)
+
+        return result
+
+    def request_template(self, *variable_params: str,
+                         **constant_values: ParameterValue) -> RequestTemplate:
+        """Pre-encode the request of this service for a given set of
+        values of its constant parameters
+
+        The parameters listed by `variable_params` are specified
+        whenever the template is used to encode a request. This is
+        only possible for requests which exhibit a fixed layout.
+        """
+        return RequestTemplate(
+            odxrequire(self.request, f"Service {self.short_name} does not specify a request"),
+            variable_params, constant_values)
 
     def encode_positive_response(self,
                                  coded_request: bytes | bytearray,
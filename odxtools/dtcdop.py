@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Any, cast
 from xml.etree import ElementTree
 
@@ -105,7 +106,7 @@ class DtcDop(DopBase):
 
         assert isinstance(trouble_code, int)
 
-        dtcs = [x for x in self.dtcs if x.trouble_code == trouble_code]
+        dtcs = self._dtcs_by_trouble_code.get(trouble_code, [])
 
         odxassert(len(dtcs) < 2, f"Multiple matching DTCs for trouble code 0x{trouble_code:06x}")
 
@@ -141,7 +142,7 @@ class DtcDop(DopBase):
             return dtc_value
         elif isinstance(dtc_value, str):
             # assume that physical value is the short_name
-            dtcs = [dtc for dtc in self.dtcs if dtc.short_name == dtc_value]
+            dtcs = self._dtcs_by_short_name.get(dtc_value, [])
             if len(dtcs) != 1:
                 odxraise(f"No DTC named {dtc_value} found for DTC-DOP "
                          f"{self.short_name}.", EncodeError)
@@ -169,19 +170,39 @@ class DtcDop(DopBase):
         if not isinstance(internal_trouble_code, int):
             odxraise()
 
-        found = False
-        for dtc in self.dtcs:
-            if internal_trouble_code == dtc.trouble_code:
-                found = True
-                break
-
-        if not found:
+        if internal_trouble_code not in self._dtcs_by_trouble_code:
             odxraise(
                 f"Unknown diagnostic trouble code {physical_value!r} "
                 f"(0x{internal_trouble_code: 06x}) specified", EncodeError)
 
         self.diag_coded_type.encode_into_pdu(internal_trouble_code, encode_state)
 
+    @cached_property
+    def _dtcs_by_trouble_code(self) -> dict[int, list[DiagnosticTroubleCode]]:
+        """The DTCs of the DOP indexed by their trouble code
+
+        The index is discarded whenever the list of DTCs is
+        recomputed.
+        """
+        result: dict[int, list[DiagnosticTroubleCode]] = {}
+        for dtc in self._dtcs:
+            result.setdefault(dtc.trouble_code, []).append(dtc)
+
+        return result
+
+    @cached_property
+    def _dtcs_by_short_name(self) -> dict[str, list[DiagnosticTroubleCode]]:
+        """The DTCs of the DOP indexed by their short name
+
+        The index is discarded whenever the list of DTCs is
+        recomputed.
+        """
+        result: dict[str, list[DiagnosticTroubleCode]] = {}
+        for dtc in self._dtcs:
+            result.setdefault(dtc.short_name, []).append(dtc)
+
+        return result
+
     def _build_odxlinks(self) -> dict[OdxLinkId, Any]:
         odxlinks = super()._build_odxlinks()
 
@@ -213,6 +234,9 @@ class DtcDop(DopBase):
         for linked_dtc_dop in self.linked_dtc_dops_raw:
             linked_dtc_dop._resolve_odxlinks(odxlinks)
 
+        self.__dict__.pop("_dtcs_by_trouble_code", None)
+        self.__dict__.pop("_dtcs_by_short_name", None)
+
     def _resolve_snrefs(self, context: SnRefContext) -> None:
         # hack to avoid initializing the DtcDop object multiple
         # times. This is required, because the linked DTC DOP feature
@@ -255,6 +279,11 @@ class DtcDop(DopBase):
                 self._dtcs.append(dtc)
                 dtc_short_names.add(dtc.short_name)
 
+        # the DTCs inherited via the linked DTC DOPs need to be
+        # indexed as well
+        self.__dict__.pop("_dtcs_by_trouble_code", None)
+        self.__dict__.pop("_dtcs_by_short_name", None)
+
         # at this place, the linked DTC DOPs exhibit .short_name, so
         # we can create a NamedItemList...
         self._linked_dtc_dops = NamedItemList(self.linked_dtc_dops_raw)
@@ -3,18 +3,21 @@ import warnings
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from .bitstructcache import get_compiled_format
 from .encoding import Encoding, get_string_encoding
 from .exceptions import EncodeError, OdxWarning, odxassert, odxraise
 from .odxtypes import AtomicOdxType, BytesTypes, DataType, ParameterValue
 
-try:
-    import bitstruct.c as bitstruct
-except ImportError:
-    import bitstruct
-
 if TYPE_CHECKING:
     from .parameters.parameter import Parameter
 
+#: Specify whether encoding is done in "trusted" mode by default. In
+#: trusted mode, the encoder does not check whether the objects which
+#: are placed into a PDU overlap. This makes encoding faster, but
+#: overlapping objects silently overwrite each other, so it should
+#: only be used for well-tested databases.
+trusted_mode = False
+
 
 @dataclass
 class EncodeState:
@@ -69,6 +72,19 @@ class EncodeState:
     #: will raise an OdxError exception in strict mode.
     allow_unknown_parameters = False
 
+    #: If this is True, a warning is issued if an object is placed
+    #: into bits of the PDU which are already used by another
+    #: object. (The default is determined by `trusted_mode`.)
+    check_overlaps: bool = field(default_factory=lambda: not trusted_mode)
+
+    #: The expected length of the PDU in bytes. If this is specified,
+    #: the buffers for the payload and the mask of used bits are
+    #: allocated once instead of being grown whenever an object gets
+    #: added. Thus, it must not exceed the length of the PDU
+    #: which results from encoding. (This is the case if it is
+    #: derived from the static bit length of the encoded object.)
+    size_hint: int | None = None
+
     def __post_init__(self) -> None:
         # if a coded message has been specified, but no used_mask, we
         # assume that all of the bits of the coded message are
@@ -81,6 +97,11 @@ class EncodeState:
                      f"0x{self.coded_message.hex()}")
             self.used_mask = self.used_mask[:len(self.coded_message)]
 
+        if self.size_hint is not None and len(self.coded_message) < self.size_hint:
+            pad = bytes(self.size_hint - len(self.coded_message))
+            self.coded_message += pad
+            self.used_mask += pad
+
     def emplace_atomic_value(
         self,
         *,
@@ -227,15 +248,30 @@ class EncodeState:
             self.emplace_bytes(b'')
             return
 
-        format_char = base_data_type.bitstruct_format_letter
         padding = (8 - ((bit_length + self.cursor_bit_position) % 8)) % 8
         odxassert((0 <= padding and padding < 8 and
                    (padding + bit_length + self.cursor_bit_position) % 8 == 0),
                   f"Incorrect padding {padding}")
-        left_pad = f"p{padding}" if padding > 0 else ""
 
-        # actually encode the value
-        coded = bitstruct.pack(f"{left_pad}{format_char}{bit_length}", raw_value)
+        # the byte order only applies to numeric objects
+        is_reversed = not is_highlow_byte_order and base_data_type in [
+            DataType.A_INT32, DataType.A_UINT32, DataType.A_FLOAT32, DataType.A_FLOAT64
+        ]
+
+        # actually encode the value. Byte-aligned integers and blobs
+        # can be converted directly.
+        coded: bytes
+        if padding == 0 and self.cursor_bit_position == 0 and isinstance(raw_value,
+                                                                         int) and raw_value >= 0:
+            coded = raw_value.to_bytes(bit_length // 8, "little" if is_reversed else "big")
+        elif padding == 0 and isinstance(raw_value, bytes) and 8 * len(raw_value) == bit_length:
+            coded = raw_value
+        else:
+            compiled_format = get_compiled_format(base_data_type.bitstruct_format_letter,
+                                                  bit_length, padding)
+            coded = compiled_format.pack(raw_value)
+            if is_reversed:
+                coded = coded[::-1]
 
         # create the raw mask of used bits for numeric objects
         used_mask_raw = used_mask
@@ -249,10 +285,7 @@ class EncodeState:
             used_mask_raw = tmp.to_bytes((self.cursor_bit_position + bit_length + 7) // 8, "big")
 
         # apply byte order to numeric objects
-        if not is_highlow_byte_order and base_data_type in [
-                DataType.A_INT32, DataType.A_UINT32, DataType.A_FLOAT32, DataType.A_FLOAT64
-        ]:
-            coded = coded[::-1]
+        if is_reversed:
             used_mask_raw = used_mask_raw[::-1]
 
         self.cursor_bit_position = 0
@@ -266,47 +299,74 @@ class EncodeState:
             odxraise("EncodeState.emplace_bytes can only be called "
                      "for a bit position of 0!", RuntimeError)
 
+        coded_message = self.coded_message
+        used_mask = self.used_mask
+        check_overlaps = self.check_overlaps
         pos = self.cursor_byte_position
+        n = len(new_data)
+        end_pos = pos + n
 
-        # Make blob longer if necessary
-        min_length = pos + len(new_data)
-        if len(self.coded_message) < min_length:
-            pad = b'\x00' * (min_length - len(self.coded_message))
-            self.coded_message += pad
-            self.used_mask += pad
+        # Make blob longer if necessary. Bytes which have just been
+        # added are not used by any object.
+        orig_len = len(coded_message)
+        if orig_len < end_pos:
+            pad = bytes(end_pos - orig_len)
+            coded_message += pad
+            used_mask += pad
 
         if obj_used_mask is None:
             # Happy path for when no obj_used_mask has been
             # specified. In this case we assume that all bits of the
             # new data to be emplaced are used.
-            n = len(new_data)
-
-            if self.used_mask[pos:pos + n] != b'\x00' * n:
-                warnings.warn(
-                    f"Overlapping objects detected in between bytes {pos} and "
-                    f"{pos+n}",
-                    OdxWarning,
-                    stacklevel=1,
-                )
-            self.coded_message[pos:pos + n] = new_data
-            self.used_mask[pos:pos + n] = b'\xff' * n
-        else:
-            # insert data the hard way, i.e. we have to look at each
-            # individual byte to determine if it has already been used
-            # somewhere else (it would be nice if bytearrays supported
-            # bitwise operations!)
-            for i in range(len(new_data)):
-                if self.used_mask[pos + i] & obj_used_mask[i] != 0:
+            if check_overlaps and pos < orig_len:
+                check_end_pos = min(end_pos, orig_len)
+                if used_mask.count(0, pos, check_end_pos) != check_end_pos - pos:
                     warnings.warn(
-                        f"Overlapping objects detected at position {pos + i}",
+                        f"Overlapping objects detected in between bytes {pos} and "
+                        f"{pos+n}",
                         OdxWarning,
                         stacklevel=1,
                     )
-                self.coded_message[pos + i] &= ~obj_used_mask[i]
-                self.coded_message[pos + i] |= new_data[i] & obj_used_mask[i]
-                self.used_mask[pos + i] |= obj_used_mask[i]
-
-        self.cursor_byte_position += len(new_data)
+            coded_message[pos:end_pos] = new_data
+            if check_overlaps:
+                used_mask[pos:end_pos] = b'\xff' * n
+        elif n == 1:
+            # objects which fit into a single byte, i.e., most
+            # bit-positioned parameters
+            mask = obj_used_mask[0]
+            if check_overlaps:
+                if used_mask[pos] & mask != 0:
+                    warnings.warn(
+                        f"Overlapping objects detected at position {pos}",
+                        OdxWarning,
+                        stacklevel=1,
+                    )
+                used_mask[pos] |= mask
+            coded_message[pos] = (coded_message[pos] & ~mask) | (new_data[0] & mask)
+        else:
+            # the whole span of the object is treated as a single
+            # integer, so the masking operations are done at once for
+            # all of its bytes
+            mask = int.from_bytes(obj_used_mask[:n], "big")
+            data = int.from_bytes(new_data, "big") & mask
+            if pos < orig_len:
+                old_data = int.from_bytes(coded_message[pos:end_pos], "big")
+                data |= old_data & ~mask
+            coded_message[pos:end_pos] = data.to_bytes(n, "big")
+
+            if check_overlaps:
+                used = int.from_bytes(used_mask[pos:end_pos], "big") if pos < orig_len else 0
+                if (overlap := used & mask) != 0:
+                    for i, overlap_byte in enumerate(overlap.to_bytes(n, "big")):
+                        if overlap_byte != 0:
+                            warnings.warn(
+                                f"Overlapping objects detected at position {pos + i}",
+                                OdxWarning,
+                                stacklevel=1,
+                            )
+                used_mask[pos:end_pos] = (used | mask).to_bytes(n, "big")
+
+        self.cursor_byte_position = end_pos
 
     @staticmethod
     def __encode_bcd_p(value: int) -> int:
@@ -2,9 +2,11 @@
 #
 # SPDX-License-Identifier: MIT
 import asyncio
+import mmap
 import re
+import struct
 import sys
-from collections.abc import AsyncGenerator, Iterable
+from collections.abc import AsyncGenerator, Iterable, Iterator
 from enum import IntEnum
 from io import TextIOBase
 from typing import TextIO
@@ -26,6 +28,70 @@ class IsoTp(IntEnum):
     FLOW_CONTROL_ABORT = 2
 
 
+# plain integer versions of the frame types. comparing against these
+# is considerably faster than using the enum members.
+_FRAME_TYPE_SINGLE = int(IsoTp.FRAME_TYPE_SINGLE)
+_FRAME_TYPE_FIRST = int(IsoTp.FRAME_TYPE_FIRST)
+_FRAME_TYPE_CONSECUTIVE = int(IsoTp.FRAME_TYPE_CONSECUTIVE)
+_FRAME_TYPE_FLOW_CONTROL = int(IsoTp.FRAME_TYPE_FLOW_CONTROL)
+
+# layout of the records used by the raw frame format of SocketCAN,
+# i.e., `struct can_frame` and `struct canfd_frame` on little endian
+# machines: CAN ID and flags, length of the payload, padding, payload
+_SOCKETCAN_FRAME = struct.Struct("<IB3x8s")
+_SOCKETCAN_FD_FRAME = struct.Struct("<IB3x64s")
+
+# flags which are stored in the upper bits of SocketCAN CAN IDs
+_CAN_EFF_FLAG = 0x80000000
+_CAN_RTR_FLAG = 0x40000000
+_CAN_ERR_FLAG = 0x20000000
+_CAN_EFF_MASK = 0x1FFFFFFF
+_CAN_SFF_MASK = 0x000007FF
+
+
+def iter_socketcan_frames(buffer: bytes | bytearray | memoryview | mmap.mmap,
+                          *,
+                          fd: bool = False) -> Iterator[tuple[int, bytes]]:
+    """Iterate over the CAN frames contained by a buffer of raw
+    SocketCAN frames.
+
+    The buffer is expected to contain a sequence of `struct
+    can_frame` (or `struct canfd_frame` if `fd` is true) records as
+    they are read from raw CAN sockets. The buffer is not copied,
+    i.e., memory mapped files can be processed without reading them
+    into memory first. Remote and error frames are skipped, and so is an
+    incomplete record at the end of the buffer.
+
+    The yielded frames are (can_id, payload_data) tuples.
+    """
+    frame_struct = _SOCKETCAN_FD_FRAME if fd else _SOCKETCAN_FRAME
+    with memoryview(buffer).cast("B") as view:
+        num_bytes = len(view) - len(view) % frame_struct.size
+        for can_id, data_len, data in frame_struct.iter_unpack(view[:num_bytes]):
+            if can_id & (_CAN_RTR_FLAG | _CAN_ERR_FLAG):
+                continue
+
+            if can_id & _CAN_EFF_FLAG:
+                can_id &= _CAN_EFF_MASK
+            else:
+                can_id &= _CAN_SFF_MASK
+
+            yield can_id, data[:data_len]
+
+
+class _IsoTpRxState:
+    """The reassembly state of the telegrams received via a single
+    CAN ID"""
+
+    __slots__ = ("telegram_idx", "specified_len", "data", "last_rx_fragment_idx")
+
+    def __init__(self, telegram_idx: int) -> None:
+        self.telegram_idx = telegram_idx
+        self.specified_len = 0
+        self.data: bytearray | None = None
+        self.last_rx_fragment_idx = 0
+
+
 class IsoTpStateMachine:
     can_normal_frame_re = re.compile(
         "([a-zA-Z0-9_-]*) *([0-9A-Fa-f ]*) *\\[[0-9]+\\] *([ 0-9A-Fa-f]+)")
@@ -33,6 +99,17 @@ class IsoTpStateMachine:
     can_fd_log_frame_re = re.compile(
         "\\([0-9.]*\\) *([a-zA-Z0-9_-]*) ([0-9A-Fa-f]+)##[0-9A-Fa-f]([0-9A-Fa-f]+)")
 
+    # combination of the regular expressions above which matches
+    # every line of a chunk of a log file exactly once. The group
+    # which matched last indicates the format of the line.
+    can_any_frame_re = re.compile(
+        "^[ \\t]*(?:"
+        "\\([0-9.]*\\) *[a-zA-Z0-9_-]* (?P<log_id>[0-9A-Fa-f]+)(?:#|##[0-9A-Fa-f])"
+        "(?P<log_data>[0-9A-Fa-f]+)"
+        "|[a-zA-Z0-9_-]* *(?P<normal_id>[0-9A-Fa-f ]*) *\\[[0-9]+\\] *(?P<normal_data>[ 0-9A-Fa-f]+)"
+        "|(?P<unknown>)"
+        ")[^\\n]*$", re.MULTILINE)
+
     def __init__(self, can_rx_ids: int | list[int]):
         if isinstance(can_rx_ids, int):
             can_rx_ids = [can_rx_ids]
@@ -40,9 +117,13 @@ class IsoTpStateMachine:
         self._can_rx_ids = can_rx_ids
         assert isinstance(self._can_rx_ids, list)
 
-        self._telegram_specified_len = [0] * len(can_rx_ids)
-        self._telegram_data: list[bytearray | None] = [None] * len(can_rx_ids)
-        self._telegram_last_rx_fragment_idx = [0] * len(can_rx_ids)
+        # the reassembly state of each telegram and a map from CAN ID
+        # to it. Looking up the state of a CAN ID thus does not
+        # depend on the number of CAN IDs that are monitored.
+        self._rx_states = [_IsoTpRxState(i) for i in range(len(can_rx_ids))]
+        self._rx_states_by_id: dict[int, _IsoTpRxState] = {}
+        for rx_state, rx_id in zip(self._rx_states, can_rx_ids, strict=True):
+            self._rx_states_by_id.setdefault(rx_id, rx_state)
 
     def decode_rx_frame(self, rx_id: int, data: bytes | bytearray) -> Iterable[tuple[int, bytes]]:
         """Handle the ISO-TP state transitions caused by a CAN frame.
@@ -50,49 +131,58 @@ class IsoTpStateMachine:
         E.g., add some data to a telegram, etc. Returns a generator of
         (receive_id, payload_data) tuples.
         """
-        try:
-            telegram_idx = self._can_rx_ids.index(rx_id)
-        except ValueError:
-            return  # unknown CAN ID
+        telegram = self.handle_rx_frame(rx_id, data)
+        if telegram is not None:
+            yield (rx_id, telegram)
 
-        # decode the isotp segment
-        frame_type, _ = bitstruct.unpack("u4u4", data)
-        assert isinstance(frame_type, int)
+    def handle_rx_frame(self, rx_id: int, data: bytes | bytearray) -> bytes | None:
+        """Handle the ISO-TP state transitions caused by a CAN frame
+        and return the payload of the telegram completed by it.
 
-        telegram_len = None
-        if frame_type == IsoTp.FRAME_TYPE_SINGLE:
-            frame_type, telegram_len = bitstruct.unpack("u4u4", data)
-            assert isinstance(telegram_len, int)
+        If the frame does not complete a telegram, `None` is returned.
+        """
+        rx_state = self._rx_states_by_id.get(rx_id)
+        if rx_state is None:
+            return None  # unknown CAN ID
+        telegram_idx = rx_state.telegram_idx
 
-            self.on_single_frame(telegram_idx, data[1:1 + telegram_len])
-            self.on_telegram_complete(telegram_idx, data[1:1 + telegram_len])
+        # decode the isotp segment. The frame type is specified by
+        # the upper nibble of the first byte, the meaning of the lower
+        # nibble depends on the frame type.
+        frame_type = data[0] >> 4
+        low_nibble = data[0] & 0x0f
 
-            yield (rx_id, bytes(data[1:1 + telegram_len]))
+        if frame_type == _FRAME_TYPE_SINGLE:
+            telegram_len = low_nibble
+            payload = data[1:1 + telegram_len]
 
-        elif frame_type == IsoTp.FRAME_TYPE_FIRST:
-            frame_type, telegram_len = bitstruct.unpack("u4u12", data)
-            assert isinstance(telegram_len, int)
+            self.on_single_frame(telegram_idx, payload)
+            self.on_telegram_complete(telegram_idx, payload)
 
-            self._telegram_specified_len[telegram_idx] = telegram_len
-            self._telegram_data[telegram_idx] = bytearray(data[2:])
-            self._telegram_last_rx_fragment_idx[telegram_idx] = 0
+            return bytes(payload)
+
+        elif frame_type == _FRAME_TYPE_FIRST:
+            telegram_len = (low_nibble << 8) | data[1]
+
+            rx_state.specified_len = telegram_len
+            rx_state.data = bytearray(data[2:])
+            rx_state.last_rx_fragment_idx = 0
 
             self.on_first_frame(telegram_idx, data)
 
-        elif frame_type == IsoTp.FRAME_TYPE_CONSECUTIVE:
-            frame_type, rx_segment_idx = bitstruct.unpack("u4u4", data)
-            assert isinstance(rx_segment_idx, int)
+        elif frame_type == _FRAME_TYPE_CONSECUTIVE:
+            rx_segment_idx = low_nibble
 
-            expected_segment_idx = (self._telegram_last_rx_fragment_idx[telegram_idx] + 1) % 16
-            telegram_data = self._telegram_data[telegram_idx]
+            expected_segment_idx = (rx_state.last_rx_fragment_idx + 1) % 16
+            telegram_data = rx_state.data
             assert isinstance(telegram_data, bytearray)
 
             n = -1
             if expected_segment_idx == rx_segment_idx:
-                self._telegram_last_rx_fragment_idx[telegram_idx] = rx_segment_idx
+                rx_state.last_rx_fragment_idx = rx_segment_idx
                 telegram_data += data[1:]
 
-                n = self._telegram_specified_len[telegram_idx]
+                n = rx_state.specified_len
                 if len(telegram_data) > n:
                     # can frames can include padding, i.e. the length
                     # of the telegram payload is not necessarily a
@@ -105,16 +195,17 @@ class IsoTpStateMachine:
                 self.on_sequence_error(telegram_idx, expected_segment_idx, rx_segment_idx)
             elif len(telegram_data) == n:
                 self.on_telegram_complete(telegram_idx, telegram_data)
-                yield (rx_id, bytes(telegram_data))
+                return bytes(telegram_data)
 
-        elif frame_type == IsoTp.FRAME_TYPE_FLOW_CONTROL:
-            frame_type, flow_control_flag = bitstruct.unpack("u4u4", data)
-            assert isinstance(flow_control_flag, int)
+        elif frame_type == _FRAME_TYPE_FLOW_CONTROL:
+            flow_control_flag = low_nibble
 
             self.on_flow_control_frame(telegram_idx, flow_control_flag)
         else:
             self.on_frame_type_error(telegram_idx, frame_type)
 
+        return None
+
     async def read_telegrams(self,
                              bus: can.BusABC | TextIO) -> AsyncGenerator[tuple[int, bytes], None]:
         """This is equivalent to the :py:meth:`file.readlines()` method, but
@@ -141,42 +232,115 @@ class IsoTpStateMachine:
                     yield tmp
         else:
             assert isinstance(bus, TextIOBase)
-            # input is a file
+            # input is a file. since it might be a live stream, it is
+            # read line by line
             while bus:
                 cur_line = bus.readline()
                 if cur_line == "":
                     return
 
-                if m := self.can_normal_frame_re.match(cur_line.strip()):
-                    # frame_interface = m.group(1)
-                    frame_id = int(m.group(2), 16)
+                for tmp in self._decode_log_text(cur_line):
+                    yield tmp
+
+    def decode_rx_frames(self,
+                         frames: Iterable[tuple[int,
+                                                bytes | bytearray]]) -> Iterator[tuple[int, bytes]]:
+        """Handle the ISO-TP state transitions caused by a sequence
+        of CAN frames.
 
-                    frame_data_formatted = m.group(3).strip()
-                    frame_data = bytearray([int(x, 16) for x in frame_data_formatted.split(" ")])
+        This is the bulk version of :py:meth:`decode_rx_frame`: The
+        frames are specified as (can_id, frame_data) tuples and the
+        yielded telegrams are (can_id, payload_data) tuples.
+        """
+        decode_rx_frame = self.handle_rx_frame
+        rx_states_by_id = self._rx_states_by_id
+        for rx_id, data in frames:
+            if rx_id not in rx_states_by_id:
+                continue
 
-                    for tmp in self.decode_rx_frame(frame_id, frame_data):
-                        yield tmp
+            telegram = decode_rx_frame(rx_id, data)
+            if telegram is not None:
+                yield (rx_id, telegram)
 
-                elif (m := self.can_log_frame_re.match(
-                        cur_line.strip())) or (m := self.can_fd_log_frame_re.match(
-                            cur_line.strip())):
-                    # frame_interface = m.group(2)
-                    frame_id = int(m.group(2), 16)
+    def read_trace_telegrams(self, reader: Iterable[can.Message]) -> Iterator[tuple[int, bytes]]:
+        """Read the ISO-TP telegrams contained by a recorded CAN trace.
 
-                    frame_data_formatted = m.group(3).strip()
-                    frame_data_list = [
-                        frame_data_formatted[i:i + 2]
-                        for i in range(0, len(frame_data_formatted), 2)
-                    ]
-                    frame_data = bytearray([int(x, 16) for x in frame_data_list])
+        `reader` may be any iterable of CAN messages, in particular
+        the readers of `python-can` for BLF, ASC, MF4 and the other
+        supported file formats, e.g., `can.LogReader("trace.blf")`.
+        Remote and error frames are ignored.
 
-                    for tmp in self.decode_rx_frame(frame_id, frame_data):
-                        yield tmp
+        The yielded telegrams are (can_id, payload_data) tuples.
+        """
+        return self.decode_rx_frames((msg.arbitration_id, msg.data)
+                                     for msg in reader
+                                     if not msg.is_error_frame and not msg.is_remote_frame)
+
+    def read_socketcan_telegrams(self,
+                                 buffer: bytes | bytearray | memoryview | mmap.mmap,
+                                 *,
+                                 fd: bool = False) -> Iterator[tuple[int, bytes]]:
+        """Read the ISO-TP telegrams contained by a buffer of raw
+        SocketCAN frames.
+
+        See :py:func:`iter_socketcan_frames` for the format of the
+        buffer. The yielded telegrams are (can_id, payload_data)
+        tuples.
+        """
+        return self.decode_rx_frames(iter_socketcan_frames(buffer, fd=fd))
 
+    def read_log_telegrams(self,
+                           log_file: TextIO,
+                           chunk_size: int = 1 << 20) -> Iterator[tuple[int, bytes]]:
+        """Read the ISO-TP telegrams contained by a CAN log file.
+
+        In contrast to :py:meth:`read_telegrams`, this reads the file
+        in chunks of approximately `chunk_size` characters, which is
+        much faster for large files. Since it blocks until a chunk
+        is complete or the end of the file is reached, it is not
+        suitable for live streams.
+
+        The yielded telegrams are (can_id, payload_data) tuples.
+        """
+        while lines := log_file.readlines(chunk_size):
+            yield from self._decode_log_text("".join(lines))
+
+    def _decode_log_text(self, text: str) -> Iterator[tuple[int, bytes]]:
+        """Decode the CAN frames contained by a chunk of a log file"""
+
+        # make sure that the end of the text does not constitute an
+        # additional empty line
+        if text.endswith("\n"):
+            text = text[:-1]
+
+        decode_rx_frame = self.handle_rx_frame
+        rx_states_by_id = self._rx_states_by_id
+        for m in self.can_any_frame_re.finditer(text):
+            log_id, log_data, normal_id, normal_data, _ = m.groups()
+            try:
+                if log_data is not None:
+                    frame_id = int(log_id, 16)
+                    frame_data_str = log_data
+                elif normal_data is not None:
+                    frame_id = int(normal_id, 16)
+                    frame_data_str = normal_data
                 else:
-                    print(
-                        f"Warning: unrecognized frame format: '{cur_line.strip()}'",
-                        file=sys.stderr)
+                    raise ValueError()
+
+                if frame_id not in rx_states_by_id:
+                    # the frame is irrelevant, i.e., its data does
+                    # not need to be converted
+                    continue
+
+                frame_data = bytes.fromhex(frame_data_str)
+            except ValueError:
+                print(
+                    f"Warning: unrecognized frame format: '{m.group(0).strip()}'", file=sys.stderr)
+                continue
+
+            telegram = decode_rx_frame(frame_id, frame_data)
+            if telegram is not None:
+                yield (frame_id, telegram)
 
     def can_rx_id(self, telegram_idx: int) -> int:
         """Given a Telegram index, returns the CAN ID for receiving data.
@@ -191,7 +355,7 @@ class IsoTpStateMachine:
 
         :raises IndexError: The telegram index is invalid.
         """
-        return self._telegram_data[telegram_idx]
+        return self._rx_states[telegram_idx].data
 
     ##############
     # Callbacks
@@ -5,10 +5,31 @@ from pathlib import Path
 from .database import Database
 
 
-def load_pdx_file(pdx_file: str | Path) -> Database:
+def load_pdx_file(pdx_file: str | Path, *, snapshot_dir: str | Path | None = None) -> Database:
+    """Load a PDX file into a database object
+
+    If `snapshot_dir` is specified, the fully refreshed database is
+    cached in this directory. Subsequent calls for a PDX file with
+    identical content restore the database from the snapshot instead
+    of parsing the ODX files.
+    """
+    if snapshot_dir is None:
+        db = Database()
+        db.add_pdx_file(str(pdx_file))
+        db.refresh()
+        return db
+
+    from .snapshot import load_database_snapshot, pdx_snapshot_key, save_database_snapshot
+
+    snapshot_file = Path(snapshot_dir) / f"{pdx_snapshot_key(pdx_file)}.odxdb"
+    if (cached_db := load_database_snapshot(snapshot_file)) is not None:
+        return cached_db
+
     db = Database()
     db.add_pdx_file(str(pdx_file))
     db.refresh()
+    save_database_snapshot(db, snapshot_file)
+
     return db
 
 
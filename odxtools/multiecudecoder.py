@@ -0,0 +1,211 @@
+# SPDX-License-Identifier: MIT
+import asyncio
+from collections.abc import AsyncGenerator, Iterable, Iterator
+from dataclasses import dataclass
+
+import can
+
+from . import uds
+from .diaglayers.diaglayer import DiagLayer
+from .exceptions import DecodeError
+from .isotp_state_machine import IsoTpStateMachine
+from .message import Message
+
+
+@dataclass(kw_only=True, frozen=True, eq=False)
+class MonitoredEcu:
+    """An ECU whose diagnostic communication is decoded by a
+    `MultiEcuDecoder`
+
+    Monitored ECUs are compared by identity.
+    """
+
+    #: The diagnostic layer used to decode the telegrams
+    diag_layer: DiagLayer
+
+    #: The CAN ID on which the ECU receives requests
+    rx_id: int
+
+    #: The CAN ID on which the ECU sends its responses
+    tx_id: int
+
+
+@dataclass(kw_only=True)
+class DecodedTelegram:
+    """A diagnostic telegram observed by a `MultiEcuDecoder`"""
+
+    #: The CAN channel on which the telegram has been observed
+    channel: str | None
+
+    #: The ECU which has sent or received the telegram
+    ecu: MonitoredEcu
+
+    #: The CAN ID of the telegram
+    can_id: int
+
+    #: The payload of the ISO-TP telegram
+    payload: bytes
+
+    #: True if the telegram is a request sent to the ECU
+    is_request: bool
+
+    #: For responses, the request which the response has been
+    #: correlated with
+    request: bytes | None = None
+
+    #: The possible interpretations of the telegram
+    messages: list[Message]
+
+    #: The error which occurred while decoding the telegram
+    error: DecodeError | None = None
+
+    @property
+    def is_response_pending(self) -> bool:
+        """True if the ECU indicates that the final response to the
+        request is still to come"""
+        return not self.is_request and uds.is_response_pending(self.payload)
+
+
+class _ChannelState:
+    """The state of the diagnostic communication on a single CAN
+    channel"""
+
+    __slots__ = ("state_machine", "last_requests")
+
+    def __init__(self, can_ids: list[int]) -> None:
+        self.state_machine = IsoTpStateMachine(can_ids)
+
+        # the last request sent to each ECU of the channel, keyed by
+        # the receive ID of the ECU
+        self.last_requests: dict[int, bytes] = {}
+
+
+class MultiEcuDecoder:
+    """Reassemble and decode the diagnostic communication of many
+    ECUs at once
+
+    ISO-TP telegrams are reassembled separately for each CAN channel
+    and responses are correlated with the last request sent to the
+    same ECU on the same channel. The work required per CAN frame
+    does not depend on the number of ECUs that are monitored.
+
+    This class is supposed to be used like this:
+
+    ecus = [MonitoredEcu(diag_layer=db.ecus.my_ecu, rx_id=0x7e0, tx_id=0x7e8), ...]
+    decoder = MultiEcuDecoder(ecus)
+    async for telegram in decoder.read_telegrams([can.Bus(channel="can0", interface="socketcan")]):
+        print(telegram.ecu.diag_layer.short_name, telegram.messages)
+    """
+
+    def __init__(self, ecus: Iterable[MonitoredEcu]) -> None:
+        self._ecus = list(ecus)
+
+        self._ecus_by_can_id: dict[int, MonitoredEcu] = {}
+        for ecu in self._ecus:
+            for can_id in (ecu.rx_id, ecu.tx_id):
+                if self._ecus_by_can_id.setdefault(can_id, ecu) is not ecu:
+                    raise ValueError(f"CAN ID 0x{can_id:x} is used by multiple ECUs")
+
+        self._channel_states: dict[str | None, _ChannelState] = {}
+
+    @property
+    def ecus(self) -> list[MonitoredEcu]:
+        return self._ecus
+
+    def get_ecu(self, can_id: int) -> MonitoredEcu | None:
+        """Return the ECU which uses a given CAN ID
+
+        If the CAN ID is not used by any of the monitored ECUs, `None`
+        is returned.
+        """
+        return self._ecus_by_can_id.get(can_id)
+
+    def _get_channel_state(self, channel: str | None) -> _ChannelState:
+        channel_state = self._channel_states.get(channel)
+        if channel_state is None:
+            channel_state = _ChannelState(list(self._ecus_by_can_id))
+            self._channel_states[channel] = channel_state
+
+        return channel_state
+
+    def decode_frame(self, channel: str | None, can_id: int,
+                     data: bytes | bytearray) -> DecodedTelegram | None:
+        """Handle a CAN frame observed on a channel
+
+        If the frame completes a diagnostic telegram, the decoded
+        telegram is returned, else `None`.
+        """
+        ecu = self._ecus_by_can_id.get(can_id)
+        if ecu is None:
+            return None
+
+        channel_state = self._get_channel_state(channel)
+        payload = channel_state.state_machine.handle_rx_frame(can_id, data)
+        if payload is None:
+            return None
+
+        return self._decode_telegram(channel_state, channel, ecu, can_id, payload)
+
+    def decode_frames(self,
+                      frames: Iterable[tuple[str | None, int,
+                                             bytes | bytearray]]) -> Iterator[DecodedTelegram]:
+        """Handle a sequence of CAN frames
+
+        The frames are specified as (channel, can_id, frame_data)
+        tuples. This is e.g. useful to decode recorded traces.
+        """
+        for channel, can_id, data in frames:
+            telegram = self.decode_frame(channel, can_id, data)
+            if telegram is not None:
+                yield telegram
+
+    async def read_telegrams(self, buses: can.BusABC | list[can.BusABC]
+                            ) -> AsyncGenerator[DecodedTelegram, None]:
+        """Decode the diagnostic telegrams observed on one or more
+        CAN buses
+
+        The frames of all buses are received concurrently. The channel
+        of each telegram is the one reported by the CAN interface for
+        the frames it is made of.
+        """
+        reader = can.AsyncBufferedReader()
+        notifier = can.Notifier(buses, [reader], loop=asyncio.get_running_loop())
+        try:
+            while True:
+                msg = await reader.get_message()
+                if msg.is_error_frame or msg.is_remote_frame:
+                    continue
+
+                channel = None if msg.channel is None else str(msg.channel)
+                telegram = self.decode_frame(channel, msg.arbitration_id, msg.data)
+                if telegram is not None:
+                    yield telegram
+        finally:
+            notifier.stop()
+
+    def _decode_telegram(self, channel_state: _ChannelState, channel: str | None, ecu: MonitoredEcu,
+                         can_id: int, payload: bytes) -> DecodedTelegram:
+        is_request = can_id == ecu.rx_id
+        result = DecodedTelegram(
+            channel=channel,
+            ecu=ecu,
+            can_id=can_id,
+            payload=payload,
+            is_request=is_request,
+            messages=[])
+
+        try:
+            if is_request:
+                channel_state.last_requests[ecu.rx_id] = payload
+                result.messages = ecu.diag_layer.decode(payload)
+            else:
+                request = channel_state.last_requests.get(ecu.rx_id)
+                result.request = request
+                if request is None:
+                    result.messages = ecu.diag_layer.decode(payload)
+                else:
+                    result.messages = ecu.diag_layer.decode_response(payload, request)
+        except DecodeError as e:
+            result.error = e
+
+        return result
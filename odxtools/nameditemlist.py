@@ -3,8 +3,9 @@ import abc
 import typing
 from collections.abc import Collection, Iterable
 from copy import deepcopy
+from functools import cache
 from keyword import iskeyword
-from typing import Any, SupportsIndex, TypeVar, overload, runtime_checkable
+from typing import Any, SupportsIndex, TypeVar, cast, overload, runtime_checkable
 
 from .exceptions import odxraise
 
@@ -21,6 +22,13 @@ T = TypeVar("T")
 TNamed = TypeVar("TNamed", bound=OdxNamed)
 
 
+@cache
+def _get_reserved_names(cls: type) -> frozenset[str]:
+    """Return the names of the attributes of a class which must not be
+    shadowed by the names of items"""
+    return frozenset(dir(cls))
+
+
 class ItemAttributeList(list[T]):
     """A list that provides direct access to its items as named attributes.
 
@@ -35,12 +43,25 @@ class ItemAttributeList(list[T]):
     returned by the item-to-name function are valid identifiers in python.
     """
 
+    __slots__ = ("_item_dict", "_collision_counters", "_item_keys")
+
     def __init__(self, input_list: Iterable[T] | None = None) -> None:
-        self._item_dict: dict[str, T] = {}
+        self._reset_attribute_items()
 
         if input_list is not None:
-            for item in input_list:
-                self.append(item)
+            self.extend(input_list)
+
+    def _reset_attribute_items(self) -> None:
+        self._item_dict: dict[str, T] = {}
+
+        # the last suffix which has been used to make the name of an
+        # item unique for each name that has exhibited a conflict
+        self._collision_counters: dict[str, int] | None = None
+
+        # reverse map from the identity of an item to the names under
+        # which it is accessible. This is only required to remove
+        # items, so it is computed lazily.
+        self._item_keys: dict[int, list[str]] | None = None
 
     @abc.abstractmethod
     def _get_item_key(self, item: T) -> str:
@@ -57,28 +78,53 @@ class ItemAttributeList(list[T]):
 
         super().append(item)
 
+    def _is_name_taken(self, name: str) -> bool:
+        return name in self._item_dict or name in _get_reserved_names(type(self))
+
     def _add_attribute_item(self, item: T) -> None:
-        item_name = self._get_item_key(item)
+        base_name = self._get_item_key(item)
+        item_name = base_name
 
         # eliminate conflicts between the name of the new item and
-        # existing attributes of the ItemAttributeList object
-        i = 1
-        tmp = item_name
-        while True:
-            if not hasattr(self, tmp):
-                break
-
-            i += 1
-            if item_name.endswith("_"):
-                # if the item name already ends with an underscore,
-                # there's no need to add a second one...
-                tmp = f"{item_name}{i}"
-            else:
-                tmp = f"{item_name}_{i}"
-
-        item_name = tmp
+        # existing attributes of the ItemAttributeList object. The
+        # suffixes which have already been used for a name are
+        # skipped.
+        if self._is_name_taken(item_name):
+            if self._collision_counters is None:
+                self._collision_counters = {}
+
+            i = self._collision_counters.get(base_name, 1)
+            while True:
+                i += 1
+                if base_name.endswith("_"):
+                    # if the item name already ends with an underscore,
+                    # there's no need to add a second one...
+                    item_name = f"{base_name}{i}"
+                else:
+                    item_name = f"{base_name}_{i}"
+
+                if not self._is_name_taken(item_name):
+                    break
+
+            self._collision_counters[base_name] = i
 
         self._item_dict[item_name] = item
+        if self._item_keys is not None:
+            self._item_keys.setdefault(id(item), []).append(item_name)
+
+    def _remove_attribute_item(self, item: T) -> None:
+        if self._item_keys is None:
+            self._item_keys = {}
+            for key, value in self._item_dict.items():
+                self._item_keys.setdefault(id(value), []).append(key)
+
+        # if the object is contained by the list multiple times, all
+        # of its names refer to the same object, i.e., it does not
+        # matter which one is removed
+        item_keys = self._item_keys[id(item)]
+        del self._item_dict[item_keys.pop()]
+        if not item_keys:
+            del self._item_keys[id(item)]
 
     def insert(self, index: SupportsIndex, obj: T) -> None:
         self._add_attribute_item(obj)
@@ -86,33 +132,33 @@ class ItemAttributeList(list[T]):
         list.insert(self, index, obj)
 
     def remove(self, obj: T) -> None:
-        list.remove(self, obj)
-
-        keys = [k for (k, v) in self._item_dict.items() if v == obj]
-        for key in keys:
-            del self._item_dict[key]
+        # remove the object which is actually stored by the list, not
+        # the one which has been passed (they may only be equal)
+        self.pop(self.index(obj))
 
     def pop(self, index: SupportsIndex = -1) -> T:
         result = list.pop(self, index)
-        keys = [k for (k, v) in self._item_dict.items() if v == result]
-        for key in keys:
-            del self._item_dict[key]
+        self._remove_attribute_item(result)
         return result
 
     def extend(self, items: Iterable[T]) -> None:
+        add_attribute_item = self._add_attribute_item
+        list_append = super().append
         for item in items:
-            self.append(item)
+            add_attribute_item(item)
+            list_append(item)
 
     def clear(self) -> None:
         super().clear()
 
-        self._item_dict = {}
+        self._reset_attribute_items()
 
     def copy(self) -> "ItemAttributeList[T]":
         result = self.__class__()
-        for item in self:
-            list.append(result, item)
+        list.extend(result, self)
         result._item_dict = self._item_dict.copy()
+        if self._collision_counters is not None:
+            result._collision_counters = self._collision_counters.copy()
         return result
 
     def keys(self) -> Collection[str]:
@@ -125,7 +171,7 @@ class ItemAttributeList(list[T]):
         return self._item_dict.items()
 
     def __dir__(self) -> dict[str, Any]:
-        result = dict(self.__dict__)
+        result: dict[str, Any] = {"_item_dict": self._item_dict}
         result.update(self._item_dict)
         return result
 
@@ -183,9 +229,8 @@ class ItemAttributeList(list[T]):
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
-        result._item_dict = {}
-        for x in self:
-            result.append(deepcopy(x, memo))
+        result._reset_attribute_items()
+        result.extend(deepcopy(x, memo) for x in self)
 
         return result
 
@@ -202,6 +247,41 @@ class ItemAttributeList(list[T]):
 
 class NamedItemList(ItemAttributeList[T]):
 
+    __slots__ = ("_items_by_short_name",)
+
+    def _reset_attribute_items(self) -> None:
+        super()._reset_attribute_items()
+
+        # index of the items by their short name. This is computed
+        # lazily because most lists are never searched by short name.
+        self._items_by_short_name: dict[str, list[T]] | None = None
+
+    def _add_attribute_item(self, item: T) -> None:
+        super()._add_attribute_item(item)
+
+        self._items_by_short_name = None
+
+    def _remove_attribute_item(self, item: T) -> None:
+        super()._remove_attribute_item(item)
+
+        self._items_by_short_name = None
+
+    def _get_items_by_short_name(self, short_name: str) -> list[T]:
+        """Return all items of the list that exhibit a given short name
+
+        In contrast to looking up the item via its attribute name,
+        this considers all items of the list which feature the short
+        name, i.e., name collisions can be detected by the caller.
+        """
+        items_by_short_name = self._items_by_short_name
+        if items_by_short_name is None:
+            items_by_short_name = {}
+            for item in self:
+                items_by_short_name.setdefault(cast(OdxNamed, item).short_name, []).append(item)
+            self._items_by_short_name = items_by_short_name
+
+        return items_by_short_name.get(short_name, [])
+
     def _get_item_key(self, item: T) -> str:
         """Transform an object's `short_name` attribute into a valid
         python identifier
@@ -212,9 +292,9 @@ class NamedItemList(ItemAttributeList[T]):
         such short names.
 
         """
-        if not isinstance(item, OdxNamed):
-            odxraise()
-        sn = item.short_name
+        # note that this is equivalent to checking for the `OdxNamed`
+        # protocol, but much cheaper
+        sn = getattr(item, "short_name", None)
         if not isinstance(sn, str):
             odxraise()
 
@@ -1,4 +1,5 @@
 # SPDX-License-Identifier: MIT
+import sys
 import warnings
 from collections.abc import Iterable
 from dataclasses import dataclass
@@ -7,7 +8,7 @@ from typing import Any, Optional, TypeVar, overload
 from xml.etree import ElementTree
 
 from .exceptions import OdxWarning, odxassert, odxraise, odxrequire
-from .nameditemlist import OdxNamed, TNamed
+from .nameditemlist import NamedItemList, OdxNamed, TNamed
 from .odxdoccontext import OdxDocContext
 
 
@@ -26,13 +27,35 @@ class DocType(Enum):
     FUNCTION_DICTIONARY_SPEC = "FUNCTION-DICTIONARY-SPEC"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OdxDocFragment:
     doc_name: str
     doc_type: DocType
 
+    def __hash__(self) -> int:
+        # document fragments are used as keys for each lookup of
+        # the ODXLINK database, and fragments of different types
+        # rarely use the same name. This avoids hashing the enum.
+        return hash(self.doc_name)
+
+
+#: The document fragment tuples which are referred to by references
+#: that explicitly specify a document. Sharing these avoids creating
+#: a separate tuple for each reference.
+_referenced_doc_fragments: dict[tuple[str, DocType], tuple[OdxDocFragment]] = {}
+
+
+def _get_referenced_doc_fragments(doc_name: str, doc_type: DocType) -> tuple[OdxDocFragment]:
+    key = (doc_name, doc_type)
+    doc_frags = _referenced_doc_fragments.get(key)
+    if doc_frags is None:
+        doc_frags = (OdxDocFragment(sys.intern(doc_name), doc_type),)
+        _referenced_doc_fragments[key] = doc_frags
+
+    return doc_frags
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OdxLinkId:
     """The identifier of an ODX object.
 
@@ -82,10 +105,11 @@ class OdxLinkId:
         if local_id is None:
             return None
 
-        return OdxLinkId(local_id, context.doc_fragments)
+        # the same strings are used by the references to the object
+        return OdxLinkId(sys.intern(local_id), context.doc_fragments)
 
 
-@dataclass
+@dataclass(slots=True)
 class OdxLinkRef:
     """A reference to an ODX object.
 
@@ -149,9 +173,9 @@ class OdxLinkRef:
         if docref is None:
             doc_frags = context.doc_fragments
         else:
-            doc_frags = (OdxDocFragment(docref, odxrequire(doctype)),)
+            doc_frags = _get_referenced_doc_fragments(docref, odxrequire(doctype))
 
-        return OdxLinkRef(id_ref, doc_frags)
+        return OdxLinkRef(sys.intern(id_ref), doc_frags)
 
     @staticmethod
     def from_id(odxid: OdxLinkId) -> "OdxLinkRef":
@@ -268,13 +292,14 @@ class OdxLinkDatabase:
         # fragments which it specifies
         for odx_id, obj in new_entries.items():
             for doc_frag in odx_id.doc_fragments:
-                if doc_frag not in self._db:
-                    self._db[doc_frag] = {}
+                doc_frag_db = self._db.get(doc_frag)
+                if doc_frag_db is None:
+                    doc_frag_db = self._db[doc_frag] = {}
 
                 if overwrite:
-                    self._db[doc_frag][odx_id.local_id] = obj
+                    doc_frag_db[odx_id.local_id] = obj
                 else:
-                    self._db[doc_frag].setdefault(odx_id.local_id, obj)
+                    doc_frag_db.setdefault(odx_id.local_id, obj)
 
 
 @overload
@@ -309,7 +334,11 @@ def resolve_snref(target_short_name: str,
                   items: Iterable[OdxNamed],
                   expected_type: Any = None,
                   lenient: bool | None = None) -> Any:
-    candidates = [x for x in items if x.short_name == target_short_name]
+    if isinstance(items, NamedItemList):
+        # use the index of the list instead of scanning all items
+        candidates = items._get_items_by_short_name(target_short_name)
+    else:
+        candidates = [x for x in items if x.short_name == target_short_name]
 
     if not candidates:
         if not lenient:
@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: MIT
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Any, cast
 from xml.etree import ElementTree
 
@@ -9,6 +10,7 @@ from .compositecodec import (composite_codec_decode_from_pdu, composite_codec_en
                              composite_codec_get_free_parameters,
                              composite_codec_get_required_parameters,
                              composite_codec_get_static_bit_length)
+from .decodeplan import DecodePlan, compile_decode_plan
 from .decodestate import DecodeState
 from .element import IdentifiableElement
 from .encodestate import EncodeState
@@ -80,6 +82,11 @@ class Request(IdentifiableElement):
             sdg._resolve_odxlinks(odxlinks)
 
     def _resolve_snrefs(self, context: SnRefContext) -> None:
+        # the decode plan and the static length depend on the resolved
+        # parameters
+        self.__dict__.pop("_decode_plan", None)
+        self.__dict__.pop("_static_byte_length", None)
+
         context.request = self
         context.parameters = self.parameters
 
@@ -107,13 +114,27 @@ class Request(IdentifiableElement):
         print(parameter_info(self.free_parameters), end="")
 
     def encode(self, **kwargs: ParameterValue) -> bytearray:
-        encode_state = EncodeState(is_end_of_pdu=True)
+        encode_state = EncodeState(is_end_of_pdu=True, size_hint=self._static_byte_length)
 
         self.encode_into_pdu(physical_value=kwargs, encode_state=encode_state)
 
         return encode_state.coded_message
 
+    @cached_property
+    def _static_byte_length(self) -> int | None:
+        bit_length = self.get_static_bit_length()
+        return None if bit_length is None else bit_length // 8
+
+    @cached_property
+    def _decode_plan(self) -> DecodePlan | None:
+        return compile_decode_plan(self.parameters)
+
     def decode(self, message: bytes | bytearray) -> ParameterValueDict:
+        # use the precompiled decode plan for fixed-layout requests
+        decode_plan = self._decode_plan
+        if decode_plan is not None and (plan_values := decode_plan.decode(message)) is not None:
+            return plan_values
+
         decode_state = DecodeState(coded_message=bytes(message))
         param_values = self.decode_from_pdu(decode_state)
 
@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: MIT
+from collections.abc import Hashable, Iterable, Mapping
+from typing import Any
+
+from .encodestate import EncodeState
+from .exceptions import EncodeError, odxraise
+from .odxtypes import ParameterValue
+from .parameters.lengthkeyparameter import LengthKeyParameter
+from .parameters.parameter import Parameter
+from .parameters.tablekeyparameter import TableKeyParameter
+from .request import Request
+
+#: The maximum number of encoded requests which are cached by each
+#: diagnostic service
+REQUEST_CACHE_SIZE = 256
+
+
+def freeze_parameter_values(value: Any) -> Hashable | None:
+    """Convert the parameter values passed for encoding a message
+    into a hashable object
+
+    Two sets of parameter values result in the same object if and
+    only if they are equal and of the same types, i.e., `1`, `1.0`
+    and `True` are distinguished. If any of the values cannot be
+    hashed, `None` is returned.
+    """
+    if isinstance(value, Mapping):
+        items = []
+        for key, sub_value in value.items():
+            frozen = freeze_parameter_values(sub_value)
+            if frozen is None:
+                return None
+            items.append((key, frozen))
+        return (dict, tuple(sorted(items)))
+    elif isinstance(value, (list, tuple)):
+        elements = []
+        for sub_value in value:
+            frozen = freeze_parameter_values(sub_value)
+            if frozen is None:
+                return None
+            elements.append(frozen)
+        return (type(value), tuple(elements))
+    elif isinstance(value, bytearray):
+        return (bytearray, bytes(value))
+    elif not isinstance(value, Hashable):
+        return None
+
+    return (type(value), value)
+
+
+class RequestTemplate:
+    """A request with a fixed layout for which the values of all
+    parameters except a few variable ones have been encoded in advance
+
+    Encoding a request using a template only requires to encode the
+    variable parameters into a copy of the pre-encoded message, i.e.,
+    the effort does not depend on the number of the request's constant
+    parameters.
+
+    Use `DiagService.request_template()` to create request templates.
+    """
+
+    def __init__(self, request: Request, variable_params: Iterable[str],
+                 constant_values: Mapping[str, ParameterValue]) -> None:
+        self._request = request
+        self._variable_param_names = set(variable_params)
+
+        param_names = {param.short_name for param in request.parameters}
+        for name in [*self._variable_param_names, *constant_values]:
+            if name not in param_names:
+                odxraise(f"Request {request.short_name} does not exhibit a parameter '{name}'",
+                         EncodeError)
+        for name in self._variable_param_names.intersection(constant_values):
+            odxraise(f"Parameter '{name}' cannot be variable and constant at the same time",
+                     EncodeError)
+
+        # the variable parameters, their byte positions and whether
+        # they are located at the end of the PDU
+        self._variable_params: list[tuple[Parameter, int, bool]] = []
+
+        encode_state = EncodeState(is_end_of_pdu=False, size_hint=request._static_byte_length)
+        cursor = 0
+        for param in request.parameters:
+            if isinstance(param, (LengthKeyParameter, TableKeyParameter)):
+                odxraise(
+                    f"Templates are not supported for requests featuring length- or "
+                    f"table keys (parameter {param.short_name})", EncodeError)
+                continue
+
+            param_bit_length = param.get_static_bit_length()
+            if param_bit_length is None:
+                odxraise(f"Parameter {param.short_name} does not exhibit a static length",
+                         EncodeError)
+                continue
+            elif param.byte_position is not None:
+                cursor = param.byte_position
+
+            is_end_of_pdu = param is request.parameters[-1]
+            next_cursor = cursor + ((param.bit_position or 0) + param_bit_length + 7) // 8
+
+            if param.short_name in self._variable_param_names:
+                self._variable_params.append((param, cursor, is_end_of_pdu))
+            else:
+                if param.is_required and param.short_name not in constant_values:
+                    odxraise(f"No value for required parameter {param.short_name} specified",
+                             EncodeError)
+
+                param_value = constant_values.get(param.short_name)
+                encode_state.cursor_byte_position = cursor
+                encode_state.is_end_of_pdu = is_end_of_pdu
+                param.encode_into_pdu(physical_value=param_value, encode_state=encode_state)
+                encode_state.journal.append((param, param_value))
+
+                if encode_state.cursor_byte_position != next_cursor:
+                    odxraise(
+                        f"The size of parameter {param.short_name} does not match "
+                        f"its static length", EncodeError)
+
+            cursor = next_cursor
+
+        self._coded_message = bytes(encode_state.coded_message)
+        self._used_mask = bytes(encode_state.used_mask)
+        self._journal = encode_state.journal
+
+    @property
+    def request(self) -> Request:
+        return self._request
+
+    @property
+    def variable_parameters(self) -> list[Parameter]:
+        return [param for param, _, _ in self._variable_params]
+
+    def encode(self, **kwargs: ParameterValue) -> bytearray:
+        """Encode a request using the values of its variable
+        parameters"""
+        for name in kwargs:
+            if name not in self._variable_param_names:
+                odxraise(f"Parameter '{name}' is not a variable parameter of the template",
+                         EncodeError)
+
+        encode_state = EncodeState(
+            coded_message=bytearray(self._coded_message),
+            used_mask=bytearray(self._used_mask),
+            journal=list(self._journal))
+        for param, byte_position, is_end_of_pdu in self._variable_params:
+            if param.is_required and param.short_name not in kwargs:
+                odxraise(f"No value for required parameter {param.short_name} specified",
+                         EncodeError)
+
+            param_value = kwargs.get(param.short_name)
+            encode_state.cursor_byte_position = byte_position
+            encode_state.is_end_of_pdu = is_end_of_pdu
+            param.encode_into_pdu(physical_value=param_value, encode_state=encode_state)
+            encode_state.journal.append((param, param_value))
+
+        return encode_state.coded_message
+
+    def __call__(self, **kwargs: ParameterValue) -> bytearray:
+        """Encode a request."""
+        return self.encode(**kwargs)
@@ -1,15 +1,20 @@
 # SPDX-License-Identifier: MIT
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 from typing import Any, cast
 from xml.etree import ElementTree
 
 from .admindata import AdminData
+from .columnardecodeplan import (ColumnarDecodePlan, ColumnarValues, compile_columnar_decode_plan,
+                                 decode_columnar)
 from .compositecodec import (composite_codec_decode_from_pdu, composite_codec_encode_into_pdu,
                              composite_codec_get_coded_const_prefix,
                              composite_codec_get_free_parameters,
                              composite_codec_get_required_parameters,
                              composite_codec_get_static_bit_length)
+from .decodeplan import DecodePlan, compile_decode_plan
 from .decodestate import DecodeState
 from .element import IdentifiableElement
 from .encodestate import EncodeState
@@ -94,6 +99,12 @@ class Response(IdentifiableElement):
             sdg._resolve_odxlinks(odxlinks)
 
     def _resolve_snrefs(self, context: SnRefContext) -> None:
+        # the decode plans and the static length depend on the
+        # resolved parameters
+        self.__dict__.pop("_decode_plan", None)
+        self.__dict__.pop("_columnar_decode_plan", None)
+        self.__dict__.pop("_static_byte_length", None)
+
         context.response = self
         context.parameters = self.parameters
 
@@ -114,13 +125,28 @@ class Response(IdentifiableElement):
                **kwargs: ParameterValue) -> bytearray:
         encode_state = EncodeState(
             triggering_request=bytes(coded_request) if coded_request is not None else None,
-            is_end_of_pdu=True)
+            is_end_of_pdu=True,
+            size_hint=self._static_byte_length)
 
         self.encode_into_pdu(physical_value=kwargs, encode_state=encode_state)
 
         return encode_state.coded_message
 
+    @cached_property
+    def _static_byte_length(self) -> int | None:
+        bit_length = self.get_static_bit_length()
+        return None if bit_length is None else bit_length // 8
+
+    @cached_property
+    def _decode_plan(self) -> DecodePlan | None:
+        return compile_decode_plan(self.parameters)
+
     def decode(self, message: bytes | bytearray) -> ParameterValueDict:
+        # use the precompiled decode plan for fixed-layout responses
+        decode_plan = self._decode_plan
+        if decode_plan is not None and (plan_values := decode_plan.decode(message)) is not None:
+            return plan_values
+
         decode_state = DecodeState(coded_message=message)
         param_values = self.decode_from_pdu(decode_state)
 
@@ -129,6 +155,28 @@ class Response(IdentifiableElement):
 
         return cast(ParameterValueDict, param_values)
 
+    @cached_property
+    def _columnar_decode_plan(self) -> ColumnarDecodePlan | None:
+        return compile_columnar_decode_plan(self.parameters)
+
+    def decode_columnar(self, messages: Iterable[bytes | bytearray]) -> ColumnarValues:
+        """Decode a batch of responses into one column per parameter
+
+        This is intended for decoding large numbers of messages of the
+        same shape, e.g., the responses to periodic
+        ReadDataByIdentifier requests. The result maps the short name
+        paths of the leaf parameters (e.g. `"temperatures.oil"` for
+        parameters of nested structures) to the values of these
+        parameters for all messages. It can be passed to
+        `pandas.DataFrame()` or `pyarrow.table()` directly.
+
+        If NumPy is available, the columns are NumPy arrays and
+        responses that exhibit a static layout are decoded using
+        vectorized operations. Otherwise, each response is decoded
+        individually and the columns are lists.
+        """
+        return decode_columnar(messages, self._columnar_decode_plan, self.decode)
+
     def encode_into_pdu(self, physical_value: ParameterValue | None,
                         encode_state: EncodeState) -> None:
         composite_codec_encode_into_pdu(self, physical_value, encode_state)
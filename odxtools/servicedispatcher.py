@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: MIT
+from collections.abc import Iterable
+from typing import Union, cast
+
+from .diagservice import DiagService
+from .exceptions import DecodeError, odxraise
+from .message import Message
+from .odxtypes import ParameterValueDict
+from .request import Request
+from .response import Response
+
+#: The coded constant prefixes of the services of a diagnostic layer
+#: (cf. `DiagLayer._prefix_tree`)
+PrefixTree = dict[int, Union[list[DiagService], "PrefixTree"]]
+
+#: The coded constant prefixes of the request and the responses of a
+#: diagnostic service together with the respective coding objects
+CodingObjectPrefixes = tuple[tuple[bytes, Request | Response], ...]
+
+#: A service which might be able to decode a message
+ServiceCandidate = tuple[DiagService, CodingObjectPrefixes]
+
+#: Compact representation of a decoded message: the index of the
+#: service, the index of the coding object within the coding objects
+#: of the service followed by the global negative responses, and the
+#: decoded parameters. (The index of the coding object is `None` for
+#: messages which could not be decoded by the service in non-strict
+#: mode.)
+MessageRef = tuple[int, int | None, ParameterValueDict]
+
+
+class ServiceDispatcher:
+    """Lookup table which maps coded messages to the diagnostic
+    services that may be able to decode them
+
+    The table is compiled once per diagnostic layer from the layer's
+    prefix tree: Each of the coded constant prefixes contained by the
+    tree is mapped to the list of all services that feature a prefix
+    of it. Determining the candidate services for a message thus only
+    requires to look up its longest known prefix. Also, the prefixes
+    of the coding objects of each service are computed in advance.
+
+    This class is supposed to be used like this:
+
+    db = odxtools.load_file("my_cool_diagnostics_db.pdx")
+    ...
+    ecu = db.ecus.my_ecu
+    dispatcher = ServiceDispatcher(ecu.services, ecu.global_negative_responses,
+                                   ecu._prefix_tree)
+    messages = dispatcher.decode(bytes([0x22, 0xf1, 0x90]))
+    """
+
+    def __init__(self, services: Iterable[DiagService],
+                 global_negative_responses: Iterable[Response], prefix_tree: PrefixTree) -> None:
+        self._global_negative_responses = list(global_negative_responses)
+        self._services: list[ServiceCandidate] = []
+        self._service_indices: dict[str, list[int]] = {}
+
+        candidates_by_id: dict[int, ServiceCandidate] = {}
+        for service in services:
+            request_prefix = b''
+            if service.request is not None:
+                request_prefix = bytes(service.request.coded_const_prefix())
+
+            # the coding objects which may be selected by the service
+            # itself. The order corresponds to the one used by
+            # `DiagService.decode_message()`
+            coding_objects: list[Request | Response] = [
+                *service.positive_responses, *service.negative_responses
+            ]
+            if service.request is not None:
+                coding_objects.append(service.request)
+            candidate = (service,
+                         tuple((bytes(x.coded_const_prefix(request_prefix=request_prefix)), x)
+                               for x in coding_objects))
+            self._service_indices.setdefault(service.short_name, []).append(len(self._services))
+            self._services.append(candidate)
+            candidates_by_id.setdefault(id(service), candidate)
+
+        # the services featuring a given prefix in the order in which
+        # they have been specified
+        local_candidates: dict[bytes, list[ServiceCandidate]] = {}
+        pending: list[tuple[bytes, PrefixTree]] = [(b'', prefix_tree)]
+        while pending:
+            prefix, sub_tree = pending.pop()
+            for key, value in sub_tree.items():
+                if key >= 0:
+                    pending.append((prefix + bytes([key]), cast(PrefixTree, value)))
+                elif prefix:
+                    # services with an empty prefix are not
+                    # considered to be able to decode anything
+                    local_candidates[prefix] = [
+                        candidates_by_id[id(x)] for x in cast(list[DiagService], value)
+                    ]
+
+        # accumulate the candidates of all prefixes of each prefix,
+        # with the shortest prefixes coming first
+        self._candidates: dict[bytes, tuple[ServiceCandidate, ...]] = {}
+        for prefix in local_candidates:
+            candidates: list[ServiceCandidate] = []
+            for n in range(1, len(prefix) + 1):
+                candidates += local_candidates.get(prefix[:n], [])
+            self._candidates[prefix] = tuple(candidates)
+
+        # the lengths of the known prefixes, longest first
+        self._prefix_lengths = sorted({len(x) for x in self._candidates}, reverse=True)
+
+    def _lookup(self, message: bytes | bytearray) -> tuple[ServiceCandidate, ...]:
+        message_len = len(message)
+        for n in self._prefix_lengths:
+            if n > message_len:
+                continue
+
+            candidates = self._candidates.get(bytes(message[:n]))
+            if candidates is not None:
+                return candidates
+
+        return ()
+
+    def find_services(self, message: bytes | bytearray) -> list[DiagService]:
+        """Return the services which are potentially able to decode
+        a message
+
+        Services may occur multiple times in the result if several
+        of their prefixes match the message.
+        """
+        return [service for service, _ in self._lookup(message)]
+
+    def decode(self,
+               message: bytes | bytearray,
+               request: bytes | bytearray | None = None) -> list[Message]:
+        """Decode a message using all candidate services
+
+        If a request is specified, the candidate services are
+        determined using the request instead of the message itself.
+        """
+        candidates = self._lookup(message if request is None else request)
+
+        decoded_messages: list[Message] = []
+        # the global negative responses do not depend on the service,
+        # so they are only decoded once
+        decoded_gnrs: list[tuple[Response, ParameterValueDict]] | None = None
+        for service, coding_object_prefixes in candidates:
+            coding_objects = [
+                coding_object for prefix, coding_object in coding_object_prefixes
+                if message.startswith(prefix)
+            ]
+            try:
+                decoded_messages.append(service._decode_message_using(message, coding_objects))
+            except DecodeError as e:
+                # check if the message can be decoded as a global
+                # negative response for the service
+                if decoded_gnrs is None:
+                    decoded_gnrs = self._decode_global_negative_responses(message)
+
+                if not decoded_gnrs:
+                    raise e
+
+                for gnr, decoded_gnr in decoded_gnrs:
+                    decoded_messages.append(
+                        Message(
+                            coded_message=bytes(message),
+                            service=service,
+                            coding_object=gnr,
+                            param_dict=decoded_gnr))
+
+        if len(decoded_messages) == 0:
+            raise DecodeError(
+                f"None of the services {[x.short_name for x, _ in candidates]} could parse {message.hex()}."
+            )
+
+        return decoded_messages
+
+    def _message_ref(self, message: Message) -> MessageRef:
+        """Return a compact representation of a decoded message which
+        does not contain any references to the database
+
+        This is used to transfer decoded messages between processes.
+        """
+        for service_idx in self._service_indices.get(message.service.short_name, []):
+            service, coding_object_prefixes = self._services[service_idx]
+            if service is not message.service:
+                continue
+            elif message.coding_object is None:
+                return service_idx, None, message.param_dict
+
+            coding_objects = [x for _, x in coding_object_prefixes]
+            coding_objects += self._global_negative_responses
+            for coding_object_idx, coding_object in enumerate(coding_objects):
+                if coding_object is message.coding_object:
+                    return service_idx, coding_object_idx, message.param_dict
+
+        raise ValueError(f"Message {message} has not been decoded by the dispatcher")
+
+    def _restore_message(self, coded_message: bytes, message_ref: MessageRef) -> Message:
+        """Reconstruct a message from the result of `_message_ref()`"""
+        service_idx, coding_object_idx, param_dict = message_ref
+        service, coding_object_prefixes = self._services[service_idx]
+
+        if coding_object_idx is None:
+            return Message(
+                coded_message=coded_message,
+                service=service,
+                coding_object=None,  # type: ignore[arg-type]
+                param_dict=param_dict)
+
+        coding_objects = [x for _, x in coding_object_prefixes]
+        coding_objects += self._global_negative_responses
+
+        return Message(
+            coded_message=coded_message,
+            service=service,
+            coding_object=coding_objects[coding_object_idx],
+            param_dict=param_dict)
+
+    def _decode_global_negative_responses(self, message: bytes | bytearray
+                                         ) -> list[tuple[Response, ParameterValueDict]]:
+        result: list[tuple[Response, ParameterValueDict]] = []
+        for gnr in self._global_negative_responses:
+            try:
+                decoded_gnr = gnr.decode(message)
+            except DecodeError:
+                continue
+
+            if not isinstance(decoded_gnr, dict):
+                odxraise(
+                    f"Expected the decoded value of a global "
+                    f"negative response to be a dictionary, "
+                    f"got {type(decoded_gnr)}", DecodeError)
+                continue
+
+            result.append((gnr, decoded_gnr))
+
+        return result
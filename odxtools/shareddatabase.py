@@ -0,0 +1,348 @@
+# SPDX-License-Identifier: MIT
+import io
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from os import PathLike
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Union
+
+from .database import Database
+from .diaglayers.diaglayer import DiagLayer
+from .diaglayers.hierarchyelement import HierarchyElement
+from .nameditemlist import NamedItemList
+from .odxlink import OdxLinkId
+from .version import __version__
+
+#: Magic string which is written at the beginning of each shared
+#: database file. The last character is the version of the format.
+SHARED_DATABASE_MAGIC = b"ODXTOOLS-SHARED-DB-2\n"
+
+# the length of the pickled index of the file is stored as a 64 bit
+# unsigned integer
+_INDEX_LENGTH_FORMAT = "<Q"
+
+#: Reference to an object of a different unit: the index of the unit
+#: and the ODXLINK ID of the object
+_UnitObjectRef = tuple[int, OdxLinkId]
+
+
+class _UnitPickler(pickle.Pickler):
+    """Pickler for the units of a shared database
+
+    Objects which are owned by a unit that is not part of the pickled
+    payload are not pickled, but replaced by a reference to their
+    owner. The units which are referred to this way are recorded in
+    `dependencies`.
+    """
+
+    def __init__(self, file: io.BytesIO, unit_indices: set[int],
+                 object_owners: dict[int, _UnitObjectRef]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._unit_indices = unit_indices
+        self._object_owners = object_owners
+        self.dependencies: set[int] = set()
+
+    def persistent_id(self, obj: Any) -> _UnitObjectRef | None:
+        owner = self._object_owners.get(id(obj))
+        if owner is None or owner[0] in self._unit_indices:
+            return None
+
+        self.dependencies.add(owner[0])
+        return owner
+
+
+class _UnitUnpickler(pickle.Unpickler):
+
+    def __init__(self, file: io.BytesIO, shared_database: "SharedDatabase") -> None:
+        super().__init__(file)
+        self._shared_database = shared_database
+
+    def persistent_load(self, pid: Any) -> Any:
+        unit_idx, odx_id = pid
+        return self._shared_database._get_unit_objects(unit_idx)[odx_id]
+
+
+def _pickle_units(units: list[Any], unit_indices: list[int],
+                  object_owners: dict[int, _UnitObjectRef]) -> tuple[bytes, set[int]]:
+    """Pickle a group of units
+
+    A single unit is pickled as is, multiple units are pickled as a
+    list. The result is the payload and the indices of the units
+    which the group refers to.
+    """
+    buf = io.BytesIO()
+    pickler = _UnitPickler(buf, set(unit_indices), object_owners)
+    if len(unit_indices) == 1:
+        pickler.dump(units[unit_indices[0]])
+    else:
+        pickler.dump([units[x] for x in unit_indices])
+
+    return buf.getvalue(), pickler.dependencies
+
+
+def _group_units(dependencies: list[set[int]]) -> list[list[int]]:
+    """Group the units which depend on each other
+
+    The groups are the strongly connected components of the
+    dependency graph of the units, which are determined using
+    Tarjan's algorithm. Each group only depends on the groups which
+    come before it.
+    """
+    indices: dict[int, int] = {}
+    low_links: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    groups: list[list[int]] = []
+
+    def visit(unit_idx: int) -> None:
+        indices[unit_idx] = low_links[unit_idx] = len(indices)
+        stack.append(unit_idx)
+        on_stack.add(unit_idx)
+
+    for root in range(len(dependencies)):
+        if root in indices:
+            continue
+
+        # the depth-first search is done iteratively because
+        # dependency chains may be long. For each unit on the search
+        # path, the dependencies which remain to be visited are kept.
+        visit(root)
+        work = [(root, iter(dependencies[root]))]
+        while work:
+            unit_idx, remaining_deps = work[-1]
+            for dep in remaining_deps:
+                if dep not in indices:
+                    visit(dep)
+                    work.append((dep, iter(dependencies[dep])))
+                    break
+                elif dep in on_stack:
+                    low_links[unit_idx] = min(low_links[unit_idx], indices[dep])
+            else:
+                work.pop()
+                if work:
+                    parent_idx = work[-1][0]
+                    low_links[parent_idx] = min(low_links[parent_idx], low_links[unit_idx])
+
+                if low_links[unit_idx] == indices[unit_idx]:
+                    group: list[int] = []
+                    while not group or group[-1] != unit_idx:
+                        group.append(stack.pop())
+                        on_stack.discard(group[-1])
+                    groups.append(sorted(group))
+
+    return groups
+
+
+def write_shared_database(database: Database, file_name: Union[str, "PathLike[Any]"]) -> None:
+    """Write a database to a file that can be shared by multiple
+    processes
+
+    In contrast to database snapshots, the diagnostic layers of
+    shared databases are stored separately and are only restored if
+    they are accessed (cf. `SharedDatabase`). All diagnostic layers
+    of the database are finalized before they are written.
+
+    The file is written atomically, i.e., concurrent readers either
+    see the complete file or no file at all.
+    """
+    for dl in database.diag_layers:
+        if isinstance(dl, HierarchyElement):
+            dl._ensure_finalized()
+
+    units: list[Any] = [*database.comparam_subsets, *database.comparam_specs, *database.diag_layers]
+
+    # map from the identities of all objects that exhibit an ODXLINK
+    # ID to the unit which owns them
+    object_owners: dict[int, _UnitObjectRef] = {}
+    for unit_idx, unit in enumerate(units):
+        for odx_id, obj in unit._build_odxlinks().items():
+            object_owners.setdefault(id(obj), (unit_idx, odx_id))
+
+    # units may refer to the objects of any other unit (e.g., the
+    # services of a base variant may refer to the state charts of an
+    # ECU variant which in turn refers to the inherited services).
+    # Since the references between payloads must be acyclic, units
+    # which depend on each other are stored as a single payload.
+    payloads: list[bytes] = []
+    dependencies: list[set[int]] = []
+    for unit_idx in range(len(units)):
+        payload, unit_dependencies = _pickle_units(units, [unit_idx], object_owners)
+        payloads.append(payload)
+        dependencies.append(unit_dependencies)
+
+    groups = _group_units(dependencies)
+    group_payloads = [
+        payloads[group[0]] if len(group) == 1 else _pickle_units(units, group, object_owners)[0]
+        for group in groups
+    ]
+
+    # the index of the file: for each unit, its short name, whether
+    # it is a diagnostic layer and the index of its group, and for
+    # each group, the indices of its units as well as the offset and
+    # size of its payload relative to the end of the index
+    unit_index: list[tuple[str, bool, int]] = [("", False, -1)] * len(units)
+    group_index: list[tuple[list[int], int, int]] = []
+    offset = 0
+    for group_idx, (group, payload) in enumerate(zip(groups, group_payloads, strict=True)):
+        for unit_idx in group:
+            unit = units[unit_idx]
+            unit_index[unit_idx] = (unit.short_name, isinstance(unit, DiagLayer), group_idx)
+        group_index.append((group, offset, len(payload)))
+        offset += len(payload)
+    pickled_index = pickle.dumps((unit_index, group_index), protocol=pickle.HIGHEST_PROTOCOL)
+
+    out_path = Path(file_name)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=out_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(SHARED_DATABASE_MAGIC)
+            f.write(__version__.encode() + b"\n")
+            f.write(struct.pack(_INDEX_LENGTH_FORMAT, len(pickled_index)))
+            f.write(pickled_index)
+            for payload in group_payloads:
+                f.write(payload)
+        os.replace(tmp_name, out_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class SharedDatabase:
+    """Read-only view of a database that is shared by multiple
+    processes
+
+    The database is written once using `write_shared_database()`,
+    and the resulting file is then memory mapped by all processes
+    that use it. Diagnostic layers are only restored if they are
+    accessed for the first time, i.e., the private memory required
+    by each process only covers the layers it actually uses. (The
+    file itself is kept by the page cache of the operating system
+    exactly once. For databases that shall not be stored
+    persistently, place the file in a RAM-based file system like
+    `/dev/shm`.)
+
+    This class is supposed to be used like this:
+
+    # parent process
+    db = odxtools.load_pdx_file("my_cool_diagnostics_db.pdx")
+    write_shared_database(db, "/dev/shm/my_cool_diagnostics_db.odxshared")
+
+    # worker processes
+    with SharedDatabase("/dev/shm/my_cool_diagnostics_db.odxshared") as shared_db:
+        messages = shared_db.get_diag_layer("my_ecu").decode(bytes([0x22, 0xf1, 0x90]))
+    """
+
+    def __init__(self, file_name: Union[str, "PathLike[Any]"]) -> None:
+        self._file_name = str(file_name)
+        self._open()
+
+    def _open(self) -> None:
+        with open(self._file_name, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buf = self._mmap
+        pos = 0
+        for expected_line in (SHARED_DATABASE_MAGIC, __version__.encode() + b"\n"):
+            if buf[pos:pos + len(expected_line)] != expected_line:
+                self._mmap.close()
+                raise ValueError(f"File '{self._file_name}' is not a shared database "
+                                 f"written by odxtools {__version__}")
+            pos += len(expected_line)
+
+        index_len = struct.unpack_from(_INDEX_LENGTH_FORMAT, buf, pos)[0]
+        pos += struct.calcsize(_INDEX_LENGTH_FORMAT)
+        self._unit_index: list[tuple[str, bool, int]]
+        self._group_index: list[tuple[list[int], int, int]]
+        self._unit_index, self._group_index = pickle.loads(buf[pos:pos + index_len])
+        self._payload_offset = pos + index_len
+
+        self._diag_layer_indices = {
+            short_name: unit_idx
+            for unit_idx, (short_name, is_diag_layer, _) in enumerate(self._unit_index)
+            if is_diag_layer
+        }
+        self._units: dict[int, Any] = {}
+        self._unit_objects: dict[int, dict[OdxLinkId, Any]] = {}
+
+    def close(self) -> None:
+        """Release the memory map of the shared file
+
+        Diagnostic layers which have already been restored remain
+        usable, but no further layers can be restored.
+        """
+        self._mmap.close()
+
+    def __enter__(self) -> "SharedDatabase":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # shared databases are transferred to other processes by
+        # mapping the same file again
+        return {"file_name": self._file_name}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._file_name = state["file_name"]
+        self._open()
+
+    @property
+    def diag_layer_names(self) -> list[str]:
+        """The short names of all diagnostic layers of the database"""
+        return list(self._diag_layer_indices)
+
+    @property
+    def diag_layers(self) -> NamedItemList[DiagLayer]:
+        """All diagnostic layers of the database
+
+        Note that this restores all layers of the database.
+        """
+        return NamedItemList(self.get_diag_layer(x) for x in self._diag_layer_indices)
+
+    def get_diag_layer(self, short_name: str) -> DiagLayer:
+        """Return a diagnostic layer of the database
+
+        The layer is restored from the shared file if it is accessed
+        for the first time.
+        """
+        unit_idx = self._diag_layer_indices.get(short_name)
+        if unit_idx is None:
+            raise KeyError(f"Shared database does not contain a diagnostic layer "
+                           f"named '{short_name}'")
+
+        result = self._get_unit(unit_idx)
+        if not isinstance(result, DiagLayer):
+            raise TypeError(f"Unit '{short_name}' of the shared database is not a "
+                            f"diagnostic layer")
+        return result
+
+    def _get_unit(self, unit_idx: int) -> Any:
+        unit = self._units.get(unit_idx)
+        if unit is None:
+            # restore the group of units which contains the unit
+            group, offset, size = self._group_index[self._unit_index[unit_idx][2]]
+            offset += self._payload_offset
+            with memoryview(self._mmap)[offset:offset + size] as payload:
+                result = _UnitUnpickler(io.BytesIO(payload), self).load()
+            group_units = [result] if len(group) == 1 else result
+            for group_unit_idx, group_unit in zip(group, group_units, strict=True):
+                self._units[group_unit_idx] = group_unit
+            unit = self._units[unit_idx]
+
+        return unit
+
+    def _get_unit_objects(self, unit_idx: int) -> dict[OdxLinkId, Any]:
+        unit_objects = self._unit_objects.get(unit_idx)
+        if unit_objects is None:
+            unit_objects = self._get_unit(unit_idx)._build_odxlinks()
+            self._unit_objects[unit_idx] = unit_objects
+
+        return unit_objects
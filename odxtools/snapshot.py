@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: MIT
+import hashlib
+import os
+import pickle
+import tempfile
+from os import PathLike
+from pathlib import Path
+from typing import Any, Union
+
+from .database import Database
+from .globals import logger
+from .version import __version__
+
+#: Magic string which is written at the beginning of each snapshot
+#: file. The last character is the version of the snapshot format.
+SNAPSHOT_MAGIC = b"ODXTOOLS-DB-SNAPSHOT-1\n"
+
+
+def pdx_snapshot_key(pdx_file: Union[str, "PathLike[Any]"]) -> str:
+    """Compute the key of the database snapshot for a PDX file
+
+    The key is derived from the content of the PDX file and the
+    version of odxtools, i.e., it changes if either of these changes.
+    """
+    h = hashlib.sha256()
+    h.update(__version__.encode())
+    h.update(b"\0")
+    with open(pdx_file, "rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+
+    return h.hexdigest()
+
+
+def save_database_snapshot(database: Database, snapshot_file: Union[str, "PathLike[Any]"]) -> None:
+    """Write a fully refreshed database to a snapshot file
+
+    The file is written atomically, i.e., concurrent readers either
+    see the complete snapshot or no snapshot at all.
+    """
+    snapshot_path = Path(snapshot_file)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=snapshot_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(__version__.encode() + b"\n")
+            pickle.dump(database, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, snapshot_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def load_database_snapshot(snapshot_file: Union[str, "PathLike[Any]"]) -> Database | None:
+    """Restore a database from a snapshot file
+
+    The returned database is ready to be used, i.e., calling
+    `refresh()` is not required. If the snapshot file does not exist,
+    or if it has been written by a different version of odxtools,
+    `None` is returned.
+    """
+    try:
+        f = open(snapshot_file, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        if f.readline() != SNAPSHOT_MAGIC:
+            logger.warning(f"File '{snapshot_file}' is not a database snapshot")
+            return None
+
+        if f.readline() != __version__.encode() + b"\n":
+            # snapshot has been written by a different version of
+            # odxtools
+            return None
+
+        try:
+            database = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Could not restore database snapshot '{snapshot_file}': {e}")
+            return None
+
+    if not isinstance(database, Database):
+        logger.warning(f"Snapshot file '{snapshot_file}' does not contain a database")
+        return None
+
+    return database
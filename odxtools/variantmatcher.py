@@ -1,14 +1,29 @@
 # SPDX-License-Identifier: MIT
-from collections.abc import Generator
+import asyncio
+from collections.abc import Awaitable, Callable, Generator, Hashable, Mapping
 from copy import copy
 from enum import Enum
+from typing import TypeVar
 
 from .diaglayers.basevariant import BaseVariant
 from .diaglayers.ecuvariant import EcuVariant
+from .diagservice import DiagService
 from .exceptions import DecodeError, odxraise
 from .matchingparameter import MatchingParameter
 from .response import Response
 
+#: Asynchronous callback which sends an identification request to an
+#: ECU and returns its response. The first argument specifies whether
+#: physical addressing ought to be used, the second one is the
+#: encoded request.
+IdentTransport = Callable[[bool, bytes], Awaitable[bytes]]
+
+#: Cache of the encoded identification requests, keyed by the
+#: identity of the identification service
+IdentRequestCache = dict[int, tuple[DiagService, bytes]]
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+
 
 class VariantMatcher:
     """VariantMatcher implements the matching algorithm of ECU and
@@ -45,6 +60,11 @@ class VariantMatcher:
         print("No matching base- or ECU variant found")
     ```
 
+    If the ECU is reachable via an asynchronous transport, the
+    request loop can alternatively be run using
+    `await matcher.async_request_loop(transport)`. To identify many
+    ECUs concurrently, use `identify_variants()`.
+
     TODO: Note that only patterns that exclusivly reference diagnostic
     services (i.e., no single-ECU jobs) in their matching parameters
     are currently supported.
@@ -57,11 +77,21 @@ class VariantMatcher:
 
     def __init__(self,
                  variant_candidates: list[EcuVariant] | list[BaseVariant],
-                 use_cache: bool = True):
+                 use_cache: bool = True,
+                 *,
+                 req_resp_cache: dict[bytes, bytes] | None = None,
+                 ident_request_cache: IdentRequestCache | None = None):
 
         self.variant_candidates = variant_candidates
         self.use_cache = use_cache
-        self.req_resp_cache: dict[bytes, bytes] = {}
+        # the responses of the ECU to the identification
+        # requests. This may be shared by all matchers of the same
+        # ECU, e.g., for base and ECU variant matching.
+        self.req_resp_cache: dict[bytes, bytes] = {} if req_resp_cache is None else req_resp_cache
+        # the encoded identification requests. Since these do not
+        # depend on the ECU, this may be shared by any matchers.
+        self._ident_request_cache: IdentRequestCache = ({} if ident_request_cache is None else
+                                                        ident_request_cache)
         self._recent_ident_response: bytes | None = None
 
         self._state = VariantMatcher.State.PENDING
@@ -104,7 +134,7 @@ class VariantMatcher:
             for pattern in variant_patterns:
                 all_params_match = True
                 for matching_param in pattern.get_matching_parameters():
-                    req_bytes = matching_param.get_ident_service(variant).encode_request()
+                    req_bytes = self._get_ident_request(variant, matching_param)
 
                     if self.use_cache and req_bytes in self.req_resp_cache:
                         resp_values = copy(bytes(self.req_resp_cache[bytes(req_bytes)]))
@@ -135,6 +165,17 @@ class VariantMatcher:
             # no pattern has matched for any ecu variant
             self._state = VariantMatcher.State.NO_MATCH
 
+    async def async_request_loop(self, transport: IdentTransport) -> None:
+        """Run the request loop using an asynchronous transport
+
+        Each request yielded by `request_loop()` is sent using
+        `transport` and the response is evaluated. Other tasks, e.g.,
+        the identification of other ECUs, can run while waiting for
+        the response.
+        """
+        for use_physical_addressing, req_bytes in self.request_loop():
+            self.evaluate(await transport(use_physical_addressing, req_bytes))
+
     def evaluate(self, resp_bytes: bytes) -> None:
         """Update the matcher with the response to a requst.
 
@@ -198,6 +239,18 @@ class VariantMatcher:
 
         return False
 
+    def _get_ident_request(self, variant: EcuVariant | BaseVariant,
+                           matching_param: MatchingParameter) -> bytes:
+        service = matching_param.get_ident_service(variant)
+        cache_entry = self._ident_request_cache.get(id(service))
+        if cache_entry is None:
+            # the service is stored alongside its encoded request to
+            # make sure that its identity is not reused
+            cache_entry = (service, bytes(service.encode_request()))
+            self._ident_request_cache[id(service)] = cache_entry
+
+        return cache_entry[1]
+
     def _update_cache(self, req_bytes: bytes, resp_bytes: bytes) -> None:
         if self.use_cache:
             self.req_resp_cache[req_bytes] = resp_bytes
@@ -207,3 +260,33 @@ class VariantMatcher:
             raise RuntimeError(
                 "No response available. Did you forget to call 'evaluate()' in a loop?")
         return self._recent_ident_response
+
+
+async def identify_variants(
+    ecus: Mapping[KeyT, tuple[list[EcuVariant] | list[BaseVariant], IdentTransport]],
+    use_cache: bool = True,
+) -> dict[KeyT, EcuVariant | BaseVariant | None]:
+    """Identify the variants of many ECUs concurrently
+
+    `ecus` maps an arbitrary key for each ECU to its variant
+    candidates and the transport used to communicate with it. The
+    request loops of all ECUs are run concurrently, i.e., the total
+    time required is roughly that of the slowest ECU. Within each
+    ECU, the requests are sent one after another and identical
+    requests of different candidate variants are only sent once.
+
+    The result maps the key of each ECU to the matching variant or
+    to `None` if no variant matches.
+    """
+    ident_request_cache: IdentRequestCache = {}
+    matchers = {
+        key:
+            VariantMatcher(
+                candidates, use_cache=use_cache, ident_request_cache=ident_request_cache)
+        for key, (candidates, _) in ecus.items()
+    }
+
+    await asyncio.gather(
+        *(matchers[key].async_request_loop(transport) for key, (_, transport) in ecus.items()))
+
+    return {key: matcher.matching_variant for key, matcher in matchers.items()}
@@ -1,14 +1,22 @@
 # SPDX-License-Identifier: MIT
 
+import json
+import tempfile
 import unittest
-from argparse import Namespace
+from argparse import ArgumentTypeError, Namespace
+from pathlib import Path
 from types import ModuleType
 from unittest.mock import MagicMock, patch
 
+import can
+
+import odxtools.cli._parser_utils as _parser_utils
 import odxtools.cli.compare as compare
 import odxtools.cli.decode as decode
+import odxtools.cli.decode_trace as decode_trace
 import odxtools.cli.find as find
 import odxtools.cli.list as list_tool
+from odxtools.loadfile import load_pdx_file
 
 browse: ModuleType | None
 try:
@@ -128,6 +136,98 @@ class TestCommandLineTools(unittest.TestCase):
         ])
         UtilFunctions.run_compare_tool(ecu_variants=["somersault_lazy", "somersault_assiduous"])
 
+    def test_decode_trace_tool(self) -> None:
+        messages = [
+            # tester present request and response
+            can.Message(timestamp=1.0, arbitration_id=0x123, data=bytes.fromhex("023e00")),
+            can.Message(timestamp=1.1, arbitration_id=0x456, data=bytes.fromhex("027e00")),
+            # frame of an unrelated ECU
+            can.Message(timestamp=1.2, arbitration_id=0x789, data=bytes.fromhex("023e00")),
+            # unknown service
+            can.Message(timestamp=1.3, arbitration_id=0x123, data=bytes.fromhex("01ff")),
+        ]
+
+        with tempfile.TemporaryDirectory() as trace_dir:
+            trace_file = Path(trace_dir) / "trace.blf"
+            with can.Logger(trace_file) as logger:
+                for msg in messages:
+                    logger.on_message_received(msg)
+
+            for jobs in (1, 2):
+                output_file = Path(trace_dir) / f"decoded_{jobs}.jsonl"
+                decode_trace.run(
+                    Namespace(
+                        pdx_file="./examples/somersault.pdx",
+                        trace=str(trace_file),
+                        trace_format="python-can",
+                        ecu=[_parser_utils.parse_ecu_spec("0x123:0x456:somersault_lazy")],
+                        protocol=None,
+                        output=str(output_file),
+                        output_format="jsonl",
+                        jobs=jobs))
+
+                records = [json.loads(x) for x in output_file.read_text().splitlines()]
+                self.assertEqual([x["direction"] for x in records],
+                                 ["request", "response", "request"])
+                self.assertEqual(records[0]["decodings"][0]["service"], "tester_present")
+                self.assertEqual(records[1]["decodings"][0]["service"], "tester_present")
+                self.assertEqual(records[1]["payload"], "7e00")
+                self.assertIsNone(records[1]["error"])
+                self.assertIsNotNone(records[2]["error"])
+
+    def test_decode_trace_tool_default_ecus(self) -> None:
+        # the ECU variants of the somersault ECU share their CAN IDs,
+        # so their base variant is used for decoding
+        ecus = decode_trace.get_default_ecus(load_pdx_file("./examples/somersault.pdx"))
+        self.assertEqual([(x.diag_layer.short_name, x.rx_id, x.tx_id) for x in ecus],
+                         [("somersault_base_variant", 0x7b, 0x1c8)])
+
+        messages = [
+            can.Message(timestamp=1.0, arbitration_id=0x7b, data=bytes.fromhex("023e00")),
+            can.Message(timestamp=1.1, arbitration_id=0x1c8, data=bytes.fromhex("027e00")),
+        ]
+
+        with tempfile.TemporaryDirectory() as trace_dir:
+            trace_file = Path(trace_dir) / "trace.blf"
+            with can.Logger(trace_file) as logger:
+                for msg in messages:
+                    logger.on_message_received(msg)
+
+            output_file = Path(trace_dir) / "decoded.jsonl"
+            args = Namespace(
+                pdx_file="./examples/somersault.pdx",
+                trace=str(trace_file),
+                trace_format="python-can",
+                ecu=None,
+                protocol=None,
+                output=str(output_file),
+                output_format="jsonl",
+                jobs=1)
+            decode_trace.run(args)
+
+            records = [json.loads(x) for x in output_file.read_text().splitlines()]
+            self.assertEqual([x["ecu"] for x in records],
+                             ["somersault_base_variant", "somersault_base_variant"])
+            self.assertEqual([x["decodings"][0]["service"] for x in records],
+                             ["tester_present", "tester_present"])
+
+            # errors which occur while reading the trace are not
+            # reported as ambiguous CAN IDs
+            empty_trace_file = Path(trace_dir) / "trace.raw"
+            empty_trace_file.touch()
+            args.trace = str(empty_trace_file)
+            args.trace_format = "socketcan"
+            with self.assertRaises(ValueError):
+                decode_trace.run(args)
+
+    def test_parse_ecu_spec(self) -> None:
+        self.assertEqual(
+            _parser_utils.parse_ecu_spec("0x7e0:2024:somersault_lazy"),
+            (0x7e0, 2024, "somersault_lazy"))
+        for spec in ["0x7e0", "0x7e0:0x7e8", "0x7e0:0x7e8:", "rx:0x7e8:somersault_lazy"]:
+            with self.assertRaises(ArgumentTypeError):
+                _parser_utils.parse_ecu_spec(spec)
+
     @unittest.skipIf(browse is None, "importing the browse tool failed")
     # browse is an interactive tool, so we need to mock a few
     # functions to make PyInquirer reliably bail out
@@ -2,12 +2,16 @@
 import inspect
 import os
 import unittest
+from types import ModuleType
+from typing import Any, cast
+from unittest.mock import patch
 from xml.etree import ElementTree
 
 import jinja2
 from packaging.version import Version
 
 import odxtools
+from odxtools.compumethods.arrayconversion import ArrayConversionResult
 from odxtools.compumethods.compucategory import CompuCategory
 from odxtools.compumethods.compucodecompumethod import CompuCodeCompuMethod
 from odxtools.compumethods.compuconst import CompuConst
@@ -20,8 +24,10 @@ from odxtools.compumethods.intervaltype import IntervalType
 from odxtools.compumethods.limit import Limit
 from odxtools.compumethods.linearcompumethod import LinearCompuMethod
 from odxtools.compumethods.ratfunccompumethod import RatFuncCompuMethod
+from odxtools.compumethods.scalelinearcompumethod import ScaleLinearCompuMethod
 from odxtools.compumethods.scaleratfunccompumethod import ScaleRatFuncCompuMethod
 from odxtools.compumethods.tabintpcompumethod import TabIntpCompuMethod
+from odxtools.compumethods.texttablecompumethod import TexttableCompuMethod
 from odxtools.exceptions import DecodeError, EncodeError, OdxError
 from odxtools.odxdoccontext import OdxDocContext
 from odxtools.odxlink import DocType, OdxDocFragment
@@ -29,9 +35,20 @@ from odxtools.odxtypes import DataType
 from odxtools.progcode import ProgCode
 from odxtools.writepdxfile import jinja2_odxraise_helper, make_bool_xml_attrib, make_xml_attrib
 
+np: ModuleType | None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 doc_frags = (OdxDocFragment("UnitTest", DocType.CONTAINER),)
 
 
+def as_list(values: ArrayConversionResult) -> list[Any]:
+    assert np is not None and isinstance(values, np.ndarray)
+    return cast(list[Any], values.tolist())
+
+
 class TestLinearCompuMethod(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -275,6 +292,33 @@ class TestLinearCompuMethod(unittest.TestCase):
         self.assertEqual(compu_method.convert_internal_to_physical(4), 21)
         self.assertEqual(compu_method.convert_physical_to_internal(21), 4)
 
+    @unittest.skipIf(np is None, "NumPy is not available")
+    def test_linear_compu_method_convert_arrays(self) -> None:
+        method = self.linear_compumethod
+
+        # values exactly between two integers are rounded like round()
+        # does, i.e., "half to even"
+        internal_values = [0, 1799, 1800, 1801, 5400, 7200, 9000, -1800, -5400]
+        physical_values = method.convert_internal_to_physical_array(internal_values)
+        assert np is not None and isinstance(physical_values, np.ndarray)
+        self.assertEqual(
+            as_list(physical_values),
+            [method.convert_internal_to_physical(x) for x in internal_values])
+
+        physical_values = [0, 1, 2, -3]
+        self.assertEqual(
+            as_list(method.convert_physical_to_internal_array(physical_values)),
+            [method.convert_physical_to_internal(x) for x in physical_values])
+
+        # the result is the same without NumPy, albeit as a list
+        with patch("odxtools.compumethods.compumethod.HAVE_NUMPY", False):
+            self.assertEqual(
+                method.convert_physical_to_internal_array(iter(physical_values)),
+                [0, 3600, 7200, -10800])
+
+        # integer compu methods cannot convert floating point numbers
+        self.assertRaises(DecodeError, method.convert_internal_to_physical_array, [1.0, 2.0])
+
     def test_linear_compu_method_physical_limits(self) -> None:
         # Define decoding function: f: (2, 15] -> [-74, -14], f(x) = -5*x + 1
         compu_method = LinearCompuMethod(
@@ -336,6 +380,68 @@ class TestLinearCompuMethod(unittest.TestCase):
         self.assertFalse(compu_method.is_valid_physical_value(-9))
 
 
+class TestScaleLinearCompuMethod(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # f(x) = 2*x for x in [0, 10), f(x) = x + 10 for x in [10, 20]
+        self.compu_method = ScaleLinearCompuMethod(
+            category=CompuCategory.SCALE_LINEAR,
+            compu_internal_to_phys=CompuInternalToPhys(compu_scales=[
+                CompuScale(
+                    lower_limit=Limit(value_raw="0", value_type=DataType.A_INT32),
+                    upper_limit=Limit(
+                        value_raw="10",
+                        value_type=DataType.A_INT32,
+                        interval_type=IntervalType.OPEN),
+                    compu_rational_coeffs=CompuRationalCoeffs(
+                        value_type=DataType.A_INT32,
+                        numerators=[0, 2],
+                        denominators=[1],
+                    ),
+                    domain_type=DataType.A_INT32,
+                    range_type=DataType.A_INT32),
+                CompuScale(
+                    lower_limit=Limit(value_raw="10", value_type=DataType.A_INT32),
+                    upper_limit=Limit(value_raw="20", value_type=DataType.A_INT32),
+                    compu_rational_coeffs=CompuRationalCoeffs(
+                        value_type=DataType.A_INT32,
+                        numerators=[10, 1],
+                        denominators=[1],
+                    ),
+                    domain_type=DataType.A_INT32,
+                    range_type=DataType.A_INT32),
+            ]),
+            internal_type=DataType.A_INT32,
+            physical_type=DataType.A_INT32)
+
+    def test_scale_linear_compu_method(self) -> None:
+        self.assertEqual(self.compu_method.convert_internal_to_physical(0), 0)
+        self.assertEqual(self.compu_method.convert_internal_to_physical(9), 18)
+        self.assertEqual(self.compu_method.convert_internal_to_physical(10), 20)
+        self.assertEqual(self.compu_method.convert_internal_to_physical(20), 30)
+        self.assertRaises(DecodeError, self.compu_method.convert_internal_to_physical, 21)
+
+    @unittest.skipIf(np is None, "NumPy is not available")
+    def test_scale_linear_compu_method_convert_arrays(self) -> None:
+        method = self.compu_method
+
+        internal_values = list(range(21))
+        physical_values = method.convert_internal_to_physical_array(internal_values)
+        assert np is not None and isinstance(physical_values, np.ndarray)
+        self.assertEqual(physical_values.dtype.kind, "i")
+        self.assertEqual(
+            as_list(physical_values),
+            [method.convert_internal_to_physical(x) for x in internal_values])
+
+        # multi-dimensional arrays keep their shape
+        self.assertEqual(
+            as_list(method.convert_internal_to_physical_array(np.array([[1, 11], [2, 12]]))),
+            [[2, 21], [4, 22]])
+
+        self.assertRaises(DecodeError, method.convert_internal_to_physical_array, [5, 21])
+        self.assertRaises(DecodeError, method.convert_internal_to_physical_array, [1.5])
+
+
 class TestCompuCodeCompuMethod(unittest.TestCase):
 
     def test_compu_code_compu_method(self) -> None:
@@ -618,6 +724,92 @@ class TestScaleRatFuncCompuMethod(unittest.TestCase):
         with self.assertRaises(DecodeError):
             compu_method.convert_internal_to_physical(9.01)
 
+        if np is not None:
+            internal_values = [2, 2.5, 3, 4, 4.5, 5]
+            self.assertEqual(
+                as_list(compu_method.convert_internal_to_physical_array(internal_values)),
+                [compu_method.convert_internal_to_physical(x) for x in internal_values])
+            physical_values = [4, 6.25, 9, 22, 25]
+            self.assertEqual(
+                as_list(compu_method.convert_physical_to_internal_array(physical_values)),
+                [compu_method.convert_physical_to_internal(x) for x in physical_values])
+            self.assertRaises(DecodeError, compu_method.convert_internal_to_physical_array,
+                              [2, 3.99])
+
+
+class TestTexttableCompuMethod(unittest.TestCase):
+
+    def _make_scale(self, lower: str | None, upper: str | None, text: str) -> CompuScale:
+        return CompuScale(
+            lower_limit=None if lower is None else Limit(
+                value_raw=lower, value_type=DataType.A_UINT32),
+            upper_limit=None if upper is None else Limit(
+                value_raw=upper, value_type=DataType.A_UINT32, interval_type=IntervalType.OPEN),
+            compu_const=CompuConst(vt=text, data_type=DataType.A_UNICODE2STRING),
+            domain_type=DataType.A_UINT32,
+            range_type=DataType.A_UNICODE2STRING)
+
+    def _make_compu_method(self, scales: list[CompuScale]) -> TexttableCompuMethod:
+        return TexttableCompuMethod(
+            category=CompuCategory.TEXTTABLE,
+            compu_internal_to_phys=CompuInternalToPhys(compu_scales=scales),
+            internal_type=DataType.A_UINT32,
+            physical_type=DataType.A_UNICODE2STRING)
+
+    def test_large_texttable(self) -> None:
+        # point scales for 0..999 and interval scales [1000 + 10*i, 1010 + 10*i)
+        scales = [self._make_scale(str(i), None, f"point_{i}") for i in range(1000)]
+        scales += [
+            self._make_scale(str(1000 + 10 * i), str(1010 + 10 * i), f"range_{i}")
+            for i in reversed(range(100))
+        ]
+        method = self._make_compu_method(scales)
+
+        self.assertEqual(method.convert_internal_to_physical(123), "point_123")
+        self.assertEqual(method.convert_internal_to_physical(1000), "range_0")
+        self.assertEqual(method.convert_internal_to_physical(1009), "range_0")
+        self.assertEqual(method.convert_internal_to_physical(1010), "range_1")
+        self.assertEqual(method.convert_internal_to_physical(1999), "range_99")
+        self.assertTrue(method.is_valid_internal_value(1555))
+        self.assertFalse(method.is_valid_internal_value(2000))
+        self.assertRaises(DecodeError, method.convert_internal_to_physical, 2000)
+
+        self.assertEqual(method.convert_physical_to_internal("point_42"), 42)
+        self.assertEqual(method.convert_physical_to_internal("range_3"), 1030)
+        self.assertTrue(method.is_valid_physical_value("range_99"))
+        self.assertFalse(method.is_valid_physical_value("range_100"))
+        self.assertRaises(EncodeError, method.convert_physical_to_internal, "range_100")
+
+    def test_overlapping_texttable(self) -> None:
+        method = self._make_compu_method([
+            self._make_scale("0", "10", "low"),
+            self._make_scale("5", "20", "high"),
+            self._make_scale("7", None, "seven"),
+            self._make_scale("30", None, "dup"),
+            self._make_scale("31", None, "dup"),
+        ])
+
+        self.assertEqual(method.convert_internal_to_physical(3), "low")
+        self.assertEqual(method.convert_internal_to_physical(15), "high")
+        self.assertRaises(DecodeError, method.convert_internal_to_physical, 6)
+        self.assertRaises(DecodeError, method.convert_internal_to_physical, 7)
+        self.assertRaises(EncodeError, method.convert_physical_to_internal, "dup")
+
+    @unittest.skipIf(np is None, "NumPy is not available")
+    def test_texttable_convert_arrays(self) -> None:
+        method = self._make_compu_method([
+            self._make_scale("0", "10", "low"),
+            self._make_scale("10", "20", "high"),
+        ])
+
+        self.assertEqual(
+            as_list(method.convert_internal_to_physical_array([3, 15, 3, 0, 19])),
+            ["low", "high", "low", "low", "high"])
+        self.assertEqual(
+            as_list(method.convert_physical_to_internal_array(["high", "low", "high"])),
+            [10, 0, 10])
+        self.assertRaises(DecodeError, method.convert_internal_to_physical_array, [3, 20])
+
 
 class TestTabIntpCompuMethod(unittest.TestCase):
 
@@ -716,6 +908,50 @@ class TestTabIntpCompuMethod(unittest.TestCase):
         self.assertRaises(EncodeError, method.convert_physical_to_internal, -2)
         self.assertRaises(EncodeError, method.convert_physical_to_internal, 2.1)
 
+    def test_tabintp_unsorted_points(self) -> None:
+        # if the interpolation is not monotonic, the first matching
+        # interval is used
+        method = TabIntpCompuMethod(
+            category=CompuCategory.TAB_INTP,
+            compu_internal_to_phys=CompuInternalToPhys(compu_scales=[
+                CompuScale(
+                    lower_limit=Limit(value_raw=internal, value_type=DataType.A_INT32),
+                    compu_const=CompuConst(v=physical, data_type=DataType.A_INT32),
+                    domain_type=DataType.A_INT32,
+                    range_type=DataType.A_INT32)
+                for internal, physical in [("0", "0"), ("10", "100"), ("20", "0")]
+            ]),
+            internal_type=DataType.A_INT32,
+            physical_type=DataType.A_FLOAT64,
+        )
+
+        self.assertEqual(method.convert_internal_to_physical(15), 50)
+        self.assertEqual(method.convert_physical_to_internal(50), 5)
+        self.assertEqual(method.convert_physical_to_internal(100), 10)
+        self.assertRaises(EncodeError, method.convert_physical_to_internal, 101)
+
+        if np is not None:
+            self.assertEqual(
+                as_list(method.convert_physical_to_internal_array([0, 50, 100])), [0, 5, 10])
+
+    @unittest.skipIf(np is None, "NumPy is not available")
+    def test_tabintp_convert_arrays(self) -> None:
+        assert np is not None
+        method = self.tab_intp_compumethod
+
+        internal_values = np.array([0, 2, 3, 5, 10, 20, 25, 30])
+        physical_values = method.convert_internal_to_physical_array(internal_values)
+        self.assertEqual(as_list(physical_values), [-1, -0.6, -0.4, 0, 1, 1.5, 1.75, 2])
+        self.assertEqual(
+            as_list(physical_values),
+            [method.convert_internal_to_physical(int(x)) for x in internal_values])
+        self.assertEqual(
+            as_list(method.convert_physical_to_internal_array(physical_values)),
+            internal_values.tolist())
+
+        self.assertRaises(DecodeError, method.convert_internal_to_physical_array, [0, 31])
+        self.assertRaises(EncodeError, method.convert_physical_to_internal_array, [-2])
+
     def test_read_odx(self) -> None:
         expected = self.tab_intp_compumethod
 
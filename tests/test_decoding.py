@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: MIT
 import pickle
 import unittest
+from types import ModuleType
+from unittest.mock import patch
 
 from odxtools.compumethods.compucategory import CompuCategory
 from odxtools.compumethods.compuinternaltophys import CompuInternalToPhys
@@ -9,6 +11,7 @@ from odxtools.compumethods.compuscale import CompuScale
 from odxtools.compumethods.identicalcompumethod import IdenticalCompuMethod
 from odxtools.compumethods.linearcompumethod import LinearCompuMethod
 from odxtools.database import Database
+from odxtools.decodestate import DecodeState
 from odxtools.dataobjectproperty import DataObjectProperty
 from odxtools.determinenumberofitems import DetermineNumberOfItems
 from odxtools.diagdatadictionaryspec import DiagDataDictionarySpec
@@ -24,7 +27,9 @@ from odxtools.dynamicendmarkerfield import DynamicEndmarkerField
 from odxtools.dynamiclengthfield import DynamicLengthField
 from odxtools.dynenddopref import DynEndDopRef
 from odxtools.endofpdufield import EndOfPduField
-from odxtools.exceptions import DecodeError, DecodeMismatch
+from odxtools.encodestate import EncodeState
+from odxtools.exceptions import DecodeError, DecodeMismatch, EncodeError
+from odxtools.linkeddtcdop import LinkedDtcDop
 from odxtools.message import Message
 from odxtools.minmaxlengthtype import MinMaxLengthType
 from odxtools.nameditemlist import NamedItemList
@@ -46,6 +51,12 @@ from odxtools.structure import Structure
 from odxtools.termination import Termination
 from odxtools.text import Text
 
+np: ModuleType | None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 doc_frags = (OdxDocFragment("UnitTest", DocType.CONTAINER),)
 
 
@@ -1308,6 +1319,93 @@ class TestDecoding(unittest.TestCase):
         actual_coded_message = pos_response.encode(coded_request=None, **expected_param_dict)
         self.assertEqual(actual_coded_message, expected_coded_message)
 
+    def test_code_linked_dtc(self) -> None:
+        odxlinks = OdxLinkDatabase()
+        diag_coded_type = StandardLengthType(
+            base_data_type=DataType.A_UINT32,
+            bit_length=16,
+        )
+        compu_method = IdenticalCompuMethod(
+            category=CompuCategory.IDENTICAL,
+            internal_type=DataType.A_UINT32,
+            physical_type=DataType.A_UINT32)
+
+        base_dop = DtcDop(
+            odx_id=OdxLinkId("base.dtc.dop", doc_frags),
+            short_name="base_dtc_dop",
+            diag_coded_type=diag_coded_type,
+            physical_type=PhysicalType(base_data_type=DataType.A_UINT32),
+            compu_method=compu_method,
+            dtcs_raw=[
+                DiagnosticTroubleCode(
+                    odx_id=OdxLinkId(f"base.dtc.{i}", doc_frags),
+                    short_name=f"base_dtc_{i}",
+                    trouble_code=i,
+                    text=Text.from_string(f"Error {i}"),
+                ) for i in range(1000)
+            ],
+        )
+        dop = DtcDop(
+            odx_id=OdxLinkId("dtc.dop", doc_frags),
+            short_name="dtc_dop",
+            diag_coded_type=diag_coded_type,
+            physical_type=PhysicalType(base_data_type=DataType.A_UINT32),
+            compu_method=compu_method,
+            dtcs_raw=[
+                DiagnosticTroubleCode(
+                    odx_id=OdxLinkId("local.dtc", doc_frags),
+                    short_name="local_dtc",
+                    trouble_code=0x1234,
+                    text=Text.from_string("Local error"),
+                )
+            ],
+            linked_dtc_dops_raw=[
+                LinkedDtcDop(
+                    dtc_dop_ref=OdxLinkRef.from_id(base_dop.odx_id),
+                    not_inherited_dtc_snrefs=["base_dtc_3"])
+            ],
+        )
+        odxlinks.update(base_dop._build_odxlinks())
+        odxlinks.update(dop._build_odxlinks())
+        base_dop._resolve_odxlinks(odxlinks)
+        dop._resolve_odxlinks(odxlinks)
+        dop._resolve_snrefs(SnRefContext())
+
+        self.assertEqual(len(dop.dtcs), 1000)
+
+        # DTCs inherited from the linked DTC-DOP are found
+        dtc = dop.decode_from_pdu(DecodeState(coded_message=bytes([0x01, 0xf4])))
+        self.assertIs(dtc, base_dop.dtcs.base_dtc_500)
+        dtc = dop.decode_from_pdu(DecodeState(coded_message=bytes([0x12, 0x34])))
+        self.assertIs(dtc, dop.dtcs.local_dtc)
+        self.assertEqual(dop.convert_to_numerical_trouble_code("base_dtc_42"), 42)
+
+        encode_state = EncodeState()
+        dop.encode_into_pdu("base_dtc_500", encode_state)
+        self.assertEqual(encode_state.coded_message, bytes([0x01, 0xf4]))
+
+        # DTCs which are not inherited cannot be de- or encoded
+        with self.assertRaises(DecodeError):
+            dop.decode_from_pdu(DecodeState(coded_message=bytes([0x00, 0x03])))
+        with self.assertRaises(EncodeError):
+            dop.convert_to_numerical_trouble_code("base_dtc_3")
+
+        # replacing a DTC does not change the number of DTCs, but the
+        # indices must be updated once the references are resolved
+        dop.dtcs_raw[0] = DiagnosticTroubleCode(
+            odx_id=OdxLinkId("local.dtc", doc_frags),
+            short_name="replaced_dtc",
+            trouble_code=0x4321,
+            text=Text.from_string("Replaced error"),
+        )
+        odxlinks.update(dop._build_odxlinks())
+        dop._resolve_odxlinks(odxlinks)
+        dtc = dop.decode_from_pdu(DecodeState(coded_message=bytes([0x43, 0x21])))
+        self.assertIs(dtc, dop.dtcs.replaced_dtc)
+        self.assertEqual(dop.convert_to_numerical_trouble_code("replaced_dtc"), 0x4321)
+        with self.assertRaises(DecodeError):
+            dop.decode_from_pdu(DecodeState(coded_message=bytes([0x12, 0x34])))
+
 
 class TestDecodingAndEncoding(unittest.TestCase):
 
@@ -1477,6 +1575,229 @@ class TestDecodingAndEncoding(unittest.TestCase):
 
         self.assertRaises(DecodeError, request.decode, bytes([0x12, 0x34]))
 
+    def test_decode_plan(self) -> None:
+        odxlinks = OdxLinkDatabase()
+        sid_coded_type = StandardLengthType(
+            base_data_type=DataType.A_UINT32,
+            bit_length=8,
+        )
+        int_dop = DataObjectProperty(
+            odx_id=OdxLinkId("INT_DOP", doc_frags),
+            short_name="int_dop",
+            diag_coded_type=StandardLengthType(
+                base_data_type=DataType.A_INT32, bit_length=16, is_highlow_byte_order_raw=False),
+            physical_type=PhysicalType(base_data_type=DataType.A_INT32),
+            compu_method=IdenticalCompuMethod(
+                category=CompuCategory.IDENTICAL,
+                internal_type=DataType.A_INT32,
+                physical_type=DataType.A_INT32),
+        )
+        nibble_dop = DataObjectProperty(
+            odx_id=OdxLinkId("NIBBLE_DOP", doc_frags),
+            short_name="nibble_dop",
+            diag_coded_type=StandardLengthType(base_data_type=DataType.A_UINT32, bit_length=4),
+            physical_type=PhysicalType(base_data_type=DataType.A_UINT32),
+            compu_method=IdenticalCompuMethod(
+                category=CompuCategory.IDENTICAL,
+                internal_type=DataType.A_UINT32,
+                physical_type=DataType.A_UINT32),
+        )
+        odxlinks.update(int_dop._build_odxlinks())
+        odxlinks.update(nibble_dop._build_odxlinks())
+        request = Request(
+            odx_id=OdxLinkId("request", doc_frags),
+            short_name="Request",
+            parameters=NamedItemList([
+                CodedConstParameter(
+                    short_name="SID",
+                    diag_coded_type=sid_coded_type,
+                    coded_value_raw=str(0x12),
+                    byte_position=0,
+                ),
+                ValueParameter(
+                    short_name="low_nibble",
+                    dop_ref=OdxLinkRef.from_id(nibble_dop.odx_id),
+                    byte_position=3,
+                    bit_position=0,
+                ),
+                ValueParameter(
+                    short_name="high_nibble",
+                    dop_ref=OdxLinkRef.from_id(nibble_dop.odx_id),
+                    byte_position=3,
+                    bit_position=4,
+                ),
+                ValueParameter(
+                    short_name="little_endian_int",
+                    dop_ref=OdxLinkRef.from_id(int_dop.odx_id),
+                    byte_position=1,
+                ),
+            ]),
+        )
+        request._resolve_odxlinks(odxlinks)
+        request._resolve_snrefs(SnRefContext())
+
+        # the request exhibits a fixed layout, so it can be decoded
+        # using a precompiled plan
+        self.assertIsNotNone(request._decode_plan)
+
+        expected_param_dict = {
+            "SID": 0x12,
+            "low_nibble": 0xb,
+            "high_nibble": 0xa,
+            "little_endian_int": -2,
+        }
+        coded_message = bytes([0x12, 0xfe, 0xff, 0xab])
+        self.assertEqual(request.decode(coded_message), expected_param_dict)
+        self.assertEqual(
+            request.decode_from_pdu(DecodeState(coded_message=coded_message)), expected_param_dict)
+        self.assertEqual(request.encode(**expected_param_dict), coded_message)
+
+        # messages which cannot be handled by the plan are passed to
+        # the generic decoding machinery
+        self.assertRaises(DecodeError, request.decode, bytes([0x12, 0xfe, 0xff]))
+        with self.assertWarns(DecodeError):
+            request.decode(bytes([0x13, 0xfe, 0xff, 0xab]))
+
+        # decode plans survive pickling
+        self.assertEqual(
+            pickle.loads(pickle.dumps(request)).decode(coded_message), expected_param_dict)
+
+    def test_decode_columnar(self) -> None:
+        odxlinks = OdxLinkDatabase()
+        uint8_coded_type = StandardLengthType(base_data_type=DataType.A_UINT32, bit_length=8)
+        nibble_dop = DataObjectProperty(
+            odx_id=OdxLinkId("NIBBLE_DOP", doc_frags),
+            short_name="nibble_dop",
+            diag_coded_type=StandardLengthType(base_data_type=DataType.A_UINT32, bit_length=4),
+            physical_type=PhysicalType(base_data_type=DataType.A_UINT32),
+            compu_method=IdenticalCompuMethod(
+                category=CompuCategory.IDENTICAL,
+                internal_type=DataType.A_UINT32,
+                physical_type=DataType.A_UINT32),
+        )
+        int_dop = DataObjectProperty(
+            odx_id=OdxLinkId("INT_DOP", doc_frags),
+            short_name="int_dop",
+            diag_coded_type=StandardLengthType(
+                base_data_type=DataType.A_INT32, bit_length=16, is_highlow_byte_order_raw=False),
+            physical_type=PhysicalType(base_data_type=DataType.A_INT32),
+            compu_method=IdenticalCompuMethod(
+                category=CompuCategory.IDENTICAL,
+                internal_type=DataType.A_INT32,
+                physical_type=DataType.A_INT32),
+        )
+        # f(x) = x/2 - 40
+        temperature_dop = DataObjectProperty(
+            odx_id=OdxLinkId("TEMPERATURE_DOP", doc_frags),
+            short_name="temperature_dop",
+            diag_coded_type=uint8_coded_type,
+            physical_type=PhysicalType(base_data_type=DataType.A_FLOAT64),
+            compu_method=LinearCompuMethod(
+                category=CompuCategory.LINEAR,
+                compu_internal_to_phys=CompuInternalToPhys(compu_scales=[
+                    CompuScale(
+                        compu_rational_coeffs=CompuRationalCoeffs(
+                            value_type=DataType.A_FLOAT64,
+                            numerators=[-80, 1],
+                            denominators=[2],
+                        ),
+                        domain_type=DataType.A_UINT32,
+                        range_type=DataType.A_FLOAT64),
+                ]),
+                internal_type=DataType.A_UINT32,
+                physical_type=DataType.A_FLOAT64),
+        )
+        struct = Structure(
+            odx_id=OdxLinkId("STRUCT", doc_frags),
+            short_name="struct",
+            parameters=NamedItemList([
+                ValueParameter(
+                    short_name="low_nibble",
+                    dop_ref=OdxLinkRef.from_id(nibble_dop.odx_id),
+                    byte_position=0,
+                    bit_position=0,
+                ),
+                ValueParameter(
+                    short_name="high_nibble",
+                    dop_ref=OdxLinkRef.from_id(nibble_dop.odx_id),
+                    byte_position=0,
+                    bit_position=4,
+                ),
+                ValueParameter(
+                    short_name="temperature",
+                    dop_ref=OdxLinkRef.from_id(temperature_dop.odx_id),
+                ),
+            ]),
+        )
+        for obj in (nibble_dop, int_dop, temperature_dop, struct):
+            odxlinks.update(obj._build_odxlinks())
+        response = Response(
+            odx_id=OdxLinkId("response", doc_frags),
+            short_name="Response",
+            response_type=ResponseType.POSITIVE,
+            parameters=NamedItemList([
+                CodedConstParameter(
+                    short_name="SID",
+                    diag_coded_type=uint8_coded_type,
+                    coded_value_raw=str(0x62),
+                ),
+                ValueParameter(
+                    short_name="values",
+                    dop_ref=OdxLinkRef.from_id(struct.odx_id),
+                ),
+                ValueParameter(
+                    short_name="little_endian_int",
+                    dop_ref=OdxLinkRef.from_id(int_dop.odx_id),
+                ),
+            ]),
+        )
+        response._resolve_odxlinks(odxlinks)
+        struct._resolve_odxlinks(odxlinks)
+        struct._resolve_snrefs(SnRefContext())
+        response._resolve_snrefs(SnRefContext())
+
+        messages = [
+            bytes([0x62, 0xab, 0x50, 0xfe, 0xff]),
+            bytes([0x62, 0x01, 0x00, 0x02, 0x00]),
+            # trailing bytes are ignored
+            bytes([0x62, 0x10, 0xff, 0x00, 0x80, 0x12]),
+        ]
+        expected_columns = {
+            "SID": [0x62, 0x62, 0x62],
+            "values.low_nibble": [0xb, 0x1, 0x0],
+            "values.high_nibble": [0xa, 0x0, 0x1],
+            "values.temperature": [0.0, -40.0, 87.5],
+            "little_endian_int": [-2, 2, -32768],
+        }
+        # without NumPy, the messages are decoded one by one
+        with patch("odxtools.columnardecodeplan.np", None):
+            self.assertEqual(response.decode_columnar(messages), expected_columns)
+
+        if np is None:
+            return
+
+        # the response exhibits a static layout, so it can be decoded
+        # using vectorized operations
+        self.assertIsNotNone(response._columnar_decode_plan)
+        columns = response.decode_columnar(iter(messages))
+        self.assertEqual(list(columns), list(expected_columns))
+        for path, values in columns.items():
+            assert isinstance(values, np.ndarray)
+            self.assertEqual(values.tolist(), expected_columns[path])
+
+        # structures can be decoded column-wise as well
+        struct_columns = struct.decode_columnar([message[1:3] for message in messages])
+        self.assertEqual(list(struct_columns), ["low_nibble", "high_nibble", "temperature"])
+        for name, values in struct_columns.items():
+            assert isinstance(values, np.ndarray)
+            self.assertEqual(values.tolist(), expected_columns[f"values.{name}"])
+
+        self.assertRaises(DecodeError, response.decode_columnar,
+                          [messages[0], bytes([0x63, 0xab, 0x50, 0xfe, 0xff])])
+        # messages which are too short are decoded using the
+        # generic machinery, which reports the problem
+        self.assertRaises(DecodeError, response.decode_columnar, [messages[0], messages[0][:3]])
+
 
 if __name__ == "__main__":
     unittest.main()
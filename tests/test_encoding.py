@@ -1,8 +1,11 @@
 # SPDX-License-Identifier: MIT
 import math
 import unittest
+import warnings
 from datetime import datetime
+from unittest.mock import patch
 
+from odxtools.bitstructcache import get_compiled_format
 from odxtools.compumethods.compucategory import CompuCategory
 from odxtools.compumethods.compuinternaltophys import CompuInternalToPhys
 from odxtools.compumethods.compurationalcoeffs import CompuRationalCoeffs
@@ -24,7 +27,7 @@ from odxtools.encodestate import EncodeState
 from odxtools.encoding import Encoding
 from odxtools.environmentdata import EnvironmentData
 from odxtools.environmentdatadescription import EnvironmentDataDescription
-from odxtools.exceptions import EncodeError, OdxError
+from odxtools.exceptions import EncodeError, OdxError, OdxWarning
 from odxtools.nameditemlist import NamedItemList
 from odxtools.odxlink import DocType, OdxDocFragment, OdxLinkDatabase, OdxLinkId, OdxLinkRef
 from odxtools.odxtypes import DataType
@@ -39,6 +42,7 @@ from odxtools.request import Request
 from odxtools.response import Response, ResponseType
 from odxtools.snrefcontext import SnRefContext
 from odxtools.standardlengthtype import StandardLengthType
+from odxtools.structure import Structure
 from odxtools.text import Text
 
 doc_frags = (OdxDocFragment("UnitTest", DocType.CONTAINER),)
@@ -304,6 +308,88 @@ class TestEncodeRequest(unittest.TestCase):
             is_highlow_byte_order=True)
         self.assertEqual(decoded, -0x1234)
 
+    def test_byte_order_encodings(self) -> None:
+        # byte-aligned little endian value
+        encode_state = EncodeState()
+        encode_state.emplace_atomic_value(
+            internal_value=-2,
+            bit_length=16,
+            base_data_type=DataType.A_INT32,
+            base_type_encoding=None,
+            is_highlow_byte_order=False,
+            used_mask=None)
+        self.assertEqual(encode_state.coded_message, bytes([0xfe, 0xff]))
+
+        decode_state = DecodeState(bytes(encode_state.coded_message))
+        decoded = decode_state.extract_atomic_value(
+            bit_length=16,
+            base_data_type=DataType.A_INT32,
+            base_type_encoding=None,
+            is_highlow_byte_order=False)
+        self.assertEqual(decoded, -2)
+        self.assertEqual(decode_state.cursor_byte_position, 2)
+
+        # little endian value which is not byte-aligned
+        encode_state = EncodeState(cursor_bit_position=2)
+        encode_state.emplace_atomic_value(
+            internal_value=0x123,
+            bit_length=12,
+            base_data_type=DataType.A_UINT32,
+            base_type_encoding=None,
+            is_highlow_byte_order=False,
+            used_mask=None)
+        self.assertEqual(encode_state.coded_message, bytes([0x8c, 0x04]))
+
+        decode_state = DecodeState(bytes(encode_state.coded_message), cursor_bit_position=2)
+        decoded = decode_state.extract_atomic_value(
+            bit_length=12,
+            base_data_type=DataType.A_UINT32,
+            base_type_encoding=None,
+            is_highlow_byte_order=False)
+        self.assertEqual(decoded, 0x123)
+
+        # the compiled bitstruct formats are shared
+        self.assertIs(get_compiled_format("u", 12, 2), get_compiled_format("u", 12, 2))
+
+    def test_emplace_bytes(self) -> None:
+        encode_state = EncodeState(size_hint=4)
+        self.assertEqual(encode_state.coded_message, bytes(4))
+        self.assertEqual(encode_state.used_mask, bytes(4))
+
+        # placeholders do not use any bits
+        encode_state.emplace_bytes(b"\x00\x00", obj_used_mask=b"\x00\x00")
+        encode_state.cursor_byte_position = 0
+        encode_state.emplace_bytes(b"\x12\x34", obj_used_mask=b"\xf0\x0f")
+        encode_state.cursor_byte_position = 0
+        encode_state.emplace_bytes(b"\xab\xcd", obj_used_mask=b"\x0f\xf0")
+        encode_state.emplace_bytes(b"\x56")
+        encode_state.emplace_bytes(b"\x07", obj_used_mask=b"\x0f")
+        encode_state.emplace_bytes(b"\x89\xab", obj_used_mask=b"\x7f\xff")
+        self.assertEqual(encode_state.coded_message.hex(), "1bc4560709ab")
+        self.assertEqual(encode_state.used_mask.hex(), "ffffff0f7fff")
+
+        encode_state.cursor_byte_position = 0
+        with self.assertWarns(OdxWarning):
+            encode_state.emplace_bytes(b"\x00\x01", obj_used_mask=b"\x00\x01")
+        encode_state.cursor_byte_position = 3
+        with self.assertWarns(OdxWarning):
+            encode_state.emplace_bytes(b"\x01", obj_used_mask=b"\x01")
+        with self.assertWarns(OdxWarning):
+            encode_state.emplace_bytes(b"\x00")
+
+        # in trusted mode, overlaps are not checked
+        with patch("odxtools.encodestate.trusted_mode", True):
+            encode_state = EncodeState()
+        self.assertFalse(encode_state.check_overlaps)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            encode_state.emplace_bytes(b"\x12\x34")
+            encode_state.cursor_byte_position = 0
+            encode_state.emplace_bytes(b"\xab\xcd", obj_used_mask=b"\x0f\xf0")
+            encode_state.cursor_byte_position = 1
+            encode_state.emplace_bytes(b"\xff", obj_used_mask=b"\x01")
+        self.assertEqual(encode_state.coded_message.hex(), "1bc5")
+
     def test_float_encodings(self) -> None:
         # FLOAT32
         encode_state = EncodeState()
@@ -821,6 +907,49 @@ class TestEncodeRequest(unittest.TestCase):
         self.assertEqual(req.encode().hex(), "123456")
         self.assertEqual(req.get_static_bit_length(), 24)
 
+    def test_encode_padded_structure_out_of_order(self) -> None:
+        uint8 = StandardLengthType(
+            base_data_type=DataType.A_UINT32,
+            bit_length=8,
+        )
+        param1 = CodedConstParameter(
+            short_name="second",
+            diag_coded_type=uint8,
+            coded_value_raw=str(0xab),
+            byte_position=2,
+        )
+        param2 = CodedConstParameter(
+            short_name="first",
+            diag_coded_type=uint8,
+            coded_value_raw=str(0x12),
+            byte_position=0,
+        )
+        struct = Structure(
+            odx_id=OdxLinkId("struct_id", doc_frags),
+            short_name="struct",
+            byte_size=4,
+            parameters=NamedItemList([param1, param2]),
+        )
+
+        # the padding must not overwrite the parameter located
+        # behind the cursor
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            encode_state = EncodeState()
+            struct.encode_into_pdu({}, encode_state)
+        self.assertEqual(encode_state.coded_message.hex(), "1200ab00")
+        self.assertEqual(encode_state.used_mask.hex(), "ffffffff")
+        self.assertEqual(encode_state.cursor_byte_position, 4)
+
+        # same in trusted mode
+        with patch("odxtools.encodestate.trusted_mode", True):
+            encode_state = EncodeState()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            struct.encode_into_pdu({}, encode_state)
+        self.assertEqual(encode_state.coded_message.hex(), "1200ab00")
+        self.assertEqual(encode_state.cursor_byte_position, 4)
+
     def _create_request(self, parameters: list[Parameter]) -> Request:
         return Request(
             odx_id=OdxLinkId("request_id", doc_frags),
@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: MIT
+import asyncio
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from pathlib import Path
+
+import can
+
+from odxtools.isotp_state_machine import IsoTpStateMachine, iter_socketcan_frames
+
+# a log that features all supported line formats. It contains two
+# single frame telegrams, a multi-frame telegram that is interrupted
+# by frames of an unrelated CAN ID and a frame that cannot be parsed.
+can_log = """\
+(1.000000) can0 7E0#0322F190AAAAAAAA
+  can0  7E8   [8]  10 14 62 F1 90 57 30 4C
+(1.000200) can0 123#0102030405060708
+(1.000300) can0 7E0#300000AAAAAAAAAA
+  can0  7E8   [8]  21 30 30 30 30 34 33 32
+  can0  123   [8]  01 02 03 04 05 06 07 08
+(1.000500) can0 7E8#2231323334353637
+this is not a CAN frame
+(1.000600) can0 7E0##10311AABB
+"""
+
+expected_telegrams = [
+    (0x7e0, bytes.fromhex("22f190")),
+    (0x7e8, bytes.fromhex("62f19057304c"
+                          "30303030343332"
+                          "31323334353637")),
+    (0x7e0, bytes.fromhex("11aabb")),
+]
+
+
+class TestIsoTpStateMachine(unittest.TestCase):
+
+    def test_read_log_telegrams(self) -> None:
+        state_machine = IsoTpStateMachine([0x7e0, 0x7e8])
+        with redirect_stderr(StringIO()) as stderr:
+            telegrams = list(state_machine.read_log_telegrams(StringIO(can_log), chunk_size=64))
+
+        self.assertEqual(telegrams, expected_telegrams)
+        self.assertEqual(stderr.getvalue().count("unrecognized frame format"), 1)
+
+    def test_read_telegrams(self) -> None:
+
+        async def read_all() -> list[tuple[int, bytes]]:
+            state_machine = IsoTpStateMachine([0x7e0, 0x7e8])
+            return [x async for x in state_machine.read_telegrams(StringIO(can_log))]
+
+        with redirect_stderr(StringIO()) as stderr:
+            telegrams = asyncio.run(read_all())
+
+        self.assertEqual(telegrams, expected_telegrams)
+        self.assertEqual(stderr.getvalue().count("unrecognized frame format"), 1)
+
+    def test_read_trace_telegrams(self) -> None:
+        messages = [
+            can.Message(timestamp=1.0, arbitration_id=0x7e0, data=bytes.fromhex("0322f190")),
+            # error frames are ignored
+            can.Message(timestamp=1.1, arbitration_id=0x7e0, data=b"\x01\x02", is_error_frame=True),
+            can.Message(timestamp=1.2, arbitration_id=0x7e8, data=bytes.fromhex("1014")),
+            can.Message(timestamp=1.3, arbitration_id=0x123, data=bytes.fromhex("01")),
+            can.Message(timestamp=1.4, arbitration_id=0x7e8, data=bytes.fromhex("21" + 7 * "30")),
+            can.Message(timestamp=1.5, arbitration_id=0x7e8, data=bytes.fromhex("22" + 7 * "31")),
+            can.Message(timestamp=1.6, arbitration_id=0x7e8, data=bytes.fromhex("23" + 7 * "32")),
+        ]
+
+        with tempfile.TemporaryDirectory() as trace_dir:
+            trace_file = Path(trace_dir) / "trace.blf"
+            with can.Logger(trace_file) as logger:
+                for msg in messages:
+                    logger.on_message_received(msg)
+
+            state_machine = IsoTpStateMachine([0x7e0, 0x7e8])
+            with can.LogReader(trace_file) as reader:
+                telegrams = list(state_machine.read_trace_telegrams(reader))
+
+        self.assertEqual(telegrams, [(0x7e0, bytes.fromhex("22f190")),
+                                     (0x7e8, bytes.fromhex(7 * "30" + 7 * "31" + 6 * "32"))])
+
+    def test_read_socketcan_telegrams(self) -> None:
+        frames = [
+            (0x7e0, bytes.fromhex("0322f190")),
+            # remote frame
+            (0x7e0 | 0x40000000, bytes.fromhex("02aabb")),
+            # extended CAN ID
+            (0x18daf110 | 0x80000000, bytes.fromhex("023e00")),
+        ]
+        buffer = bytearray()
+        for can_id, data in frames:
+            buffer += struct.pack("<IB3x8s", can_id, len(data), data)
+        # incomplete record at the end of the buffer
+        buffer += bytes(4)
+
+        self.assertEqual(
+            list(iter_socketcan_frames(buffer)), [(0x7e0, bytes.fromhex("0322f190")),
+                                                  (0x18daf110, bytes.fromhex("023e00"))])
+
+        state_machine = IsoTpStateMachine([0x7e0, 0x18daf110])
+        self.assertEqual(
+            list(state_machine.read_socketcan_telegrams(memoryview(buffer))),
+            [(0x7e0, bytes.fromhex("22f190")), (0x18daf110, bytes.fromhex("3e00"))])
+
+        fd_buffer = struct.pack("<IB3x64s", 0x7e0, 11, b"\x0a" + bytes(range(10)))
+        self.assertEqual(
+            list(state_machine.read_socketcan_telegrams(fd_buffer, fd=True)),
+            [(0x7e0, bytes(range(10)))])
+
+    def test_sequence_error(self) -> None:
+        errors: list[tuple[int, int, int]] = []
+
+        class MyStateMachine(IsoTpStateMachine):
+
+            def on_sequence_error(self, telegram_idx: int, expected_idx: int, rx_idx: int) -> None:
+                errors.append((telegram_idx, expected_idx, rx_idx))
+
+        state_machine = MyStateMachine(0x7e8)
+        frames = [bytes.fromhex("100a0102030405AA"), bytes.fromhex("2206070809AAAAAA")]
+        for frame in frames:
+            self.assertEqual(list(state_machine.decode_rx_frame(0x7e8, frame)), [])
+        self.assertEqual(errors, [(0, 1, 2)])
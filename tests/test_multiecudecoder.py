@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: MIT
+import asyncio
+import unittest
+
+import can
+
+from odxtools.loadfile import load_pdx_file
+from odxtools.multiecudecoder import DecodedTelegram, MonitoredEcu, MultiEcuDecoder
+
+odxdb = load_pdx_file("./examples/somersault.pdx")
+
+lazy_ecu = MonitoredEcu(diag_layer=odxdb.ecus.somersault_lazy, rx_id=0x7e0, tx_id=0x7e8)
+assiduous_ecu = MonitoredEcu(diag_layer=odxdb.ecus.somersault_assiduous, rx_id=0x7e1, tx_id=0x7e9)
+
+
+class TestMultiEcuDecoder(unittest.TestCase):
+
+    def test_decode_frames(self) -> None:
+        decoder = MultiEcuDecoder([lazy_ecu, assiduous_ecu])
+
+        frames: list[tuple[str | None, int, bytes]] = [
+            # the first frame of a request on channel "a"...
+            ("a", 0x7e0, bytes.fromhex("100a22f190010203")),
+            # ... is interrupted by a request to the same ECU on
+            # channel "b" and by a request to a different ECU
+            ("b", 0x7e0, bytes.fromhex("023e00")),
+            ("a", 0x7e1, bytes.fromhex("023e00")),
+            ("a", 0x7e0, bytes.fromhex("2104050607")),
+            # unrelated CAN ID
+            ("a", 0x123, bytes.fromhex("023e00")),
+            # responses are correlated with the requests on the same
+            # channel
+            ("b", 0x7e8, bytes.fromhex("027e00")),
+            ("a", 0x7e8, bytes.fromhex("037f2278")),
+            ("a", 0x7e9, bytes.fromhex("027e00")),
+        ]
+        telegrams = list(decoder.decode_frames(frames))
+
+        self.assertEqual([(x.channel, x.ecu, x.payload.hex()) for x in telegrams], [
+            ("b", lazy_ecu, "3e00"),
+            ("a", assiduous_ecu, "3e00"),
+            ("a", lazy_ecu, "22f19001020304050607"),
+            ("b", lazy_ecu, "7e00"),
+            ("a", lazy_ecu, "7f2278"),
+            ("a", assiduous_ecu, "7e00"),
+        ])
+        self.assertEqual([x.is_request for x in telegrams], [True, True, True, False, False, False])
+
+        self.assertEqual(telegrams[0].messages[0].service.short_name, "tester_present")
+        self.assertIsNone(telegrams[0].error)
+        # the lazy ECU does not know about service 0x22
+        self.assertEqual(telegrams[2].messages, [])
+        self.assertIsNotNone(telegrams[2].error)
+
+        self.assertEqual(telegrams[3].request, bytes.fromhex("3e00"))
+        self.assertEqual(telegrams[3].messages[0].coding_object.short_name, "tester_present")
+        self.assertEqual(telegrams[4].request, bytes.fromhex("22f19001020304050607"))
+        self.assertTrue(telegrams[4].is_response_pending)
+        self.assertFalse(telegrams[5].is_response_pending)
+
+    def test_ambiguous_can_ids(self) -> None:
+        ecu = MonitoredEcu(diag_layer=odxdb.ecus.somersault_assiduous, rx_id=0x7e8, tx_id=0x7f0)
+        with self.assertRaises(ValueError):
+            MultiEcuDecoder([lazy_ecu, ecu])
+
+    def test_read_telegrams(self) -> None:
+        decoder = MultiEcuDecoder([lazy_ecu, assiduous_ecu])
+
+        async def read_two_telegrams() -> list[DecodedTelegram]:
+            rx_bus = can.Bus(interface="virtual", channel="vcan_test")
+            tx_bus = can.Bus(interface="virtual", channel="vcan_test")
+            with rx_bus, tx_bus:
+                result: list[DecodedTelegram] = []
+                telegrams = decoder.read_telegrams([rx_bus])
+
+                async def read() -> None:
+                    async for telegram in telegrams:
+                        result.append(telegram)
+                        if len(result) == 2:
+                            break
+
+                reader_task = asyncio.create_task(read())
+                await asyncio.sleep(0.01)
+                tx_bus.send(can.Message(arbitration_id=0x7e1, data=bytes.fromhex("023e00")))
+                tx_bus.send(can.Message(arbitration_id=0x7e9, data=bytes.fromhex("027e00")))
+                await asyncio.wait_for(reader_task, timeout=5)
+                await telegrams.aclose()
+
+                return result
+
+        telegrams = asyncio.run(read_two_telegrams())
+        self.assertEqual([(x.ecu, x.is_request, x.payload.hex()) for x in telegrams],
+                         [(assiduous_ecu, True, "3e00"), (assiduous_ecu, False, "7e00")])
+        self.assertEqual(telegrams[1].request, bytes.fromhex("3e00"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,28 @@
 # SPDX-License-Identifier: MIT
 import pickle
+import tempfile
 import unittest
+from copy import deepcopy
 from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import patch
+from xml.etree import ElementTree
+from zipfile import ZipFile
+
+from packaging.version import Version
 
 import odxtools
 import odxtools.exceptions
-from odxtools.exceptions import OdxError
+from odxtools.database import Database
+from odxtools.diaglayers.ecuvariant import EcuVariant
+from odxtools.exceptions import OdxError, OdxWarning, odxrequire
 from odxtools.loadfile import load_pdx_file
 from odxtools.nameditemlist import NamedItemList
-from odxtools.odxlink import OdxLinkRef
+from odxtools.odxdoccontext import OdxDocContext
+from odxtools.odxlink import (DocType, OdxDocFragment, OdxLinkDatabase, OdxLinkId, OdxLinkRef,
+                              resolve_snref)
+from odxtools.shareddatabase import SharedDatabase, write_shared_database
+from odxtools.snapshot import load_database_snapshot, save_database_snapshot
 
 odxdb = load_pdx_file("./examples/somersault.pdx")
 
@@ -170,6 +184,61 @@ class TestNamedItemList(unittest.TestCase):
 
         bar(foo)
 
+    def test_remove_items(self) -> None:
+        hello = X("hello", 0)
+        foo = NamedItemList([hello, X("hello", 1), X("world", 2), X("hello", 3)])
+        self.assertEqual(set(foo.keys()), {"hello", "hello_2", "world", "hello_3"})
+
+        # items are removed using equality, but the names of the
+        # object which is actually stored by the list are removed
+        foo.remove(X("hello", 1))
+        self.assertEqual(set(foo.keys()), {"hello", "world", "hello_3"})
+        self.assertEqual(foo.pop(0), hello)
+        self.assertEqual(set(foo.keys()), {"world", "hello_3"})
+        with self.assertRaises(ValueError):
+            foo.remove(X("hello", 1))
+
+        # names of removed items can be reused if they are free, but
+        # the suffixes of colliding names are not
+        foo.append(X("hello", 4))
+        foo.append(X("hello", 5))
+        self.assertEqual(foo.hello, X("hello", 4))
+        self.assertEqual(foo.hello_4, X("hello", 5))
+
+        # objects may be contained by the list multiple times
+        foo.append(hello)
+        foo.append(hello)
+        foo.remove(hello)
+        self.assertEqual(foo.index(hello), len(foo) - 1)
+        self.assertEqual(len(foo.keys()), len(foo))
+
+        foo.clear()
+        self.assertEqual(len(foo.keys()), 0)
+        foo.append(X("hello", 6))
+        self.assertEqual(foo.hello, X("hello", 6))
+
+    def test_resolve_snref(self) -> None:
+        foo = NamedItemList([X("hello", 0), X("world", 1), X("sort", 2)])
+
+        self.assertEqual(resolve_snref("world", foo, X), X("world", 1))
+        # items which do not use their short name as attribute name
+        self.assertEqual(resolve_snref("sort", foo, X), X("sort", 2))
+        self.assertIsNone(resolve_snref("dunno", foo, X, lenient=True))
+
+        # the short name index must be updated if the list changes
+        foo.append(X("dunno", 3))
+        self.assertEqual(resolve_snref("dunno", foo, X), X("dunno", 3))
+        foo.remove(X("dunno", 3))
+        self.assertIsNone(resolve_snref("dunno", foo, X, lenient=True))
+        self.assertEqual(resolve_snref("hello", deepcopy(foo), X), X("hello", 0))
+
+        # ambiguous short name references must be reported
+        foo.append(X("hello", 4))
+        with self.assertRaises(OdxError):
+            resolve_snref("hello", foo, X)
+        with self.assertRaises(OdxError):
+            resolve_snref("hello", list(foo), X)
+
 
 class TestNavigation(unittest.TestCase):
 
@@ -227,5 +296,222 @@ class TestNavigation(unittest.TestCase):
         self.assertEqual(service_groups[0x42], NamedItemList())
 
 
+class TestOdxLink(unittest.TestCase):
+
+    def test_odxlinks(self) -> None:
+        doc_frags = (OdxDocFragment("my_dlc", DocType.CONTAINER),)
+        context = OdxDocContext(Version("2.2.0"), doc_frags)
+
+        odx_id = OdxLinkId.from_et(ElementTree.fromstring('<DOP ID="my.dop"/>'), context)
+        assert odx_id is not None
+        ref1 = OdxLinkRef.from_et(
+            ElementTree.fromstring('<DOP-REF ID-REF="my.dop" DOCREF="foo" DOCTYPE="LAYER"/>'),
+            context)
+        ref2 = OdxLinkRef.from_et(
+            ElementTree.fromstring('<DOP-REF ID-REF="my.dop" DOCREF="foo" DOCTYPE="LAYER"/>'),
+            context)
+        local_ref = OdxLinkRef.from_et(
+            ElementTree.fromstring('<DOP-REF ID-REF="my.dop"/>'), context)
+
+        # the objects do not exhibit an instance dictionary
+        self.assertFalse(hasattr(odx_id, "__dict__"))
+        self.assertFalse(hasattr(ref1, "__dict__"))
+
+        # identical document fragments and identifiers are shared
+        self.assertIs(ref1.ref_docs, ref2.ref_docs)
+        self.assertIs(ref1.ref_id, ref2.ref_id)
+        self.assertIs(local_ref.ref_id, odx_id.local_id)
+        self.assertEqual(ref1.ref_docs, (OdxDocFragment("foo", DocType.LAYER),))
+        self.assertNotEqual(
+            OdxDocFragment("foo", DocType.LAYER), OdxDocFragment("foo", DocType.CONTAINER))
+
+        odxlinks = OdxLinkDatabase()
+        odxlinks.update({odx_id: "my_object"})
+        self.assertEqual(odxlinks.resolve(local_ref, str), "my_object")
+        self.assertEqual(
+            pickle.loads(pickle.dumps(odxlinks)).resolve(pickle.loads(pickle.dumps(local_ref))),
+            "my_object")
+        with self.assertWarns(OdxWarning):
+            self.assertIsNone(odxlinks.resolve_lenient(ref1))
+
+
+class TestDatabaseLoading(unittest.TestCase):
+
+    def test_parallel_add_pdx_file(self) -> None:
+        db = Database()
+        db.add_pdx_file("./examples/somersault.pdx", parallel=True, max_workers=2)
+        db.refresh()
+
+        self.assertEqual(db.short_name, odxdb.short_name)
+        self.assertEqual([x.short_name for x in db.diag_layer_containers],
+                         [x.short_name for x in odxdb.diag_layer_containers])
+        self.assertEqual([x.short_name for x in db.comparam_subsets],
+                         [x.short_name for x in odxdb.comparam_subsets])
+        self.assertEqual([x.short_name for x in db.diag_layers],
+                         [x.short_name for x in odxdb.diag_layers])
+        self.assertEqual(list(db.auxiliary_files), list(odxdb.auxiliary_files))
+        self.assertEqual(db.ecus.somersault_lazy.services.do_forward_flips,
+                         odxdb.ecus.somersault_lazy.services.do_forward_flips)
+
+    def test_incremental_add_pdx_file(self) -> None:
+        db = Database()
+        db.add_pdx_file("./examples/somersault.pdx", incremental=True)
+        db.refresh()
+
+        self.assertEqual(db.model_version, odxdb.model_version)
+        self.assertEqual(db.diag_layer_containers, odxdb.diag_layer_containers)
+        self.assertEqual(db.comparam_subsets, odxdb.comparam_subsets)
+        self.assertEqual([x.short_name for x in db.diag_layers],
+                         [x.short_name for x in odxdb.diag_layers])
+
+    def test_conflicting_parse_options(self) -> None:
+        db = Database()
+        with self.assertRaises(ValueError):
+            db.add_pdx_file("./examples/somersault.pdx", parallel=True, incremental=True)
+
+    def test_lazy_refresh(self) -> None:
+        db = Database()
+        db.add_pdx_file("./examples/somersault.pdx")
+        db.refresh(lazy=True)
+        self.assertTrue(db.lazy_finalization)
+
+        lazy_ecu = db.ecus.somersault_lazy
+        base_variant = db.base_variants.somersault_base_variant
+        self.assertIn("_pending_finalization", lazy_ecu.__dict__)
+        self.assertIn("_pending_finalization", base_variant.__dict__)
+
+        # accessing the services of the ECU variant finalizes it as
+        # well as its parents, but not the other variants
+        self.assertEqual([x.short_name for x in lazy_ecu.services],
+                         [x.short_name for x in odxdb.ecus.somersault_lazy.services])
+        self.assertNotIn("_pending_finalization", lazy_ecu.__dict__)
+        self.assertNotIn("_pending_finalization", base_variant.__dict__)
+        self.assertIn("_pending_finalization", db.ecus.somersault_assiduous.__dict__)
+
+        for lazy_dl, dl in zip(db.diag_layers, odxdb.diag_layers, strict=True):
+            self.assertEqual(lazy_dl.diag_data_dictionary_spec, dl.diag_data_dictionary_spec)
+            self.assertEqual(lazy_dl.diag_comms, dl.diag_comms)
+
+        with self.assertRaises(AttributeError):
+            getattr(lazy_ecu, "no_such_attribute")  # noqa: B009
+
+    def test_lazy_refresh_failure(self) -> None:
+        db = Database()
+        db.add_pdx_file("./examples/somersault.pdx")
+        db.refresh(lazy=True)
+
+        # if finalizing a layer fails, it is retried on the next
+        # access
+        lazy_ecu = db.ecus.somersault_lazy
+        with patch.object(EcuVariant, "_finalize_layer", side_effect=OdxError("broken layer")):
+            with self.assertRaises(OdxError):
+                lazy_ecu._ensure_finalized()
+        self.assertIn("_pending_finalization", lazy_ecu.__dict__)
+        self.assertNotIn("_pending_finalization", db.base_variants.somersault_base_variant.__dict__)
+
+        self.assertEqual([x.short_name for x in lazy_ecu.services],
+                         [x.short_name for x in odxdb.ecus.somersault_lazy.services])
+        self.assertNotIn("_pending_finalization", lazy_ecu.__dict__)
+
+
+class TestDatabaseSnapshot(unittest.TestCase):
+
+    def test_snapshot_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            db = load_pdx_file("./examples/somersault.pdx", snapshot_dir=snapshot_dir)
+            self.assertEqual(len(list(Path(snapshot_dir).iterdir())), 1)
+
+            cached_db = load_pdx_file("./examples/somersault.pdx", snapshot_dir=snapshot_dir)
+            self.assertIsNot(db, cached_db)
+            self.assertEqual([x.short_name for x in cached_db.ecus],
+                             [x.short_name for x in db.ecus])
+            with ZipFile("./examples/somersault.pdx") as pdx_zip:
+                self.assertEqual(cached_db.auxiliary_files["jobs.py"].read(),
+                                 pdx_zip.read("jobs.py"))
+
+            ecu = cached_db.ecus.somersault_lazy
+            service = ecu.services.do_forward_flips
+            self.assertEqual(
+                ecu.decode(service(forward_soberness_check=0x12, num_flips=3))[0].param_dict,
+                odxrequire(service.request).decode(bytes([0xba, 0x12, 0x03])))
+
+    def test_snapshot_does_not_modify_database(self) -> None:
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            aux_files = dict(odxdb.auxiliary_files)
+            save_database_snapshot(odxdb, Path(snapshot_dir) / "db.odxdb")
+            self.assertEqual(len(aux_files), len(odxdb.auxiliary_files))
+            for name, aux_file in odxdb.auxiliary_files.items():
+                self.assertIs(aux_file, aux_files[name])
+
+    def test_snapshot_version_mismatch(self) -> None:
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            snapshot_file = Path(snapshot_dir) / "db.odxdb"
+            save_database_snapshot(odxdb, snapshot_file)
+            self.assertIsNotNone(load_database_snapshot(snapshot_file))
+
+            data = snapshot_file.read_bytes().split(b"\n", 2)
+            snapshot_file.write_bytes(b"\n".join([data[0], b"0.0.0", data[2]]))
+            self.assertIsNone(load_database_snapshot(snapshot_file))
+
+
+class TestSharedDatabase(unittest.TestCase):
+
+    def test_shared_database(self) -> None:
+        with tempfile.TemporaryDirectory() as shared_dir:
+            shared_file = Path(shared_dir) / "somersault.odxshared"
+            write_shared_database(odxdb, shared_file)
+
+            shared_db = SharedDatabase(shared_file)
+            self.assertEqual(shared_db.diag_layer_names, [x.short_name for x in odxdb.diag_layers])
+
+            # layers are only restored on demand, together with the
+            # layers they depend on
+            ecu = shared_db.get_diag_layer("somersault_lazy")
+            assert isinstance(ecu, EcuVariant)
+            base_variant = shared_db.get_diag_layer("somersault_base_variant")
+            self.assertNotIn(shared_db._diag_layer_indices["somersault_assiduous"],
+                             shared_db._units)
+            self.assertIs(ecu.parent_refs[0].layer, base_variant)
+            self.assertIs(ecu.services.session_start, base_variant.services.session_start)
+
+            # objects referenced by layers other than their owner are
+            # restored only once, regardless of the direction of the
+            # reference (the services of the base variant refer to
+            # the state charts of the ECU variant)
+            session_start = base_variant.services.session_start
+            self.assertIs(session_start.pre_condition_states[0],
+                          ecu.state_charts.annoyed_chart.states.in_bed)
+            self.assertIs(session_start.state_transitions[0],
+                          ecu.state_charts.annoyed_chart.state_transitions[0])
+
+            service = ecu.services.do_forward_flips
+            self.assertEqual(service, odxdb.ecus.somersault_lazy.services.do_forward_flips)
+            self.assertEqual(
+                ecu.decode(service(forward_soberness_check=0x12, num_flips=3))[0].param_dict,
+                odxrequire(service.request).decode(bytes([0xba, 0x12, 0x03])))
+
+            # shared databases are transferred to other processes by
+            # their file name
+            with pickle.loads(pickle.dumps(shared_db)) as unpickled_db:
+                self.assertEqual([x.short_name for x in unpickled_db.diag_layers],
+                                 shared_db.diag_layer_names)
+
+            # layers which have been restored remain usable after the
+            # shared database has been closed
+            with SharedDatabase(shared_file) as closed_db:
+                closed_ecu = closed_db.get_diag_layer("somersault_lazy")
+            self.assertEqual(closed_ecu.services.do_forward_flips, service)
+            with self.assertRaises(ValueError):
+                closed_db.get_diag_layer("somersault_assiduous")
+
+            with self.assertRaises(KeyError):
+                shared_db.get_diag_layer("no_such_layer")
+
+            shared_db.close()
+            shared_file.write_bytes(b"not a shared database\n")
+            with self.assertRaises(ValueError):
+                SharedDatabase(shared_file)
+
+
 if __name__ == "__main__":
     unittest.main()
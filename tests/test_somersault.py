@@ -1,15 +1,19 @@
 # SPDX-License-Identifier: MIT
+import pickle
 import unittest
 from io import StringIO
+from typing import Any
 from unittest.mock import patch
 
 from packaging.version import Version
 
 from odxtools.description import Description
-from odxtools.exceptions import OdxError, odxrequire
+from odxtools.diagservice import DiagService
+from odxtools.exceptions import DecodeError, OdxError, odxrequire
 from odxtools.loadfile import load_pdx_file
 from odxtools.parameters.nrcconstparameter import NrcConstParameter
 from odxtools.parameters.valueparameter import ValueParameter
+from odxtools.requesttemplate import freeze_parameter_values
 from odxtools.utils import retarget_snrefs
 
 odxdb = load_pdx_file("./examples/somersault.pdx")
@@ -183,6 +187,60 @@ class TestEnDecode(unittest.TestCase):
             "Value for unknown parameter 'grass_level' specified for composite codec object do_forward_flips"
         )
 
+    def test_encode_request_cache(self) -> None:
+        service = odxdb.ecus.somersault_lazy.services.do_forward_flips
+        coded_request = service.encode_request(forward_soberness_check=0x12, num_flips=5)
+        self.assertEqual(coded_request, bytes([0xba, 0x12, 0x05]))
+
+        # modifying the result must not affect the cached request
+        coded_request[2] = 0x42
+        self.assertEqual(
+            service.encode_request(forward_soberness_check=0x12, num_flips=5),
+            bytes([0xba, 0x12, 0x05]))
+        self.assertEqual(
+            service.encode_request(forward_soberness_check=0x12, num_flips=6),
+            bytes([0xba, 0x12, 0x06]))
+
+        # the least recently used request is evicted from the cache
+        service._encoded_requests.clear()
+        with patch("odxtools.diagservice.REQUEST_CACHE_SIZE", 2):
+            for num_flips in (1, 2, 1, 3):
+                service.encode_request(forward_soberness_check=0x12, num_flips=num_flips)
+        expected_values = [{"forward_soberness_check": 0x12, "num_flips": x} for x in (1, 3)]
+        expected_keys = [(False, freeze_parameter_values(x)) for x in expected_values]
+        self.assertEqual(list(service._encoded_requests), expected_keys)
+
+        # the invalid parameters must not be cached
+        for _ in range(2):
+            with self.assertRaises(OdxError):
+                service.encode_request(forward_soberness_check=0x12)
+
+        # requests which are encoded in non-strict mode must not be
+        # cached, because they may be bogus
+        with patch("odxtools.exceptions.strict_mode", False):
+            with self.assertLogs("odxtools", level="WARNING"):
+                service.encode_request(forward_soberness_check=0x12, num_flips=5000)
+        with self.assertRaises(OdxError):
+            service.encode_request(forward_soberness_check=0x12, num_flips=5000)
+
+    def test_request_template(self) -> None:
+        service = odxdb.ecus.somersault_lazy.services.do_forward_flips
+        template = service.request_template("num_flips", forward_soberness_check=0x12)
+        self.assertEqual([x.short_name for x in template.variable_parameters], ["num_flips"])
+        for num_flips in range(3):
+            self.assertEqual(
+                template(num_flips=num_flips),
+                service.encode_request(forward_soberness_check=0x12, num_flips=num_flips))
+
+        with self.assertRaises(OdxError):
+            template()
+        with self.assertRaises(OdxError):
+            template(num_flips=1, forward_soberness_check=0x12)
+        with self.assertRaises(OdxError):
+            service.request_template("num_flips")
+        with self.assertRaises(OdxError):
+            service.request_template("grass_level", forward_soberness_check=0x12)
+
     def test_decode_request(self) -> None:
         messages = odxdb.ecus.somersault_assiduous.decode(bytes([0x03, 0x45]))
         self.assertTrue(len(messages) == 1)
@@ -311,6 +369,81 @@ class TestEnDecode(unittest.TestCase):
             "num_flips": 0x02
         })
 
+    def test_service_dispatcher(self) -> None:
+        ecu = odxdb.ecus.somersault_assiduous
+
+        # the compiled dispatcher must find the same candidate
+        # services as walking the prefix tree
+        def walk_prefix_tree(message: bytes) -> list[DiagService]:
+            result: list[DiagService] = []
+            prefix_tree: Any = ecu._prefix_tree
+            for b in message:
+                if b not in prefix_tree:
+                    break
+                prefix_tree = prefix_tree[b]
+                result += prefix_tree.get(-1, [])
+            return result
+
+        for service in ecu.services:
+            if service.request is None:
+                continue
+            coded_prefix = bytes(service.request.coded_const_prefix())
+            for message in [coded_prefix, coded_prefix + b"\x00\x00", b"\x7f" + coded_prefix]:
+                self.assertEqual([x.short_name for x in ecu._find_services_for_uds(message)],
+                                 [x.short_name for x in walk_prefix_tree(message)])
+
+        self.assertEqual(ecu._find_services_for_uds(b""), [])
+        self.assertEqual(ecu._find_services_for_uds(b"\x42\x42"), [])
+        with self.assertRaises(DecodeError):
+            ecu.decode(b"\x42\x42")
+
+    def test_decode_many(self) -> None:
+        ecu = odxdb.ecus.somersault_assiduous
+        gnr = ecu.global_negative_responses.too_hot
+        coded_request = bytes([0x03, 0x45])
+        coded_response = gnr.encode(coded_request=coded_request, temperature=35)
+        messages: list[bytes | bytearray] = [coded_request, b"\x42\x42", bytearray(coded_response)]
+
+        for parallel in (False, True):
+            results = list(ecu.decode_many(messages, parallel=parallel, max_workers=2))
+            self.assertEqual(len(results), 3)
+
+            self.assertEqual(results[0], ecu.decode(coded_request))
+            self.assertTrue(isinstance(results[1], DecodeError))
+            self.assertEqual(results[2], ecu.decode(coded_response))
+            # the decoded messages must refer to the objects of the
+            # original database even if they were decoded by a worker
+            # process
+            decoded_gnrs = results[2]
+            assert isinstance(decoded_gnrs, list)
+            self.assertEqual(len(decoded_gnrs), len(ecu.services))
+            for service, m in zip(ecu.services, decoded_gnrs, strict=True):
+                self.assertIs(m.service, service)
+                self.assertTrue(m.coding_object is gnr or m.coding_object is service.request)
+
+            results = list(
+                ecu.decode_response_many([(coded_response, coded_request)], parallel=parallel))
+            self.assertEqual(results, [ecu.decode_response(coded_response, coded_request)])
+
+        # in non-strict mode, messages which cannot be decoded by any
+        # coding object of the matching service are returned without
+        # a coding object
+        invalid_nrc = bytes([0x7f, 0xba, 0x05, 0x00])
+        with patch("odxtools.exceptions.strict_mode", False):
+            for parallel in (False, True):
+                results = list(ecu.decode_many([invalid_nrc], parallel=parallel, max_workers=2))
+                self.assertEqual(results, [ecu.decode(invalid_nrc)])
+                decoded_invalid_nrc = results[0]
+                assert isinstance(decoded_invalid_nrc, list)
+                self.assertIsNone(decoded_invalid_nrc[0].coding_object)
+
+        # the parallel decoder can be abandoned before all messages
+        # have been decoded
+        decoded_messages = ecu.decode_many(
+            messages * 100, parallel=True, max_workers=1, chunksize=2)
+        self.assertEqual(next(decoded_messages), ecu.decode(coded_request))
+        decoded_messages.close()
+
     def test_free_param_info(self) -> None:
         ecu = odxdb.ecus.somersault_lazy
         service = ecu.services.do_forward_flips
@@ -426,6 +559,23 @@ class TestNavigation(unittest.TestCase):
         with self.assertRaises(AttributeError):
             odxdb.ecus.somersault_lazy.services.do_backward_flips  # noqa: B018
 
+    def test_memoized_value_inheritance(self) -> None:
+        base_variant = odxdb.base_variants.somersault_base_variant
+        # the memo is discarded once the layers are finalized, so it
+        # must not leak into the other tests
+        self.addCleanup(base_variant._reset_value_inheritance_memo)
+
+        # once computed, the objects available to a layer are reused
+        diag_comms = base_variant._compute_available_diag_comms(odxdb.odxlinks)
+        self.assertEqual([x.short_name for x in diag_comms],
+                         [x.short_name for x in base_variant.diag_comms])
+        self.assertIs(base_variant._compute_available_diag_comms(odxdb.odxlinks), diag_comms)
+
+        # the memoized objects are not pickled
+        self.assertIsNot(
+            pickle.loads(pickle.dumps(base_variant))._compute_available_diag_comms(odxdb.odxlinks),
+            diag_comms)
+
 
 if __name__ == "__main__":
     unittest.main()
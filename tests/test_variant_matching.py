@@ -1,4 +1,5 @@
 # SPDX-License-Identifier: MIT
+import asyncio
 import json
 from typing import Any
 
@@ -19,7 +20,7 @@ from odxtools.matchingparameter import MatchingParameter
 from odxtools.odxlink import DocType, OdxDocFragment, OdxLinkDatabase, OdxLinkId, OdxLinkRef
 from odxtools.request import Request
 from odxtools.response import Response, ResponseType
-from odxtools.variantmatcher import VariantMatcher
+from odxtools.variantmatcher import IdentTransport, VariantMatcher, identify_variants
 
 doc_frags = (OdxDocFragment(doc_name="pytest", doc_type=DocType.CONTAINER),)
 
@@ -591,3 +592,71 @@ def test_unresolvable_snpathref(ecu_variants: list[EcuVariant], use_cache: bool)
         for _, req in matcher.request_loop():
             resp = req_resp_mapping[req]
             matcher.evaluate(resp)
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_identify_variants(ecu_variants: list[EcuVariant], use_cache: bool) -> None:
+    # the request-response mappings of the ECUs to be identified
+    ecu_req_resp_mappings = {
+        "ecu_a": {
+            b"\x22\x10\x00": as_bytes({"id": 2000}),
+            b"\x22\x20\x00": as_bytes({"name": {
+                "english": "supplier_B"
+            }}),
+        },
+        "ecu_b": {
+            b"\x22\x10\x00": as_bytes({"id": 1000}),
+            b"\x22\x20\x00": as_bytes({"name": {
+                "english": "supplier_A"
+            }}),
+        },
+        "ecu_c": {
+            b"\x22\x10\x00": as_bytes({"id": 1000}),
+            b"\x22\x20\x00": as_bytes({"name": {
+                "english": "supplier_D"
+            }}),
+        },
+    }
+
+    # the requests which have been sent to each ECU
+    ecu_requests: dict[str, list[bytes]] = {x: [] for x in ecu_req_resp_mappings}
+    num_pending_requests = 0
+    max_pending_requests = 0
+
+    def make_transport(ecu_name: str) -> IdentTransport:
+
+        async def transport(use_physical_addressing: bool, req: bytes) -> bytes:
+            nonlocal num_pending_requests, max_pending_requests
+
+            assert use_physical_addressing
+            ecu_requests[ecu_name].append(req)
+            num_pending_requests += 1
+            max_pending_requests = max(max_pending_requests, num_pending_requests)
+            await asyncio.sleep(0.01)
+            num_pending_requests -= 1
+
+            return ecu_req_resp_mappings[ecu_name][req]
+
+        return transport
+
+    result = asyncio.run(
+        identify_variants({x: (ecu_variants, make_transport(x))
+                           for x in ecu_req_resp_mappings},
+                          use_cache=use_cache))
+
+    assert {
+        x: y and y.short_name
+        for x, y in result.items()
+    } == {
+        "ecu_a": "ecu_variant2",
+        "ecu_b": "ecu_variant1",
+        "ecu_c": None,
+    }
+
+    # the ECUs have been identified concurrently
+    assert max_pending_requests == len(ecu_req_resp_mappings)
+
+    if use_cache:
+        # identical requests are only sent once to each ECU
+        for requests in ecu_requests.values():
+            assert len(requests) == len(set(requests))